@@ -0,0 +1,760 @@
+from typing import Dict, List, Tuple
+from psycopg2 import sql
+from datetime import date, datetime
+import Utility.AsyncDBConnector as AsyncConnector
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Business.Customer import Customer, BadCustomer
+from Business.Order import Order, BadOrder
+from Business.Dish import Dish, BadDish
+from Business.OrderDish import OrderDish
+from Business.Columnar import OrderItems, CustomerRatings
+from Solution import (
+    _add_customer_query, _get_customer_query, _delete_customer_query,
+    _add_order_query, _get_order_query, _delete_order_query,
+    _add_dish_query, _get_dish_query, _update_dish_price_query, _update_dish_active_status_query,
+    _customer_placed_order_query, _get_customer_that_placed_order_query,
+    _order_contains_dish_query, _set_order_item_amount_query, _order_does_not_contain_dish_query,
+    _get_all_order_items_query, _customer_rated_dish_query, _upsert_rating_query, _upsert_ratings_query,
+    _customer_deleted_rating_on_dish_query, _CUSTOMER_RATINGS,
+    _get_all_order_items_columnar_query, _get_all_customer_ratings_columnar_query,
+    _get_order_total_price_query, _CUSTOMERS_SPENT_MAX_AVG_AMOUNT_MONEY, _get_most_ordered_dish_in_period_query,
+    _did_customer_order_top_rated_dishes_query, _CUSTOMERS_RATED_BUT_NOT_ORDERED, _NON_WORTH_PRICE_INCREASE,
+    _get_cumulative_profit_per_month_query, _get_cumulative_profit_per_month_range_query,
+    _get_potential_dish_recommendations_query,
+)
+
+# Asynchronous counterparts of the Solution.py API. Every function issues the same
+# statements and returns the same ReturnValue / business objects as its blocking
+# namesake, but awaits the database instead of blocking, so a single event loop can
+# keep many queries in flight. The statements are not repeated here: each function
+# takes its query from the _<function>_query builder (or the statement constant) of
+# Solution.py, so a change to a statement there applies to both APIs. Connections come from the pool set up with
+# AsyncConnector.init_pool(), or are opened per call when no pool was initialized.
+# The schema itself is still managed through Solution.create_tables / drop_tables.
+
+
+# ---------------------------------- CRUD API: ----------------------------------
+
+# CRUD API
+
+
+async def add_customer(customer: Customer) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _add_customer_query(customer)
+
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_customer(customer_id: int) -> Customer:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_customer_query(customer_id)
+
+        rows_affected, result = await conn.execute(query)
+        
+        if rows_affected == 0 or result.isEmpty():
+            return BadCustomer()
+        
+        customer = Customer.from_row(result[0])
+        
+        return customer
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return BadCustomer()
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def delete_customer(customer_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _delete_customer_query(customer_id)
+
+        rows_affected, _ = await conn.execute(query)
+        
+        if rows_affected == 0:
+            return ReturnValue.NOT_EXISTS
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def add_order(order: Order) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _add_order_query(order)
+
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_order(order_id: int) -> Order:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_order_query(order_id)
+
+        rows_affected, result = await conn.execute(query)
+        
+        if rows_affected == 0 or result.isEmpty():
+            return BadOrder()
+        
+        order = Order.from_row(result[0])
+        
+        return order
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return BadOrder()
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def delete_order(order_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _delete_order_query(order_id)
+
+        rows_affected, _ = await conn.execute(query)
+        
+        if rows_affected == 0:
+            return ReturnValue.NOT_EXISTS
+            
+        await conn.commit()
+        return ReturnValue.OK
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def add_dish(dish: Dish) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _add_dish_query(dish)
+
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_dish(dish_id: int) -> Dish:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_dish_query(dish_id)
+
+        rows_affected, result = await conn.execute(query)
+        
+        if rows_affected == 0 or result.isEmpty():
+            return BadDish()
+        
+        dish = Dish.from_row(result[0])
+        
+        return dish
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return BadDish()
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def update_dish_price(dish_id: int, price: float) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _update_dish_price_query(dish_id, price)
+
+        rows_affected, _ = await conn.execute(query)
+        
+        if rows_affected == 0:
+            return ReturnValue.NOT_EXISTS
+            
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def update_dish_active_status(dish_id: int, is_active: bool) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _update_dish_active_status_query(dish_id, is_active)
+
+        rows_affected, _ = await conn.execute(query)
+        
+        if rows_affected == 0:
+            return ReturnValue.NOT_EXISTS
+            
+        await conn.commit()
+        return ReturnValue.OK
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def customer_placed_order(customer_id: int, order_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _customer_placed_order_query(customer_id, order_id)
+
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_customer_that_placed_order(order_id: int) -> Customer:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_customer_that_placed_order_query(order_id)
+
+        rows_affected, result = await conn.execute(query)
+        
+        if rows_affected == 0 or result.isEmpty():
+            return BadCustomer()
+        
+        customer = Customer.from_row(result[0])
+        
+        return customer
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return BadCustomer()
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def order_contains_dish(order_id: int, dish_id: int, amount: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _order_contains_dish_query(order_id, dish_id, amount)
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def set_order_item_amount(order_id: int, dish_id: int, amount: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _set_order_item_amount_query(order_id, dish_id, amount)
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def order_does_not_contain_dish(order_id: int, dish_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _order_does_not_contain_dish_query(order_id, dish_id)
+        rows_affected, _ = await conn.execute(query)
+        
+        if rows_affected == 0:
+            return ReturnValue.NOT_EXISTS
+            
+        await conn.commit()
+        return ReturnValue.OK
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_all_order_items(order_id: int) -> List[OrderDish]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_all_order_items_query(order_id)
+        _, result = await conn.execute(query)
+        
+        return OrderDish.from_rows(result)
+    except Exception:
+        return []
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def customer_rated_dish(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _customer_rated_dish_query(cust_id, dish_id, rating)
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def upsert_rating(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _upsert_rating_query(cust_id, dish_id, rating)
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def upsert_ratings(ratings: List[Tuple[int, int, int]]) -> ReturnValue:
+    latest = {(cust_id, dish_id): rating for cust_id, dish_id, rating in ratings}
+    if not latest:
+        return ReturnValue.OK
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _upsert_ratings_query(latest)
+        _ = await conn.execute(query)
+        
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def customer_deleted_rating_on_dish(cust_id: int, dish_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _customer_deleted_rating_on_dish_query(cust_id, dish_id)
+        rows_affected, _ = await conn.execute(query)
+        
+        if rows_affected == 0:
+            return ReturnValue.NOT_EXISTS
+
+        await conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_all_customer_ratings(cust_id: int) -> List[Tuple[int, int]]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _CUSTOMER_RATINGS.format(c_id=sql.Literal(cust_id))
+        _, result = await conn.execute(query)
+        
+        ratings_list = []
+        for row in result:
+            ratings_list.append((row["dish_id"], row["rating"]))
+        
+        return ratings_list
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return []
+    finally:
+        if conn:
+            await conn.close()
+
+
+# get_all_order_items as an OrderItems: one array per column instead of an OrderDish per row
+async def get_all_order_items_columnar(order_id: int) -> OrderItems:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_all_order_items_columnar_query(order_id)
+        _, result = await conn.execute(query)
+        return OrderItems.from_rows(result)
+    except Exception:
+        return OrderItems()
+    finally:
+        if conn:
+            await conn.close()
+
+
+# get_all_customer_ratings as a CustomerRatings: one array per column instead of a tuple per row
+async def get_all_customer_ratings_columnar(cust_id: int) -> CustomerRatings:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_all_customer_ratings_columnar_query(cust_id)
+        _, result = await conn.execute(query)
+        return CustomerRatings.from_rows(result)
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return CustomerRatings()
+    finally:
+        if conn:
+            await conn.close()
+
+
+# ---------------------------------- BASIC API: ----------------------------------
+
+# Basic API
+
+
+async def get_order_total_price(order_id: int) -> float:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_order_total_price_query(order_id)
+        rows_affected, result = await conn.execute(query)
+        
+        if rows_affected == 0 or result.isEmpty():
+            return 0.0
+            
+        total_price = float(result[0]["total_price"])
+        
+        return total_price
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return 0.0
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_customers_spent_max_avg_amount_money() -> List[int]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _CUSTOMERS_SPENT_MAX_AVG_AMOUNT_MONEY
+        _, result = await conn.execute(query)
+        
+        max_customer_list = []
+        for row in result:
+            max_customer_list.append(row["cust_id"])
+        
+        return max_customer_list
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return []
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_most_ordered_dish_in_period(start: datetime, end: datetime) -> Dish:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_most_ordered_dish_in_period_query(start, end)
+
+        rows_affected, result = await conn.execute(query)
+        
+
+        if rows_affected == 0 or result.isEmpty():
+            return BadDish()
+        
+        dish = Dish.from_row(result[0])
+        
+        return dish
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return BadDish()
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def did_customer_order_top_rated_dishes(cust_id: int) -> bool:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _did_customer_order_top_rated_dishes_query(cust_id)
+
+        rows_affected, _ = await conn.execute(query)
+        
+        return rows_affected > 0
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return False
+    finally:
+        if conn:
+            await conn.close()
+
+
+# ---------------------------------- ADVANCED API: ----------------------------------
+
+# Advanced API
+
+
+async def get_customers_rated_but_not_ordered() -> List[int]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _CUSTOMERS_RATED_BUT_NOT_ORDERED
+
+        _, result = await conn.execute(query)
+        
+        customer_ids = []
+        for row in result:
+            customer_ids.append(row["cust_id"])
+        
+        return customer_ids
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return []
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_non_worth_price_increase() -> List[int]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _NON_WORTH_PRICE_INCREASE
+        _, result = await conn.execute(query)
+        
+        dish_id_list = []
+        for row in result:
+            dish_id_list.append(row["dish_id"])
+        
+        return dish_id_list
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return []
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_cumulative_profit_per_month(year: int) -> List[Tuple[int, float]]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_cumulative_profit_per_month_query(year)
+
+        _, result = await conn.execute(query)
+        
+        monthly_profits = []
+        for row in result:
+            monthly_profits.append((row["month"], float(row["cumulative_profit"])))
+        
+        return monthly_profits
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return []
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_cumulative_profit_per_month_range(start_year: int, end_year: int) -> Dict[int, List[Tuple[int, float]]]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_cumulative_profit_per_month_range_query(start_year, end_year)
+
+        _, result = await conn.execute(query)
+        
+        profits_per_year = {}
+        for row in result:
+            profits_per_year.setdefault(row["year"], []).append((row["month"], float(row["cumulative_profit"])))
+        
+        return profits_per_year
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return {}
+    finally:
+        if conn:
+            await conn.close()
+
+
+async def get_potential_dish_recommendations(cust_id: int) -> List[int]:
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.create()
+        query = _get_potential_dish_recommendations_query(cust_id)
+
+        _, result = await conn.execute(query)
+        
+        recommended_dish_list = []
+        for row in result:
+            recommended_dish_list.append(row["rec"])
+        
+        return recommended_dish_list
+    except Exception:
+        if conn:
+            await conn.rollback()
+        return []
+    finally:
+        if conn:
+            await conn.close()
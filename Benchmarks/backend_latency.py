@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Side-by-side latency of the Solution.py API on each backend.
+# Every backend runs in its own interpreter (Solution.py picks its backend at import time):
+#     python -m Benchmarks.backend_latency --backends postgresql sqlite memory --rows 200
+# Run from the repository root so Utility/database.ini is found.
+
+
+def _workload(rows: int, repeat: int) -> dict:
+    import Solution
+    from Business.Customer import Customer
+    from Business.Order import Order
+    from Business.Dish import Dish
+
+    timings = {}
+
+    def timed(name: str, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.setdefault(name, []).append(time.perf_counter() - start)
+        return result
+
+    Solution.drop_tables()
+    Solution.create_tables()
+    try:
+        # every dish goes in first, so the orders and ratings below refer to existing dishes
+        for i in range(1, rows + 1):
+            timed("add_dish", Solution.add_dish, Dish(i, "Bench Dish", 10.0 + i % 7, True))
+        for i in range(1, rows + 1):
+            timed("add_customer", Solution.add_customer, Customer(i, "Bench Customer", 30, "0501234567"))
+            timed("add_order", Solution.add_order, Order(i, datetime(2024, i % 12 + 1, 1), 5.0, "Bench Street"))
+            timed("customer_placed_order", Solution.customer_placed_order, i, i)
+            timed("order_contains_dish", Solution.order_contains_dish, i, i % min(rows, 20) + 1, i % 5 + 1)
+            timed("customer_rated_dish", Solution.customer_rated_dish, i, i % min(rows, 20) + 1, i % 5 + 1)
+
+        for r in range(repeat):
+            key = r % rows + 1
+            timed("get_customer", Solution.get_customer, key)
+            timed("get_order", Solution.get_order, key)
+            timed("get_dish", Solution.get_dish, key)
+            timed("get_all_order_items", Solution.get_all_order_items, key)
+            timed("get_all_customer_ratings", Solution.get_all_customer_ratings, key)
+            timed("get_order_total_price", Solution.get_order_total_price, key)
+            timed("get_customers_spent_max_avg_amount_money", Solution.get_customers_spent_max_avg_amount_money)
+            timed("get_most_ordered_dish_in_period", Solution.get_most_ordered_dish_in_period,
+                  datetime(2024, 1, 1), datetime(2024, 6, 30))
+            timed("did_customer_order_top_rated_dishes", Solution.did_customer_order_top_rated_dishes, key)
+            timed("get_customers_rated_but_not_ordered", Solution.get_customers_rated_but_not_ordered)
+            timed("get_non_worth_price_increase", Solution.get_non_worth_price_increase)
+            timed("get_cumulative_profit_per_month", Solution.get_cumulative_profit_per_month, 2024)
+            timed("get_potential_dish_recommendations", Solution.get_potential_dish_recommendations, key)
+    finally:
+        Solution.drop_tables()
+
+    return {name: {"median_ms": statistics.median(samples) * 1000,
+                   "max_ms": max(samples) * 1000,
+                   "calls": len(samples)}
+            for name, samples in timings.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Side-by-side latency of the Solution.py API per backend")
+    parser.add_argument("--backends", nargs="+", default=["postgresql", "sqlite"])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_workload(args.rows, args.repeat)))
+        return
+
+    results = {}
+    for backend in args.backends:
+        env = dict(os.environ, DB_BACKEND=backend)
+        out = subprocess.run([sys.executable, "-m", "Benchmarks.backend_latency", "--worker",
+                              "--rows", str(args.rows), "--repeat", str(args.repeat)],
+                             env=env, capture_output=True, text=True, check=True).stdout
+        results[backend] = json.loads(out.strip().splitlines()[-1])
+
+    names = list(next(iter(results.values())).keys())
+    print(f'{"median latency (ms)":45}' + "".join(f"{backend:>14}" for backend in args.backends))
+    for name in names:
+        print(f"{name:45}" + "".join(f'{results[backend][name]["median_ms"]:14.3f}' for backend in args.backends))
+
+
+if __name__ == "__main__":
+    main()
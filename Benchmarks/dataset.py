@@ -0,0 +1,254 @@
+import argparse
+import csv
+import math
+import os
+import random
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+# Deterministic synthetic data for the tables of Solution.create_tables, at any scale:
+#     python -m Benchmarks.dataset --orders 100k                  (loads into the configured backend)
+#     python -m Benchmarks.dataset --orders 10M --csv data/10M    (one CSV file per table)
+# Everything derives from --seed, so the same arguments always produce the same rows. Orders are
+# spread evenly over the years (order ids grow with the date), dishes change price a few times
+# over that period (DishOrders keeps the price at the time of the order, Dishes the current
+# one), and which customers order and which dishes get ordered or rated follow Zipf
+# distributions, the lowest ids being the most popular. Rows are generated lazily, table by
+# table, and streamed through DBConnector.copy_from. What stays in memory is per dish (its price
+# history), never per customer or per order, so it does not grow with --orders past 1M (the
+# default dish count tops out at 5000 there).
+
+# tables in foreign key order, with the columns the generator fills
+TABLES = [
+    ("Customers", ["cust_id", "full_name", "age", "phone"]),
+    ("Dishes", ["dish_id", "name", "price", "is_active"]),
+    ("Orders", ["order_id", "date", "delivery_fee", "delivery_address"]),
+    ("CustomerOrders", ["order_id", "cust_id"]),
+    ("DishOrders", ["order_id", "dish_id", "amount", "price"]),
+    ("Ratings", ["cust_id", "dish_id", "rating"]),
+]
+
+_FIRST_NAMES = ["Noa", "Ariel", "Yael", "Omer", "Tamar", "Itay", "Maya", "Daniel", "Shira", "Eitan"]
+_LAST_NAMES = ["Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Friedman", "Azulay", "Katz"]
+_DISHES = ["Shakshuka", "Falafel", "Sabich", "Hummus", "Schnitzel", "Burger", "Pasta", "Pizza",
+           "Salad", "Couscous", "Ramen", "Curry", "Tacos", "Burrito", "Sushi", "Kebab"]
+_STREETS = ["Herzl", "Rothschild", "Dizengoff", "Allenby", "Jaffa", "Ben Yehuda", "HaNassi"]
+
+
+# "1k", "250k", "10M" -> int
+def parse_scale(value: str) -> int:
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    suffix = value[-1:].lower()
+    if suffix in multipliers:
+        return int(float(value[:-1]) * multipliers[suffix])
+    return int(value)
+
+
+# expm1(x) / x and log1p(x) / x, both 1 at x == 0
+def _expm1_over(x: float) -> float:
+    return math.expm1(x) / x if abs(x) > 1e-8 else 1 + x / 2
+
+
+def _log1p_over(x: float) -> float:
+    return math.log1p(x) / x if abs(x) > 1e-8 else 1 - x / 2
+
+
+class _Zipf:
+    # ranks 1..n with probability proportional to 1 / rank ** s, drawn by rejection-inversion
+    # (Hörmann and Derflinger, 1996): constant memory, instead of a cumulative table of n floats
+    def __init__(self, n: int, s: float):
+        self.n = n
+        self.s = s
+        self.h_first = self.h_integral(1.5) - 1
+        self.h_last = self.h_integral(n + 0.5)
+        self.accept = 2 - self.h_integral_inverse(self.h_integral(2.5) - 2 ** -s)
+
+    # the integral of x ** -s from 1: (x ** (1 - s) - 1) / (1 - s), log(x) at s == 1
+    def h_integral(self, x: float) -> float:
+        log_x = math.log(x)
+        return _expm1_over(log_x * (1 - self.s)) * log_x
+
+    def h_integral_inverse(self, y: float) -> float:
+        return math.exp(_log1p_over(max(-1.0, y * (1 - self.s))) * y)
+
+    def sample(self, rng: random.Random) -> int:
+        while True:
+            u = self.h_last + rng.random() * (self.h_first - self.h_last)
+            x = self.h_integral_inverse(u)
+            rank = min(max(int(x + 0.5), 1), self.n)
+            # most draws land close enough to rank to be taken without the exact test
+            if rank - x <= self.accept or u >= self.h_integral(rank + 0.5) - rank ** -self.s:
+                return rank
+
+    # k distinct ranks (k must not exceed n)
+    def sample_distinct(self, rng: random.Random, k: int) -> List[int]:
+        chosen = {}
+        while len(chosen) < k:
+            chosen.setdefault(self.sample(rng), None)
+        return list(chosen)
+
+
+class Dataset:
+    def __init__(self, orders: int, seed: int = 236363, start_year: int = 2020, years: int = 5,
+                 customers: int = None, dishes: int = None, ratings_per_customer: float = 2.0,
+                 placed_ratio: float = 0.95):
+        self.order_count = orders
+        self.customer_count = customers or max(10, orders // 5)
+        self.dish_count = dishes or max(20, min(5_000, orders // 200))
+        self.seed = seed
+        self.start = datetime(start_year, 1, 1)
+        self.span = datetime(start_year + years, 1, 1) - self.start
+        self.ratings_per_customer = ratings_per_customer
+        self.placed_ratio = placed_ratio
+
+        # per dish: the times its price changed and the price from each of them on
+        rng = self.__rng("prices")
+        self.price_times: List[List[datetime]] = []
+        self.price_values: List[List[float]] = []
+        self.quality: List[float] = []
+        for _ in range(self.dish_count):
+            price = round(rng.uniform(5, 80), 2)
+            times = sorted(self.start + self.span * rng.random() for _ in range(rng.choice([0, 0, 1, 1, 2, 3])))
+            values = [price]
+            for _ in times:
+                # mostly increases, now and then a discount
+                price = max(1.0, round(price * rng.uniform(0.9, 1.35), 2))
+                values.append(price)
+            self.price_times.append(times)
+            self.price_values.append(values)
+            self.quality.append(rng.triangular(1.5, 5, 4))
+
+        self.dish_popularity = _Zipf(self.dish_count, 1.1)
+        self.customer_activity = _Zipf(self.customer_count, 0.8)
+
+    # every table gets a random stream of its own, so one table's rows never depend on another's
+    def __rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}-{table}")
+
+    def order_date(self, order_id: int) -> datetime:
+        offset = self.span * ((order_id - 1) / self.order_count)
+        return (self.start + offset + timedelta(seconds=order_id * 7919 % 3600)).replace(microsecond=0)
+
+    def price_at(self, dish_id: int, when: datetime) -> float:
+        return self.price_values[dish_id - 1][bisect_right(self.price_times[dish_id - 1], when)]
+
+    def customers(self) -> Iterator[tuple]:
+        rng = self.__rng("Customers")
+        for cust_id in range(1, self.customer_count + 1):
+            name = rng.choice(_FIRST_NAMES) + " " + rng.choice(_LAST_NAMES)
+            yield cust_id, name, rng.randint(18, 90), "05" + str(rng.randrange(10 ** 8)).zfill(8)
+
+    def dishes(self) -> Iterator[tuple]:
+        rng = self.__rng("Dishes")
+        for dish_id in range(1, self.dish_count + 1):
+            name = rng.choice(_DISHES) + " " + str(dish_id)
+            yield dish_id, name, self.price_values[dish_id - 1][-1], rng.random() < 0.85
+
+    # ids of the dishes generated active, the ones an order can contain
+    def active_dishes(self) -> List[int]:
+        return [dish_id for dish_id, _, _, is_active in self.dishes() if is_active]
+
+    def orders(self) -> Iterator[tuple]:
+        rng = self.__rng("Orders")
+        for order_id in range(1, self.order_count + 1):
+            address = str(rng.randint(1, 200)) + " " + rng.choice(_STREETS) + " St"
+            yield order_id, self.order_date(order_id), rng.choice([0.0, 5.0, 9.9, 14.5]), address
+
+    def customer_orders(self) -> Iterator[tuple]:
+        rng = self.__rng("CustomerOrders")
+        for order_id in range(1, self.order_count + 1):
+            if rng.random() < self.placed_ratio:
+                yield order_id, self.customer_activity.sample(rng)
+
+    def dish_orders(self) -> Iterator[tuple]:
+        rng = self.__rng("DishOrders")
+        for order_id in range(1, self.order_count + 1):
+            when = self.order_date(order_id)
+            items = min(1 + int(rng.expovariate(1 / 1.5)), 6, self.dish_count)
+            for dish_id in self.dish_popularity.sample_distinct(rng, items):
+                yield order_id, dish_id, rng.choice([1, 1, 1, 2, 2, 3, 4]), self.price_at(dish_id, when)
+
+    def ratings(self) -> Iterator[tuple]:
+        rng = self.__rng("Ratings")
+        for cust_id in range(1, self.customer_count + 1):
+            count = min(int(rng.expovariate(1 / self.ratings_per_customer)), self.dish_count)
+            for dish_id in self.dish_popularity.sample_distinct(rng, count):
+                rating = round(self.quality[dish_id - 1] + rng.gauss(0, 0.9))
+                yield cust_id, dish_id, min(5, max(1, rating))
+
+    # (table, columns, rows) in foreign key order
+    def tables(self) -> Iterator[Tuple[str, List[str], Iterator[tuple]]]:
+        generators = [self.customers, self.dishes, self.orders, self.customer_orders, self.dish_orders, self.ratings]
+        for (table, columns), rows in zip(TABLES, generators):
+            yield table, columns, rows()
+
+
+# loads the dataset into the configured backend (recreating the tables unless fresh is False),
+# returns the number of rows per table
+def load(dataset: Dataset, fresh: bool = True) -> Dict[str, int]:
+    import Solution
+    import Utility.DBConnector as Connector
+
+    if fresh:
+        Solution.drop_tables()
+        Solution.create_tables()
+
+    counts = {}
+    if Connector.get_backend() == "memory":
+        import MemorySolution
+        for table, columns, rows in dataset.tables():
+            counts[table] = MemorySolution.copy_from(table, columns, rows)
+        return counts
+
+    conn = Solution.Connector.DBConnector()
+    try:
+        for table, columns, rows in dataset.tables():
+            counts[table] = conn.copy_from(table, columns, rows)
+        # fresh statistics, so the planner sees the new volumes
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return counts
+
+
+# writes one <table>.csv (with a header line) per table into directory,
+# returns the number of rows per table
+def write_csv(dataset: Dataset, directory: str) -> Dict[str, int]:
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table, columns, rows in dataset.tables():
+        with open(os.path.join(directory, table + ".csv"), "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            counts[table] = 0
+            for row in rows:
+                writer.writerow(row)
+                counts[table] += 1
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic dataset for the Solution.py tables")
+    parser.add_argument("--orders", type=parse_scale, default=parse_scale("10k"), help="e.g. 1k, 100k, 10M")
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--start-year", type=int, default=2020)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--customers", type=parse_scale, help="default: orders / 5")
+    parser.add_argument("--dishes", type=parse_scale, help="default: orders / 200, between 20 and 5000")
+    parser.add_argument("--ratings-per-customer", type=float, default=2.0)
+    parser.add_argument("--csv", metavar="DIRECTORY", help="write CSV files instead of loading the database")
+    args = parser.parse_args()
+
+    dataset = Dataset(args.orders, seed=args.seed, start_year=args.start_year, years=args.years,
+                      customers=args.customers, dishes=args.dishes, ratings_per_customer=args.ratings_per_customer)
+    start = time.perf_counter()
+    counts = write_csv(dataset, args.csv) if args.csv else load(dataset)
+    for table, count in counts.items():
+        print(f"{table:20}{count:>12}")
+    print(f"{sum(counts.values())} rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Tuple
+
+from Benchmarks.dataset import Dataset, load, parse_scale
+from Benchmarks.suite import percentile
+
+# Closed-loop load: N simulated clients each issue one call, wait for it, and issue the next,
+# picking every call from a weighted mix of operations, for a fixed duration:
+#     python -m Benchmarks.loadgen --clients 16 --pool 8 --duration 30
+#     python -m Benchmarks.loadgen --mix add_order=5,order_contains_dish=10,report=1 --orders 100k
+# Reports the throughput, p50 / p99 latency per operation and how the calls ended (ReturnValue
+# counts, ReturnValue.ERROR and exceptions being the errors), plus how busy the DBConnector pool
+# was, sampled during the run. Raising --clients past --pool shows the wait for connections;
+# operations whose latency grows with the client count while the pool is idle are contending on
+# locks in the database.
+
+# "read" and "report" stand for a random function of their group
+DEFAULT_MIX = {
+    "add_order": 20,
+    "customer_placed_order": 15,
+    "order_contains_dish": 25,
+    "customer_rated_dish": 15,
+    "read": 20,
+    "report": 5,
+}
+
+READS = ["get_order", "get_customer_that_placed_order", "get_all_order_items", "get_order_total_price",
+         "get_all_customer_ratings", "get_dish"]
+REPORTS = ["get_customers_spent_max_avg_amount_money", "get_most_ordered_dish_in_period",
+           "did_customer_order_top_rated_dishes", "get_customers_rated_but_not_ordered",
+           "get_non_worth_price_increase", "get_cumulative_profit_per_month",
+           "get_potential_dish_recommendations"]
+
+
+# "add_order=5,read=2" -> {"add_order": 5, "read": 2}
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class _Client:
+    # one simulated client: its own random stream and the orders it created, which its
+    # customer_placed_order and order_contains_dish calls then fill
+    def __init__(self, dataset: Dataset, seed: int, order_ids: Callable[[], int]) -> None:
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.order_ids = order_ids
+        self.orders: List[int] = []
+
+    def customer(self) -> int:
+        return self.dataset.customer_activity.sample(self.rng)
+
+    def dish(self) -> int:
+        return self.dataset.dish_popularity.sample(self.rng)
+
+    def order(self) -> int:
+        if self.orders and self.rng.random() < 0.8:
+            return self.rng.choice(self.orders[-8:])
+        return self.rng.randint(1, self.dataset.order_count)
+
+    # (function name, arguments) of the next call for an operation of the mix
+    def call(self, operation: str) -> Tuple[str, tuple]:
+        from Business.Order import Order
+
+        if operation == "add_order":
+            order_id = self.order_ids()
+            self.orders.append(order_id)
+            return operation, (Order(order_id, self.dataset.start + self.dataset.span, 7.5, "Load Street"),)
+        if operation == "customer_placed_order":
+            return operation, (self.customer(), self.order())
+        if operation == "order_contains_dish":
+            return operation, (self.order(), self.dish(), self.rng.randint(1, 4))
+        if operation == "customer_rated_dish":
+            return operation, (self.customer(), self.dish(), self.rng.randint(1, 5))
+        if operation == "read":
+            name = self.rng.choice(READS)
+            if name == "get_all_customer_ratings":
+                return name, (self.customer(),)
+            if name == "get_dish":
+                return name, (self.dish(),)
+            return name, (self.order(),)
+        name = self.rng.choice(REPORTS)
+        if name == "get_most_ordered_dish_in_period":
+            start = self.dataset.start + self.dataset.span * self.rng.random()
+            return name, (start, start + timedelta(days=30))
+        if name == "get_cumulative_profit_per_month":
+            return name, (self.rng.randint(self.dataset.start.year, (self.dataset.start + self.dataset.span).year - 1),)
+        if name in ("did_customer_order_top_rated_dishes", "get_potential_dish_recommendations"):
+            return name, (self.customer(),)
+        return name, ()
+
+
+def _sample_pool(stop: threading.Event, samples: List[Tuple[int, int]], interval: float) -> None:
+    import Utility.DBConnector as Connector
+
+    while not stop.wait(interval):
+        pool = Connector.get_pool()
+        if pool is not None:
+            stats = pool.stats()
+            samples.append((stats.in_use, stats.max_size))
+
+
+# runs the clients against an already loaded dataset for duration seconds
+def run_load(dataset: Dataset, clients: int, duration: float, mix: Dict[str, float] = None, seed: int = 0) -> dict:
+    import Solution
+    from Utility.ReturnValue import ReturnValue
+
+    mix = mix or DEFAULT_MIX
+    operations, weights = list(mix), list(mix.values())
+    next_order = itertools.count(dataset.order_count + 1)
+    order_lock = threading.Lock()
+
+    def order_ids() -> int:
+        with order_lock:
+            return next(next_order)
+
+    # per client: operation -> latencies, operation -> outcome -> count
+    latencies = [{} for _ in range(clients)]
+    outcomes = [{} for _ in range(clients)]
+    start_barrier = threading.Barrier(clients + 1)
+    deadline = [0.0]
+
+    def client(index: int) -> None:
+        simulated = _Client(dataset, hash((seed, index)), order_ids)
+        start_barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            operation = simulated.rng.choices(operations, weights)[0]
+            name, args = simulated.call(operation)
+            start = time.perf_counter()
+            try:
+                result = getattr(Solution, name)(*args)
+                outcome = result.name if isinstance(result, ReturnValue) else "OK"
+            except Exception as e:
+                outcome = "EXCEPTION " + type(e).__name__
+            latencies[index].setdefault(operation, []).append(time.perf_counter() - start)
+            counts = outcomes[index].setdefault(operation, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    threads = [threading.Thread(target=client, args=(i,), name=f"client-{i}") for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    pool_samples: List[Tuple[int, int]] = []
+    stop_sampling = threading.Event()
+    sampler = threading.Thread(target=_sample_pool, args=(stop_sampling, pool_samples, 0.05), daemon=True)
+    deadline[0] = time.perf_counter() + duration
+    started = time.perf_counter()
+    start_barrier.wait()
+    sampler.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop_sampling.set()
+    sampler.join()
+
+    report = {"clients": clients, "seconds": elapsed, "operations": {}}
+    for operation in operations:
+        samples = [latency for per_client in latencies for latency in per_client.get(operation, [])]
+        if not samples:
+            continue
+        counts = {}
+        for per_client in outcomes:
+            for outcome, count in per_client.get(operation, {}).items():
+                counts[outcome] = counts.get(outcome, 0) + count
+        errors = sum(count for outcome, count in counts.items() if outcome == "ERROR" or outcome.startswith("EXCEPTION"))
+        report["operations"][operation] = {
+            "calls": len(samples),
+            "throughput_per_s": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "errors": errors,
+            "error_rate": errors / len(samples),
+            "outcomes": counts,
+        }
+    report["throughput_per_s"] = sum(op["calls"] for op in report["operations"].values()) / elapsed
+
+    import Utility.DBConnector as Connector
+    pool = Connector.get_pool()
+    if pool is not None:
+        stats = pool.stats()
+        report["pool"] = {
+            "max_size": stats.max_size,
+            "peak_in_use": max((in_use for in_use, _ in pool_samples), default=0),
+            "mean_utilization": (sum(in_use / size for in_use, size in pool_samples) / len(pool_samples)
+                                 if pool_samples else 0.0),
+            "acquired": stats.acquired,
+            "waited": stats.waited,
+            "avg_wait_ms": stats.avg_wait() * 1000,
+            "max_wait_ms": stats.max_wait * 1000,
+        }
+    return report
+
+
+def _print_report(report: dict) -> None:
+    print(f'{report["clients"]} clients, {report["seconds"]:.1f}s, {report["throughput_per_s"]:.1f} calls/s')
+    print(f'{"operation":24}{"calls":>8}{"calls/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"errors":>8}  outcomes')
+    for operation, stats in report["operations"].items():
+        outcomes = ", ".join(f"{outcome}={count}" for outcome, count in sorted(stats["outcomes"].items()))
+        print(f'{operation:24}{stats["calls"]:>8}{stats["throughput_per_s"]:>10.1f}{stats["p50_ms"]:>10.3f}'
+              f'{stats["p99_ms"]:>10.3f}{stats["errors"]:>8}  {outcomes}')
+    if "pool" in report:
+        pool = report["pool"]
+        print(f'pool: max_size={pool["max_size"]}, peak_in_use={pool["peak_in_use"]}, '
+              f'mean_utilization={pool["mean_utilization"]:.0%}, waited={pool["waited"]}/{pool["acquired"]}, '
+              f'avg_wait={pool["avg_wait_ms"]:.3f}ms, max_wait={pool["max_wait_ms"]:.3f}ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Closed-loop concurrent load on the Solution.py API")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="weights, e.g. add_order=20,order_contains_dish=25,read=20,report=5")
+    parser.add_argument("--orders", type=parse_scale, default=parse_scale("10k"), help="size of the generated dataset")
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--pool", type=int, metavar="SIZE", help="DBConnector pool size (default: one per client)")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    import Solution
+    import Utility.DBConnector as Connector
+
+    if Connector.get_backend() == "postgresql":
+        Connector.enable_pool(0, args.pool or args.clients)
+    dataset = Dataset(args.orders, seed=args.seed)
+    load(dataset)
+    try:
+        report = run_load(dataset, args.clients, args.duration, args.mix, args.seed)
+    finally:
+        Solution.drop_tables()
+        Connector.disable_pool()
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import collections
+import inspect
+import json
+import math
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from Benchmarks.dataset import Dataset, load, parse_scale
+
+# Latency percentiles and throughput of every Solution.py function on generated datasets:
+#     python -m Benchmarks.suite --scales 1k 10k 100k --output results.json
+#     python -m Benchmarks.suite --scales 1k 10k --baseline results.json --threshold 0.2
+# The dataset of each scale is loaded into the configured backend (database.ini or DB_BACKEND)
+# and every function is then called repeatedly with arguments drawn from it. Writes only touch
+# rows added past the generated ids, so the reads see the same data at every run. Each call's
+# outcome is recorded too: a case whose calls did not return OK times a failure path, its
+# "failed" count says how often. With
+# --baseline, a function whose median grew by more than --threshold (and by more than
+# --min-delta-ms, to ignore noise on sub-millisecond calls) is reported and the exit status is 1.
+# A single call is never interrupted, so keep the scales of the slowest reports modest.
+
+# the reports scan whole tables, they get fewer calls than the point lookups and writes
+ADVANCED = {
+    "get_customers_spent_max_avg_amount_money", "get_most_ordered_dish_in_period",
+    "did_customer_order_top_rated_dishes", "get_customers_rated_but_not_ordered",
+    "get_non_worth_price_increase", "get_cumulative_profit_per_month",
+    "get_cumulative_profit_per_month_range", "get_potential_dish_recommendations",
+    "iter_customers_spent_max_avg_amount_money", "iter_customers_rated_but_not_ordered",
+    "iter_non_worth_price_increase",
+}
+
+# the cases whose rows a case works on: it makes no more calls than they made (one may have been
+# cut short by max_seconds), so its calls never reach ids that were not created
+PREREQUISITES = {
+    "update_dish_price": ["add_dish"],
+    "update_dish_active_status": ["add_dish"],
+    "customer_placed_order": ["add_customer", "add_order"],
+    "order_contains_dish": ["add_order"],
+    "set_order_item_amount": ["order_contains_dish"],
+    "customer_rated_dish": ["add_customer", "add_dish"],
+    "upsert_rating": ["add_customer", "add_dish"],
+    "upsert_ratings": ["add_customer", "add_dish"],
+    "customer_deleted_rating_on_dish": ["customer_rated_dish"],
+    "order_does_not_contain_dish": ["order_contains_dish"],
+    "delete_order": ["add_order"],
+    "delete_customer": ["add_customer"],
+}
+
+def percentile(samples: List[float], fraction: float) -> float:
+    # nearest-rank percentile
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+# "OK", or the name of the ReturnValue a call failed with (the first failing one of a list of them);
+# results that are not ReturnValues count as OK
+def outcome(result) -> str:
+    from Utility.ReturnValue import ReturnValue
+    if isinstance(result, list) and result and all(isinstance(value, ReturnValue) for value in result):
+        return next((value.name for value in result if value is not ReturnValue.OK), "OK")
+    return result.name if isinstance(result, ReturnValue) else "OK"
+
+
+def summarize(samples: List[float], outcomes: Dict[str, int] = None) -> dict:
+    outcomes = outcomes or {"OK": len(samples)}
+    return {
+        "calls": len(samples),
+        "failed": len(samples) - outcomes.get("OK", 0),
+        "outcomes": dict(outcomes),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p90_ms": percentile(samples, 0.90) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": max(samples) * 1000,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "throughput_per_s": len(samples) / sum(samples) if sum(samples) > 0 else float("inf"),
+    }
+
+
+# (function name, i -> arguments) in the order they are run: the writes that create rows come
+# before the ones that need them, the deletes last
+def _cases(dataset: Dataset, seed: int) -> List[Tuple[str, Callable[[int], tuple]]]:
+    from Business.Customer import Customer
+    from Business.Order import Order
+    from Business.Dish import Dish
+
+    rng = random.Random(seed)
+    customer = lambda: rng.randint(1, dataset.customer_count)
+    order = lambda: rng.randint(1, dataset.order_count)
+    dish = lambda: rng.randint(1, dataset.dish_count)
+    active = dataset.active_dishes()
+    # the dish order_contains_dish adds to new_order(i), which the later cases of that order reuse
+    order_dish = lambda i: active[i * 7919 % len(active)]
+    first_year, last_year = dataset.start.year, (dataset.start + dataset.span).year - 1
+    new_customer = lambda i: dataset.customer_count + i + 1
+    new_order = lambda i: dataset.order_count + i + 1
+    new_dish = lambda i: dataset.dish_count + i + 1
+    # ids far past new_order's, the orders placed in full are not deleted; they order generated
+    # dishes that are active (new_dish(i) is deactivated by update_dish_active_status)
+    placed_order = lambda i, k=0: dataset.order_count + 1_000_000 + i * 10 + k
+
+    def period(_):
+        start = dataset.start + dataset.span * rng.random()
+        return start, start + timedelta(days=rng.choice([7, 30, 365]))
+
+    return [
+        ("add_customer", lambda i: (Customer(new_customer(i), "Bench Customer", 30, "0501234567"),)),
+        ("add_order", lambda i: (Order(new_order(i), dataset.start + dataset.span / 2, 5.0, "Bench Street"),)),
+        ("add_dish", lambda i: (Dish(new_dish(i), "Bench Dish", 12.5, True),)),
+        ("get_customer", lambda i: (customer(),)),
+        ("get_order", lambda i: (order(),)),
+        ("get_dish", lambda i: (dish(),)),
+        ("update_dish_price", lambda i: (new_dish(i), 13.5)),
+        ("update_dish_active_status", lambda i: (new_dish(i), False)),
+        ("customer_placed_order", lambda i: (new_customer(i), new_order(i))),
+        ("get_customer_that_placed_order", lambda i: (order(),)),
+        ("order_contains_dish", lambda i: (new_order(i), order_dish(i), 2)),
+        ("set_order_item_amount", lambda i: (new_order(i), order_dish(i), 3)),
+        ("get_all_order_items", lambda i: (order(),)),
+        ("get_all_order_items_columnar", lambda i: (order(),)),
+        ("customer_rated_dish", lambda i: (new_customer(i), new_dish(i), 4)),
+        ("upsert_rating", lambda i: (new_customer(i), new_dish(i), 5)),
+        ("upsert_ratings", lambda i: ([(new_customer(i), new_dish(j), 3) for j in range(i + 1)],)),
+        ("get_all_customer_ratings", lambda i: (customer(),)),
+        ("get_all_customer_ratings_columnar", lambda i: (customer(),)),
+        ("iter_all_customer_ratings", lambda i: (customer(),)),
+        ("get_order_total_price", lambda i: (order(),)),
+        ("get_customers_spent_max_avg_amount_money", lambda i: ()),
+        ("get_most_ordered_dish_in_period", period),
+        ("did_customer_order_top_rated_dishes", lambda i: (customer(),)),
+        ("get_customers_rated_but_not_ordered", lambda i: ()),
+        ("get_non_worth_price_increase", lambda i: ()),
+        ("iter_customers_spent_max_avg_amount_money", lambda i: ()),
+        ("iter_customers_rated_but_not_ordered", lambda i: ()),
+        ("iter_non_worth_price_increase", lambda i: ()),
+        ("get_cumulative_profit_per_month", lambda i: (rng.randint(first_year, last_year),)),
+        ("get_cumulative_profit_per_month_range", lambda i: (first_year, last_year)),
+        ("get_potential_dish_recommendations", lambda i: (customer(),)),
+        ("place_full_order", lambda i: (Order(placed_order(i), dataset.start, 5.0, "Bench Street"), customer(),
+                                        [(dish_id, amount) for dish_id, amount in zip(rng.sample(active, 2), (1, 2))])),
+        ("place_full_orders", lambda i: ([(Order(placed_order(i, k), dataset.start, 5.0, "Bench Street"),
+                                           customer(), [(rng.choice(active), 1)]) for k in range(1, 9)],)),
+        ("customer_deleted_rating_on_dish", lambda i: (new_customer(i), new_dish(i))),
+        ("order_does_not_contain_dish", lambda i: (new_order(i), order_dish(i))),
+        ("delete_order", lambda i: (new_order(i),)),
+        ("delete_customer", lambda i: (new_customer(i),)),
+    ]
+
+
+# runs every case on an already loaded dataset; a case stops early once it has used up
+# max_seconds (after at least one call), and makes no more calls than its PREREQUISITES made
+def run_cases(dataset: Dataset, iterations: int, advanced_iterations: int, max_seconds: float,
+              seed: int = 0) -> Dict[str, dict]:
+    import Solution
+
+    results = {}
+    for name, arguments in _cases(dataset, seed):
+        function = getattr(Solution, name)
+        samples, outcomes = [], collections.Counter()
+        calls = min([advanced_iterations if name in ADVANCED else iterations]
+                    + [results[prerequisite]["calls"] for prerequisite in PREREQUISITES.get(name, ())])
+        for i in range(calls):
+            args = arguments(i)
+            start = time.perf_counter()
+            result = function(*args)
+            if inspect.isgenerator(result):
+                # the iter_* functions do their work as they are consumed
+                collections.deque(result, maxlen=0)
+            samples.append(time.perf_counter() - start)
+            outcomes[outcome(result)] += 1
+            if sum(samples) > max_seconds:
+                break
+        if samples:
+            results[name] = summarize(samples, outcomes)
+    return results
+
+
+def run(scales: List[int], iterations: int, advanced_iterations: int, max_seconds: float, seed: int) -> dict:
+    import Solution
+    import Utility.DBConnector as Connector
+
+    report = {
+        "meta": {
+            "backend": Connector.get_backend(),
+            "seed": seed,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pool": Connector.get_pool() is not None,
+        },
+        "scales": {},
+    }
+    for scale in scales:
+        dataset = Dataset(scale, seed=seed)
+        start = time.perf_counter()
+        rows = load(dataset)
+        load_seconds = time.perf_counter() - start
+        try:
+            functions = run_cases(dataset, iterations, advanced_iterations, max_seconds, seed)
+        finally:
+            Solution.drop_tables()
+        report["scales"][str(scale)] = {"rows": rows, "load_seconds": load_seconds, "functions": functions}
+    return report
+
+
+# (scale, function, baseline p50, current p50) for every median that grew by more than threshold
+# (a fraction) and by more than min_delta_ms
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> List[Tuple[str, str, float, float]]:
+    regressions = []
+    for scale, result in current["scales"].items():
+        before = baseline["scales"].get(scale, {}).get("functions", {})
+        for name, stats in result["functions"].items():
+            if name not in before:
+                continue
+            old, new = before[name]["p50_ms"], stats["p50_ms"]
+            if new > old * (1 + threshold) and new - old > min_delta_ms:
+                regressions.append((scale, name, old, new))
+    return regressions
+
+
+def _print_report(report: dict) -> None:
+    for scale, result in report["scales"].items():
+        print(f'scale {scale} orders: {sum(result["rows"].values())} rows loaded in {result["load_seconds"]:.1f}s')
+        print(f'{"function":42}{"calls":>7}{"failed":>8}{"p50 ms":>13}{"p90 ms":>13}{"p99 ms":>13}{"calls/s":>10}')
+        for name, stats in result["functions"].items():
+            print(f'{name:42}{stats["calls"]:>7}{stats.get("failed", 0):>8}{stats["p50_ms"]:>13.3f}'
+                  f'{stats["p90_ms"]:>13.3f}{stats["p99_ms"]:>13.3f}{stats["throughput_per_s"]:>10.1f}')
+            if stats.get("failed"):
+                failures = ", ".join(f"{count} {value}" for value, count in stats["outcomes"].items() if value != "OK")
+                print(f'{"":42}  not OK: {failures}')
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every Solution.py function on generated datasets")
+    parser.add_argument("--scales", nargs="+", type=parse_scale, default=[1_000, 10_000], help="orders per dataset")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--advanced-iterations", type=int, default=10)
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="time budget per function and scale")
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON written by an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed growth of a median, as a fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    parser.add_argument("--pool", type=int, metavar="SIZE", help="run on a DBConnector pool of this size")
+    args = parser.parse_args()
+
+    if args.pool:
+        import Utility.DBConnector as Connector
+        Connector.enable_pool(1, args.pool)
+
+    report = run(args.scales, args.iterations, args.advanced_iterations, args.max_seconds, args.seed)
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["meta"]["backend"] != report["meta"]["backend"]:
+            print(f'warning: the baseline ran on {baseline["meta"]["backend"]}, '
+                  f'this run on {report["meta"]["backend"]}')
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        for scale, name, old, new in regressions:
+            print(f"REGRESSION scale {scale}: {name} p50 {old:.3f}ms -> {new:.3f}ms (+{(new / old - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
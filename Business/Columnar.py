@@ -0,0 +1,162 @@
+from array import array
+from operator import itemgetter, mul
+from typing import Dict, Iterable, Iterator, List, Tuple
+from Business.OrderDish import OrderDish
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Column-per-field collections for the bulk results: one typed array per column (int32 ids,
+# amounts and ratings, float64 prices) instead of one Python object per row. Iterating builds
+# the row objects one at a time; the sums run over the arrays, and to_numpy() wraps them without
+# copying (NumPy is optional, only to_numpy needs it).
+
+# array typecode of a 32-bit signed integer
+INT32 = "i" if array("i").itemsize == 4 else "l"
+FLOAT64 = "d"
+
+
+def _column(result, name: str) -> Iterable:
+    return map(itemgetter(result.cols[name]), result.rows)
+
+
+def _numpy_view(values: array):
+    if numpy is None:
+        raise ImportError("to_numpy() needs NumPy (pip install numpy)")
+    return numpy.frombuffer(values, dtype=numpy.int32 if values.typecode == INT32 else numpy.float64)
+
+
+class OrderItems:
+    # the dishes of an order, as get_all_order_items lists them (price per unit, by dish_id)
+    __slots__ = ("dish_ids", "amounts", "prices")
+
+    def __init__(self, dish_ids: Iterable[int] = (), amounts: Iterable[int] = (),
+                 prices: Iterable[float] = ()) -> None:
+        self.dish_ids = array(INT32, dish_ids)
+        self.amounts = array(INT32, amounts)
+        self.prices = array(FLOAT64, map(float, prices))
+        if not len(self.dish_ids) == len(self.amounts) == len(self.prices):
+            raise ValueError("dish_ids, amounts and prices differ in length")
+
+    # from a ResultSet with dish_id, amount and price columns (among others)
+    @classmethod
+    def from_rows(cls, result) -> "OrderItems":
+        if not result.rows:
+            return cls()
+        return cls(_column(result, "dish_id"), _column(result, "amount"), _column(result, "price"))
+
+    # appends the rows of such a ResultSet, e.g. one batch of DBConnector.iterate
+    def extend_rows(self, result) -> None:
+        if result.rows:
+            self.dish_ids.extend(_column(result, "dish_id"))
+            self.amounts.extend(_column(result, "amount"))
+            self.prices.extend(map(float, _column(result, "price")))
+
+    def append(self, dish_id: int, amount: int, price: float) -> None:
+        self.dish_ids.append(dish_id)
+        self.amounts.append(amount)
+        self.prices.append(float(price))
+
+    def __len__(self) -> int:
+        return len(self.dish_ids)
+
+    def __iter__(self) -> Iterator[OrderDish]:
+        for dish_id, amount, price in zip(self.dish_ids, self.amounts, self.prices):
+            yield OrderDish(dish_id, amount, price)
+
+    def __getitem__(self, index: int) -> OrderDish:
+        return OrderDish(self.dish_ids[index], self.amounts[index], self.prices[index])
+
+    def to_list(self) -> List[OrderDish]:
+        return list(self)
+
+    # sum of the amounts
+    def total_amount(self) -> int:
+        return sum(self.amounts)
+
+    # sum of amount * price, the order's price without the delivery fee
+    def total_price(self) -> float:
+        if numpy is not None and len(self):
+            return float(numpy.dot(_numpy_view(self.amounts), _numpy_view(self.prices)))
+        return sum(map(mul, self.amounts, self.prices))
+
+    # column name -> NumPy array sharing this collection's memory
+    def to_numpy(self) -> Dict[str, object]:
+        return {"dish_id": _numpy_view(self.dish_ids), "amount": _numpy_view(self.amounts),
+                "price": _numpy_view(self.prices)}
+
+    # equal to another OrderItems with the same columns, or to the list of OrderDish it holds
+    def __eq__(self, __value: object) -> bool:
+        if isinstance(__value, OrderItems):
+            return (self.dish_ids == __value.dish_ids and self.amounts == __value.amounts
+                    and self.prices == __value.prices)
+        if isinstance(__value, list):
+            return self.to_list() == __value
+        return False
+
+    def __str__(self) -> str:
+        return f'OrderItems({len(self)} dishes, amount={self.total_amount()}, price={self.total_price()})'
+
+
+class CustomerRatings:
+    # a customer's ratings, as get_all_customer_ratings lists them ((dish_id, rating) by dish_id)
+    __slots__ = ("dish_ids", "ratings")
+
+    def __init__(self, dish_ids: Iterable[int] = (), ratings: Iterable[int] = ()) -> None:
+        self.dish_ids = array(INT32, dish_ids)
+        self.ratings = array(INT32, ratings)
+        if len(self.dish_ids) != len(self.ratings):
+            raise ValueError("dish_ids and ratings differ in length")
+
+    # from a ResultSet with dish_id and rating columns (among others)
+    @classmethod
+    def from_rows(cls, result) -> "CustomerRatings":
+        if not result.rows:
+            return cls()
+        return cls(_column(result, "dish_id"), _column(result, "rating"))
+
+    # appends the rows of such a ResultSet, e.g. one batch of DBConnector.iterate
+    def extend_rows(self, result) -> None:
+        if result.rows:
+            self.dish_ids.extend(_column(result, "dish_id"))
+            self.ratings.extend(_column(result, "rating"))
+
+    def append(self, dish_id: int, rating: int) -> None:
+        self.dish_ids.append(dish_id)
+        self.ratings.append(rating)
+
+    def __len__(self) -> int:
+        return len(self.dish_ids)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.dish_ids, self.ratings)
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        return self.dish_ids[index], self.ratings[index]
+
+    def to_list(self) -> List[Tuple[int, int]]:
+        return list(self)
+
+    def total_rating(self) -> int:
+        return sum(self.ratings)
+
+    # None without ratings
+    def mean_rating(self):
+        return self.total_rating() / len(self) if len(self) else None
+
+    # column name -> NumPy array sharing this collection's memory
+    def to_numpy(self) -> Dict[str, object]:
+        return {"dish_id": _numpy_view(self.dish_ids), "rating": _numpy_view(self.ratings)}
+
+    # equal to another CustomerRatings with the same columns, or to the list of tuples it holds
+    def __eq__(self, __value: object) -> bool:
+        if isinstance(__value, CustomerRatings):
+            return self.dish_ids == __value.dish_ids and self.ratings == __value.ratings
+        if isinstance(__value, list):
+            return self.to_list() == __value
+        return False
+
+    def __str__(self) -> str:
+        return f'CustomerRatings({len(self)} ratings, mean={self.mean_rating()})'
@@ -1,7 +1,13 @@
-from typing import Optional
+from typing import List, Optional
+import Business.Rows as Rows
 
 
 class Customer:
+    __slots__ = ("__cust_id", "__full_name", "__phone", "__age")
+
+    # the columns from_row and from_rows read (see Business.Rows)
+    COLUMNS = ("cust_id", "full_name", "age", "phone")
+
     def __init__(self, cust_id: Optional[int] = None, full_name: Optional[str] = None, age: Optional[int] = None,
                  phone: Optional[str] = None) -> None:
 
@@ -34,6 +40,23 @@ class Customer:
     def set_address(self, age: int) -> None:
         self.__age = age
 
+    @classmethod
+    def from_row(cls, row) -> "Customer":
+        return Rows.from_row(cls, row)
+
+    @classmethod
+    def from_rows(cls, result) -> List["Customer"]:
+        return Rows.from_rows(cls, result)
+
+    @classmethod
+    def _from_values(cls, cust_id, full_name, age, phone) -> "Customer":
+        customer = cls.__new__(cls)
+        customer.__cust_id = cust_id
+        customer.__full_name = full_name
+        customer.__age = age
+        customer.__phone = phone
+        return customer
+
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, Customer):
             return False
@@ -45,5 +68,7 @@ class Customer:
 
 
 class BadCustomer(Customer):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(cust_id=-1, full_name="Unknown", phone="Unknown", age=-1)
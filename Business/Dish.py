@@ -1,7 +1,13 @@
-from typing import Optional
+from typing import List, Optional
+import Business.Rows as Rows
 
 
 class Dish:
+    __slots__ = ("__dish_id", "__name", "__price", "__is_active")
+
+    # the columns from_row and from_rows read (see Business.Rows)
+    COLUMNS = ("dish_id", "name", "price", "is_active")
+
     def __init__(self, dish_id: Optional[int] = None, name: Optional[str] = None, price: Optional[float] = None,
                  is_active: Optional[bool] = None) -> None:
         self.__dish_id = dish_id
@@ -34,6 +40,23 @@ class Dish:
     def set_is_active(self, is_active: bool) -> None:
         self.__is_active = is_active
 
+    @classmethod
+    def from_row(cls, row) -> "Dish":
+        return Rows.from_row(cls, row)
+
+    @classmethod
+    def from_rows(cls, result) -> List["Dish"]:
+        return Rows.from_rows(cls, result)
+
+    @classmethod
+    def _from_values(cls, dish_id, name, price, is_active) -> "Dish":
+        dish = cls.__new__(cls)
+        dish.__dish_id = dish_id
+        dish.__name = name
+        dish.__price = float(price) if price is not None else None
+        dish.__is_active = is_active
+        return dish
+
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, Dish):
             return False
@@ -49,5 +72,7 @@ class Dish:
 
 
 class BadDish(Dish):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(dish_id=-1, name="Unknown", price=-100.0, is_active=False)
@@ -1,8 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+import Business.Rows as Rows
 
 
 class Order:
+    __slots__ = ("__order_id", "__datetime", "__delivery_fee", "__delivery_address")
+
+    # the columns from_row and from_rows read (see Business.Rows)
+    COLUMNS = ("order_id", "date", "delivery_fee", "delivery_address")
+
     def __init__(self, order_id: Optional[int] = None, date: Optional[datetime] = None,
                  delivery_fee: Optional[float] = None, delivery_address: Optional[str] = None) -> None:
         self.__order_id = order_id
@@ -34,6 +40,23 @@ class Order:
     def set_delivery_address(self, delivery_address: str) -> None:
         self.__delivery_address = delivery_address
 
+    @classmethod
+    def from_row(cls, row) -> "Order":
+        return Rows.from_row(cls, row)
+
+    @classmethod
+    def from_rows(cls, result) -> List["Order"]:
+        return Rows.from_rows(cls, result)
+
+    @classmethod
+    def _from_values(cls, order_id, date, delivery_fee, delivery_address) -> "Order":
+        order = cls.__new__(cls)
+        order.__order_id = order_id
+        order.__datetime = date
+        order.__delivery_fee = float(delivery_fee) if delivery_fee is not None else None
+        order.__delivery_address = delivery_address
+        return order
+
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, Order):
             return False
@@ -52,5 +75,7 @@ class Order:
 
 
 class BadOrder(Order):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(order_id=-1, date=datetime.min)
@@ -1,7 +1,13 @@
-from typing import Optional
+from typing import List, Optional
+import Business.Rows as Rows
 
 
 class OrderDish:
+    __slots__ = ("__dish_id", "__amount", "__price")
+
+    # the columns from_row and from_rows read (see Business.Rows)
+    COLUMNS = ("dish_id", "amount", "price")
+
     def __init__(self, dish_id: Optional[int] = None, amount: Optional[int] = None,
                  price: Optional[float] = None) -> None:
 
@@ -27,6 +33,22 @@ class OrderDish:
     def set_price(self, price: float) -> None:
         self.__price = float(price) if price is not None else None
 
+    @classmethod
+    def from_row(cls, row) -> "OrderDish":
+        return Rows.from_row(cls, row)
+
+    @classmethod
+    def from_rows(cls, result) -> List["OrderDish"]:
+        return Rows.from_rows(cls, result)
+
+    @classmethod
+    def _from_values(cls, dish_id, amount, price) -> "OrderDish":
+        item = cls.__new__(cls)
+        item.__dish_id = dish_id
+        item.__amount = amount
+        item.__price = float(price) if price is not None else None
+        return item
+
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, OrderDish):
             return False
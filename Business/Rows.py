@@ -0,0 +1,30 @@
+from itertools import starmap
+from operator import itemgetter
+from typing import List
+
+# Row hydration for the business classes (Customer, Order, Dish, OrderDish).
+# Those classes declare __slots__, so their objects carry no per-object __dict__, which adds up
+# when a query returns a list of tens of thousands of them. Each class lists the columns it is
+# built from in COLUMNS, and its from_row/from_rows classmethods hand off to the functions here:
+# they pick the values of those columns, in that order, and pass them to the class's _from_values,
+# which builds one object without running __init__ (and converts what needs converting, e.g.
+# prices to float).
+
+
+# one object from a row keyed by column name (a ResultSetDict, or a dict of the in-memory tables)
+def from_row(cls, row):
+    return cls._from_values(*[row[column] for column in cls.COLUMNS])
+
+
+# one object per row of a ResultSet holding the COLUMNS (among others), the column positions
+# looked up once instead of per row
+def from_rows(cls, result) -> List:
+    if not result.rows:
+        return []
+    positions = [result.cols[column] for column in cls.COLUMNS]
+    if positions == list(range(len(result.rows[0]))):
+        # the rows hold just the COLUMNS, in order
+        return list(starmap(cls._from_values, result.rows))
+    if len(positions) == 1:
+        return list(map(cls._from_values, map(itemgetter(positions[0]), result.rows)))
+    return list(starmap(cls._from_values, map(itemgetter(*positions), result.rows)))
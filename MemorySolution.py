@@ -0,0 +1,631 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from datetime import date, datetime
+from fractions import Fraction
+from Utility.MemoryDatabase import MemoryDatabase
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Business.Customer import Customer, BadCustomer
+from Business.Order import Order, BadOrder
+from Business.Dish import Dish, BadDish
+from Business.OrderDish import OrderDish
+from Business.Columnar import OrderItems, CustomerRatings
+
+# In-memory implementation of the Solution.py API, selected with "engine = memory" under
+# [backend] in database.ini (or DB_BACKEND=memory). It keeps the tables of create_tables in
+# Python dicts, enforces the same constraints and cascades, and answers every query with the
+# same results as the SQL (views included), so the tests can run without a PostgreSQL server.
+# Numeric columns are compared as exact fractions, like PostgreSQL's DECIMAL.
+
+__all__ = [
+    "create_tables", "clear_tables", "drop_tables",
+    "add_customer", "get_customer", "delete_customer",
+    "add_order", "get_order", "delete_order",
+    "add_dish", "get_dish", "update_dish_price", "update_dish_active_status",
+    "customer_placed_order", "get_customer_that_placed_order",
+    "order_contains_dish", "set_order_item_amount", "order_does_not_contain_dish", "get_all_order_items",
+    "customer_rated_dish", "upsert_rating", "upsert_ratings", "customer_deleted_rating_on_dish",
+    "get_all_customer_ratings",
+    "get_all_order_items_columnar", "get_all_customer_ratings_columnar",
+    "get_order_total_price", "get_customers_spent_max_avg_amount_money",
+    "get_most_ordered_dish_in_period", "did_customer_order_top_rated_dishes",
+    "get_customers_rated_but_not_ordered", "get_non_worth_price_increase",
+    "get_cumulative_profit_per_month", "get_cumulative_profit_per_month_range",
+    "get_potential_dish_recommendations",
+    "place_full_order", "place_full_orders",
+    "iter_customers_rated_but_not_ordered", "iter_non_worth_price_increase",
+    "iter_customers_spent_max_avg_amount_money", "iter_all_customer_ratings",
+]
+
+_db = MemoryDatabase()
+
+
+def _as_datetime(value):
+    # a date bound compares like midnight of that day, as in PostgreSQL
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _exact(value) -> Fraction:
+    # floats are taken by their shortest repr, which is what sql.Literal sends to PostgreSQL
+    return Fraction(repr(value)) if isinstance(value, float) else Fraction(value)
+
+
+# ---------------------------------- CRUD API: ----------------------------------
+
+# Basic database functions
+
+
+def create_tables() -> None:
+    try:
+        _db.create()
+    except Exception as e:
+        print(e)
+
+
+def clear_tables() -> None:
+    try:
+        _db.clear()
+    except DatabaseException as e:
+        print(e)
+
+
+def drop_tables() -> None:
+    _db.drop()
+
+
+# CRUD API
+
+
+def add_customer(customer: Customer) -> ReturnValue:
+    try:
+        _db.insert("Customers", {
+            "cust_id": customer.get_cust_id(),
+            "full_name": customer.get_full_name(),
+            "age": customer.get_age(),
+            "phone": customer.get_phone(),
+        })
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def get_customer(customer_id: int) -> Customer:
+    try:
+        row = _db.table("Customers").get(customer_id)
+        if row is None:
+            return BadCustomer()
+        return Customer.from_row(row)
+    except Exception:
+        return BadCustomer()
+
+
+def delete_customer(customer_id: int) -> ReturnValue:
+    try:
+        if _db.delete("Customers", (customer_id,)) == 0:
+            return ReturnValue.NOT_EXISTS
+        return ReturnValue.OK
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def add_order(order: Order) -> ReturnValue:
+    try:
+        _db.insert("Orders", {
+            "order_id": order.get_order_id(),
+            "date": order.get_datetime(),
+            "delivery_fee": order.get_delivery_fee(),
+            "delivery_address": order.get_delivery_address(),
+        })
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def get_order(order_id: int) -> Order:
+    try:
+        row = _db.table("Orders").get(order_id)
+        if row is None:
+            return BadOrder()
+        return Order.from_row(row)
+    except Exception:
+        return BadOrder()
+
+
+def delete_order(order_id: int) -> ReturnValue:
+    try:
+        if _db.delete("Orders", (order_id,)) == 0:
+            return ReturnValue.NOT_EXISTS
+        return ReturnValue.OK
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def add_dish(dish: Dish) -> ReturnValue:
+    try:
+        _db.insert("Dishes", {
+            "dish_id": dish.get_dish_id(),
+            "name": dish.get_name(),
+            "price": dish.get_price(),
+            "is_active": dish.get_is_active(),
+        })
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def get_dish(dish_id: int) -> Dish:
+    try:
+        row = _db.table("Dishes").get(dish_id)
+        if row is None:
+            return BadDish()
+        return Dish.from_row(row)
+    except Exception:
+        return BadDish()
+
+
+def update_dish_price(dish_id: int, price: float) -> ReturnValue:
+    try:
+        if _db.update("Dishes", (dish_id,), {"price": price}, where=lambda row: row["is_active"] is True) == 0:
+            return ReturnValue.NOT_EXISTS
+        return ReturnValue.OK
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def update_dish_active_status(dish_id: int, is_active: bool) -> ReturnValue:
+    try:
+        if _db.update("Dishes", (dish_id,), {"is_active": is_active}) == 0:
+            return ReturnValue.NOT_EXISTS
+        return ReturnValue.OK
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def customer_placed_order(customer_id: int, order_id: int) -> ReturnValue:
+    try:
+        _db.insert("CustomerOrders", {"order_id": order_id, "cust_id": customer_id})
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def get_customer_that_placed_order(order_id: int) -> Customer:
+    try:
+        placed = _db.table("CustomerOrders").get(order_id)
+        if placed is None:
+            return BadCustomer()
+        return get_customer(placed["cust_id"])
+    except Exception:
+        return BadCustomer()
+
+
+def order_contains_dish(order_id: int, dish_id: int, amount: int) -> ReturnValue:
+    try:
+        with _db.lock:
+            dish = _db.table("Dishes").get(dish_id)
+            price = dish["price"] if dish is not None and dish["is_active"] is True else None
+            _db.insert("DishOrders", {"order_id": order_id, "dish_id": dish_id, "amount": amount, "price": price})
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def set_order_item_amount(order_id: int, dish_id: int, amount: int) -> ReturnValue:
+    try:
+        with _db.lock:
+            dish = _db.table("Dishes").get(dish_id)
+            price = dish["price"] if dish is not None and dish["is_active"] is True else None
+            _db.upsert("DishOrders", {"order_id": order_id, "dish_id": dish_id, "amount": amount, "price": price},
+                       ["amount"])
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def order_does_not_contain_dish(order_id: int, dish_id: int) -> ReturnValue:
+    try:
+        if _db.delete("DishOrders", (order_id, dish_id)) == 0:
+            return ReturnValue.NOT_EXISTS
+        return ReturnValue.OK
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def get_all_order_items(order_id: int) -> List[OrderDish]:
+    try:
+        with _db.lock:
+            rows = _db.table("DishOrders").lookup("order_id", order_id)
+            rows.sort(key=lambda row: row["dish_id"])
+            return [OrderDish.from_row(row) for row in rows]
+    except Exception:
+        return []
+
+
+def customer_rated_dish(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
+    try:
+        _db.insert("Ratings", {"cust_id": cust_id, "dish_id": dish_id, "rating": rating})
+        return ReturnValue.OK
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def upsert_rating(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
+    try:
+        _db.upsert("Ratings", {"cust_id": cust_id, "dish_id": dish_id, "rating": rating}, ["rating"])
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def upsert_ratings(ratings: List[Tuple[int, int, int]]) -> ReturnValue:
+    try:
+        with _db.lock:
+            table = _db.table("Ratings")
+            latest = {(cust_id, dish_id): rating for cust_id, dish_id, rating in ratings}
+            # the ratings before the call, put back if one of the new ones fails
+            previous = {key: (row["rating"] if row is not None else None)
+                        for key, row in ((key, table.get(*key)) for key in latest)}
+            try:
+                for (cust_id, dish_id), rating in latest.items():
+                    _db.upsert("Ratings", {"cust_id": cust_id, "dish_id": dish_id, "rating": rating}, ["rating"])
+            except Exception:
+                for key, rating in previous.items():
+                    if rating is None:
+                        _db.delete("Ratings", key)
+                    else:
+                        _db.update("Ratings", key, {"rating": rating})
+                raise
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def customer_deleted_rating_on_dish(cust_id: int, dish_id: int) -> ReturnValue:
+    try:
+        if _db.delete("Ratings", (cust_id, dish_id)) == 0:
+            return ReturnValue.NOT_EXISTS
+        return ReturnValue.OK
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def get_all_customer_ratings(cust_id: int) -> List[Tuple[int, int]]:
+    try:
+        with _db.lock:
+            rows = _db.table("Ratings").lookup("cust_id", cust_id)
+            return sorted((row["dish_id"], row["rating"]) for row in rows)
+    except Exception:
+        return []
+
+
+def get_all_order_items_columnar(order_id: int) -> OrderItems:
+    try:
+        with _db.lock:
+            rows = _db.table("DishOrders").lookup("order_id", order_id)
+            rows.sort(key=lambda row: row["dish_id"])
+            return OrderItems([row["dish_id"] for row in rows], [row["amount"] for row in rows],
+                              [row["price"] for row in rows])
+    except Exception:
+        return OrderItems()
+
+
+def get_all_customer_ratings_columnar(cust_id: int) -> CustomerRatings:
+    try:
+        with _db.lock:
+            rows = sorted((row["dish_id"], row["rating"]) for row in _db.table("Ratings").lookup("cust_id", cust_id))
+            return CustomerRatings([dish_id for dish_id, _ in rows], [rating for _, rating in rows])
+    except Exception:
+        return CustomerRatings()
+
+
+# ---------------------------------- VIEWS: ----------------------------------
+
+# Python counterparts of the views created by Solution.create_tables
+
+
+# totalPricePerOrder: order_id -> dishes total + delivery fee
+def _total_price_per_order() -> Dict[int, Fraction]:
+    return {order["order_id"]: _total_price(order) for order in _db.table("Orders").rows.values()}
+
+
+# the totalPricePerOrder row of one order, its dishes found through the order_id index
+def _total_price(order: dict) -> Fraction:
+    items = _db.table("DishOrders").lookup("order_id", order["order_id"])
+    return sum((row["amount"] * _exact(row["price"]) for row in items), Fraction(0)) + _exact(order["delivery_fee"])
+
+
+# average rating of every dish (3 when it has no ratings), sorted by average then dish_id
+def _dishes_by_avg_rating(descending: bool) -> List[int]:
+    averages = []
+    for dish_id, in _db.table("Dishes").rows:
+        ratings = [row["rating"] for row in _db.table("Ratings").lookup("dish_id", dish_id)]
+        avg = Fraction(sum(ratings), len(ratings)) if ratings else Fraction(3)
+        averages.append((-avg if descending else avg, dish_id))
+    averages.sort()
+    return [dish_id for _, dish_id in averages]
+
+
+# dishes ordered by a customer, across all of their orders
+def _dishes_ordered_by(cust_id: int) -> set:
+    dishes = set()
+    for placed in _db.table("CustomerOrders").lookup("cust_id", cust_id):
+        for item in _db.table("DishOrders").lookup("order_id", placed["order_id"]):
+            dishes.add(item["dish_id"])
+    return dishes
+
+
+# comparedPrices: dish_id -> {price: AVG(amount) * price} for prices not above the current price
+def _compared_prices() -> Dict[int, Dict[Fraction, Fraction]]:
+    groups = {}
+    for item in _db.table("DishOrders").rows.values():
+        groups.setdefault((item["dish_id"], _exact(item["price"])), []).append(item["amount"])
+    compared = {}
+    for (dish_id, price), amounts in groups.items():
+        if price <= _exact(_db.table("Dishes").get(dish_id)["price"]):
+            compared.setdefault(dish_id, {})[price] = Fraction(sum(amounts), len(amounts)) * price
+    return compared
+
+
+# monthlyProfit: (year, month) -> profit of the orders with at least one dish, at current dish prices
+def _monthly_profit() -> Dict[Tuple[int, int], Fraction]:
+    profits = {}
+    for order in _db.table("Orders").rows.values():
+        items = _db.table("DishOrders").lookup("order_id", order["order_id"])
+        if not items:
+            continue
+        dishes_total = sum((row["amount"] * _exact(_db.table("Dishes").get(row["dish_id"])["price"])
+                            for row in items), Fraction(0))
+        key = (order["date"].year, order["date"].month)
+        profits[key] = profits.get(key, Fraction(0)) + _exact(order["delivery_fee"]) + dishes_total
+    return profits
+
+
+def _cumulative_profit(profits: Dict[Tuple[int, int], Fraction], year: int) -> List[Tuple[int, float]]:
+    cumulative = []
+    running = Fraction(0)
+    for month in range(1, 13):
+        running += profits.get((year, month), Fraction(0))
+        cumulative.append((month, float(running)))
+    cumulative.reverse()
+    return cumulative
+
+
+# ---------------------------------- BASIC API: ----------------------------------
+
+# Basic API
+
+
+def get_order_total_price(order_id: int) -> float:
+    try:
+        with _db.lock:
+            order = _db.table("Orders").get(order_id)
+            return float(_total_price(order)) if order is not None else 0.0
+    except Exception:
+        return 0.0
+
+
+def get_customers_spent_max_avg_amount_money() -> List[int]:
+    try:
+        with _db.lock:
+            totals = _total_price_per_order()
+            spent = {}
+            for placed in _db.table("CustomerOrders").rows.values():
+                spent.setdefault(placed["cust_id"], []).append(totals[placed["order_id"]])
+            if not spent:
+                return []
+            averages = {cust_id: sum(prices) / len(prices) for cust_id, prices in spent.items()}
+            best = max(averages.values())
+            # NULL customer ids sort last, as in ORDER BY ... ASC
+            return sorted((cust_id for cust_id, avg in averages.items() if avg >= best),
+                          key=lambda cust_id: (cust_id is None, cust_id or 0))
+    except Exception:
+        return []
+
+
+def get_most_ordered_dish_in_period(start: datetime, end: datetime) -> Dish:
+    try:
+        start, end = _as_datetime(start), _as_datetime(end)
+        with _db.lock:
+            amounts = {}
+            for item in _db.table("DishOrders").rows.values():
+                order_date = _db.table("Orders").get(item["order_id"])["date"]
+                if start is not None and end is not None and start <= order_date <= end:
+                    amounts[item["dish_id"]] = amounts.get(item["dish_id"], 0) + item["amount"]
+            if not amounts:
+                return BadDish()
+            best = max(amounts.values())
+            return get_dish(min(dish_id for dish_id, amount in amounts.items() if amount == best))
+    except Exception:
+        return BadDish()
+
+
+def did_customer_order_top_rated_dishes(cust_id: int) -> bool:
+    try:
+        with _db.lock:
+            top_rated = set(_dishes_by_avg_rating(descending=True)[:5])
+            return not top_rated.isdisjoint(_dishes_ordered_by(cust_id))
+    except Exception:
+        return False
+
+
+# ---------------------------------- ADVANCED API: ----------------------------------
+
+# Advanced API
+
+
+def get_customers_rated_but_not_ordered() -> List[int]:
+    try:
+        with _db.lock:
+            lowest_rated = set(_dishes_by_avg_rating(descending=False)[:5])
+            customers = set()
+            for rating in _db.table("Ratings").rows.values():
+                if rating["rating"] < 3 and rating["dish_id"] in lowest_rated \
+                        and rating["dish_id"] not in _dishes_ordered_by(rating["cust_id"]):
+                    customers.add(rating["cust_id"])
+            return sorted(customers)
+    except Exception:
+        return []
+
+
+def get_non_worth_price_increase() -> List[int]:
+    try:
+        with _db.lock:
+            compared = _compared_prices()
+            dish_ids = []
+            for dish in _db.table("Dishes").rows.values():
+                prices = compared.get(dish["dish_id"], {})
+                current = prices.get(_exact(dish["price"]))
+                if dish["is_active"] is True and current is not None and len(prices) >= 2 \
+                        and current < max(prices.values()):
+                    dish_ids.append(dish["dish_id"])
+            return sorted(dish_ids)
+    except Exception:
+        return []
+
+
+def get_cumulative_profit_per_month(year: int) -> List[Tuple[int, float]]:
+    try:
+        with _db.lock:
+            return _cumulative_profit(_monthly_profit(), year)
+    except Exception:
+        return []
+
+
+def get_cumulative_profit_per_month_range(start_year: int, end_year: int) -> Dict[int, List[Tuple[int, float]]]:
+    try:
+        with _db.lock:
+            profits = _monthly_profit()
+            return {year: _cumulative_profit(profits, year) for year in range(start_year, end_year + 1)}
+    except Exception:
+        return {}
+
+
+def get_potential_dish_recommendations(cust_id: int) -> List[int]:
+    try:
+        with _db.lock:
+            ratings = _db.table("Ratings")
+            # similarCustomers: customers who liked (rating > 3) a dish the customer liked, the
+            # customer included; the view's recursive step only re-derives these pairs
+            similar = set()
+            for liked in ratings.lookup("cust_id", cust_id):
+                if liked["rating"] > 3:
+                    similar.update(row["cust_id"] for row in ratings.lookup("dish_id", liked["dish_id"])
+                                   if row["rating"] > 3)
+            recommended = set()
+            for other in similar:
+                recommended.update(row["dish_id"] for row in ratings.lookup("cust_id", other) if row["rating"] > 3)
+            return sorted(recommended - _dishes_ordered_by(cust_id))
+    except Exception:
+        return []
+
+
+# ---------------------------------- ORDER PLACEMENT API: ----------------------------------
+
+def place_full_order(order: Order, cust_id: int, items: List[Tuple[int, int]]) -> ReturnValue:
+    try:
+        with _db.lock:
+            result = add_order(order)
+            if result is not ReturnValue.OK:
+                return result
+            try:
+                result = customer_placed_order(cust_id, order.get_order_id())
+                for dish_id, amount in items:
+                    if result is not ReturnValue.OK:
+                        break
+                    result = order_contains_dish(order.get_order_id(), dish_id, amount)
+            except Exception:
+                result = ReturnValue.ERROR
+            if result is not ReturnValue.OK:
+                # all or nothing: deleting the order cascades to what was added for it
+                _db.delete("Orders", (order.get_order_id(),))
+            return result
+    except Exception:
+        return ReturnValue.ERROR
+
+
+def place_full_orders(orders: List[Tuple[Order, int, List[Tuple[int, int]]]]) -> List[ReturnValue]:
+    with _db.lock:
+        return [place_full_order(order, cust_id, items) for order, cust_id, items in orders]
+
+# ---------------------------------- BULK LOADING: ----------------------------------
+
+# the in-memory counterpart of DBConnector.copy_from, for loaders such as Benchmarks/dataset.py:
+# rows (tuples in the order of columns) go into table as one statement, all or none, and the
+# number of rows loaded is returned. Not part of the Solution.py API, so not in __all__
+def copy_from(table: str, columns: List[str], rows: Iterable[tuple]) -> int:
+    return _db.insert_many(table, (dict(zip(columns, row)) for row in rows))
+
+
+# ---------------------------------- STREAMING API: ----------------------------------
+
+# the rows are already in memory: the generators walk a snapshot of the list functions' results,
+# batch_size only matters to the database backends
+
+
+def iter_customers_rated_but_not_ordered(batch_size: int = 1000) -> Iterator[int]:
+    yield from get_customers_rated_but_not_ordered()
+
+
+def iter_non_worth_price_increase(batch_size: int = 1000) -> Iterator[int]:
+    yield from get_non_worth_price_increase()
+
+
+def iter_customers_spent_max_avg_amount_money(batch_size: int = 1000) -> Iterator[int]:
+    yield from get_customers_spent_max_avg_amount_money()
+
+
+def iter_all_customer_ratings(cust_id: int, batch_size: int = 1000) -> Iterator[Tuple[int, int]]:
+    yield from get_all_customer_ratings(cust_id)
@@ -1,4 +1,5 @@
-from typing import List, Tuple
+import os
+from typing import Dict, Iterator, List, Tuple
 from psycopg2 import sql
 from datetime import date, datetime
 import Utility.DBConnector as Connector
@@ -8,7 +9,15 @@ from Business.Customer import Customer, BadCustomer
 from Business.Order import Order, BadOrder
 from Business.Dish import Dish, BadDish
 from Business.OrderDish import OrderDish
+from Business.Columnar import OrderItems, CustomerRatings
 from Utility.DBConnector import ResultSet
+import Utility.Instrumentation as Instrumentation
+import Utility.GroupCommit as GroupCommit
+
+# "engine = sqlite" under [backend] in database.ini (or DB_BACKEND=sqlite) runs the statements
+# below on SQLite instead of PostgreSQL, see Utility/SQLiteConnector.py
+if Connector.get_backend() == "sqlite":
+    import Utility.SQLiteConnector as Connector
 
 
 # ---------------------------------- CRUD API: ----------------------------------
@@ -261,23 +270,29 @@ def drop_tables() -> None:
 
 
 # CRUD API
+# each function's statement is built by the _<function>_query next to it; AsyncSolution.py
+# imports these builders (and the statement constants) so both APIs issue the same SQL
+
+
+def _add_customer_query(customer: Customer) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO Customers (cust_id, full_name, phone, age)
+        VALUES ({id}, {name}, {phone}, {age})
+    """
+    ).format(
+        id=sql.Literal(customer.get_cust_id()),
+        name=sql.Literal(customer.get_full_name()),
+        phone=sql.Literal(customer.get_phone()),
+        age=sql.Literal(customer.get_age()),
+    )
 
 
 def add_customer(customer: Customer) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            INSERT INTO Customers (cust_id, full_name, phone, age)
-            VALUES ({id}, {name}, {phone}, {age})
-        """
-        ).format(
-            id=sql.Literal(customer.get_cust_id()),
-            name=sql.Literal(customer.get_full_name()),
-            phone=sql.Literal(customer.get_phone()),
-            age=sql.Literal(customer.get_age()),
-        )
+        query = _add_customer_query(customer)
 
         _ = conn.execute(query)
         
@@ -300,30 +315,28 @@ def add_customer(customer: Customer) -> ReturnValue:
             conn.close()
 
 
+def _get_customer_query(customer_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT *
+        FROM Customers
+        WHERE cust_id = {id}
+    """
+    ).format(id=sql.Literal(customer_id))
+
+
 def get_customer(customer_id: int) -> Customer:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT *
-            FROM Customers
-            WHERE cust_id = {id}
-        """
-        ).format(id=sql.Literal(customer_id))
+        query = _get_customer_query(customer_id)
 
         rows_affected, result = conn.execute(query)
         
         if rows_affected == 0 or result.isEmpty():
             return BadCustomer()
         
-        row = result[0]
-        customer = Customer(
-            cust_id=row["cust_id"],
-            full_name=row["full_name"],
-            phone=row["phone"],
-            age=row["age"],
-        )
+        customer = Customer.from_row(result[0])
         
         return customer
     except Exception:
@@ -335,16 +348,20 @@ def get_customer(customer_id: int) -> Customer:
             conn.close()
 
 
+def _delete_customer_query(customer_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        DELETE FROM Customers 
+        WHERE cust_id = {id}
+    """
+    ).format(id=sql.Literal(customer_id))
+
+
 def delete_customer(customer_id: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            DELETE FROM Customers 
-            WHERE cust_id = {id}
-        """
-        ).format(id=sql.Literal(customer_id))
+        query = _delete_customer_query(customer_id)
 
         rows_affected, _ = conn.execute(query)
         
@@ -362,21 +379,25 @@ def delete_customer(customer_id: int) -> ReturnValue:
             conn.close()
 
 
+def _add_order_query(order: Order) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO Orders (order_id, date, delivery_fee, delivery_address)
+        VALUES ({id}, {date_time}, {fee}, {address})
+    """
+    ).format(
+        id=sql.Literal(order.get_order_id()),
+        date_time=sql.Literal(order.get_datetime()),
+        fee=sql.Literal(order.get_delivery_fee()),
+        address=sql.Literal(order.get_delivery_address()),
+    )
+
+
 def add_order(order: Order) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            INSERT INTO Orders (order_id, date, delivery_fee, delivery_address)
-            VALUES ({id}, {date_time}, {fee}, {address})
-        """
-        ).format(
-            id=sql.Literal(order.get_order_id()),
-            date_time=sql.Literal(order.get_datetime()),
-            fee=sql.Literal(order.get_delivery_fee()),
-            address=sql.Literal(order.get_delivery_address()),
-        )
+        query = _add_order_query(order)
 
         _ = conn.execute(query)
         
@@ -399,30 +420,28 @@ def add_order(order: Order) -> ReturnValue:
             conn.close()
 
 
+def _get_order_query(order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT * 
+        FROM Orders 
+        WHERE order_id = {id}
+    """
+    ).format(id=sql.Literal(order_id))
+
+
 def get_order(order_id: int) -> Order:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT * 
-            FROM Orders 
-            WHERE order_id = {id}
-        """
-        ).format(id=sql.Literal(order_id))
+        query = _get_order_query(order_id)
 
         rows_affected, result = conn.execute(query)
         
         if rows_affected == 0 or result.isEmpty():
             return BadOrder()
         
-        row = result[0]
-        order = Order(
-            order_id=row["order_id"],
-            date=row["date"],
-            delivery_fee=float(row["delivery_fee"]),
-            delivery_address=row["delivery_address"],
-        )
+        order = Order.from_row(result[0])
         
         return order
     except Exception:
@@ -434,16 +453,20 @@ def get_order(order_id: int) -> Order:
             conn.close()
 
 
+def _delete_order_query(order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        DELETE FROM Orders 
+        WHERE order_id = {id}
+    """
+    ).format(id=sql.Literal(order_id))
+
+
 def delete_order(order_id: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            DELETE FROM Orders 
-            WHERE order_id = {id}
-        """
-        ).format(id=sql.Literal(order_id))
+        query = _delete_order_query(order_id)
 
         rows_affected, _ = conn.execute(query)
         
@@ -461,21 +484,25 @@ def delete_order(order_id: int) -> ReturnValue:
             conn.close()
 
 
+def _add_dish_query(dish: Dish) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO Dishes (dish_id, name, price, is_active) 
+        VALUES ({id}, {name}, {price}, {active})
+    """
+    ).format(
+        id=sql.Literal(dish.get_dish_id()),
+        name=sql.Literal(dish.get_name()),
+        price=sql.Literal(dish.get_price()),
+        active=sql.Literal(dish.get_is_active()),
+    )
+
+
 def add_dish(dish: Dish) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            INSERT INTO Dishes (dish_id, name, price, is_active) 
-            VALUES ({id}, {name}, {price}, {active})
-        """
-        ).format(
-            id=sql.Literal(dish.get_dish_id()),
-            name=sql.Literal(dish.get_name()),
-            price=sql.Literal(dish.get_price()),
-            active=sql.Literal(dish.get_is_active()),
-        )
+        query = _add_dish_query(dish)
 
         _ = conn.execute(query)
         
@@ -496,30 +523,28 @@ def add_dish(dish: Dish) -> ReturnValue:
             conn.close()
 
 
+def _get_dish_query(dish_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT * 
+        FROM Dishes 
+        WHERE dish_id = {id}
+    """
+    ).format(id=sql.Literal(dish_id))
+
+
 def get_dish(dish_id: int) -> Dish:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT * 
-            FROM Dishes 
-            WHERE dish_id = {id}
-        """
-        ).format(id=sql.Literal(dish_id))
+        query = _get_dish_query(dish_id)
 
         rows_affected, result = conn.execute(query)
         
         if rows_affected == 0 or result.isEmpty():
             return BadDish()
         
-        row = result[0]
-        dish = Dish(
-            dish_id=row["dish_id"],
-            name=row["name"],
-            price=float(row["price"]),
-            is_active=row["is_active"],
-        )
+        dish = Dish.from_row(result[0])
         
         return dish
     except Exception:
@@ -531,18 +556,22 @@ def get_dish(dish_id: int) -> Dish:
             conn.close()
 
 
+def _update_dish_price_query(dish_id: int, price: float) -> sql.Composed:
+    return sql.SQL(
+        """
+        UPDATE Dishes 
+        SET price = {price} 
+        WHERE dish_id = {id} 
+          AND is_active = true
+    """
+    ).format(price=sql.Literal(price), id=sql.Literal(dish_id))
+
+
 def update_dish_price(dish_id: int, price: float) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            UPDATE Dishes 
-            SET price = {price} 
-            WHERE dish_id = {id} 
-              AND is_active = true
-        """
-        ).format(price=sql.Literal(price), id=sql.Literal(dish_id))
+        query = _update_dish_price_query(dish_id, price)
 
         rows_affected, _ = conn.execute(query)
         
@@ -562,17 +591,21 @@ def update_dish_price(dish_id: int, price: float) -> ReturnValue:
             conn.close()
 
 
+def _update_dish_active_status_query(dish_id: int, is_active: bool) -> sql.Composed:
+    return sql.SQL(
+        """
+        UPDATE Dishes 
+        SET is_active = {active} 
+        WHERE dish_id = {id}
+    """
+    ).format(active=sql.Literal(is_active), id=sql.Literal(dish_id))
+
+
 def update_dish_active_status(dish_id: int, is_active: bool) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            UPDATE Dishes 
-            SET is_active = {active} 
-            WHERE dish_id = {id}
-        """
-        ).format(active=sql.Literal(is_active), id=sql.Literal(dish_id))
+        query = _update_dish_active_status_query(dish_id, is_active)
 
         rows_affected, _ = conn.execute(query)
         
@@ -590,16 +623,20 @@ def update_dish_active_status(dish_id: int, is_active: bool) -> ReturnValue:
             conn.close()
 
 
+def _customer_placed_order_query(customer_id: int, order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO CustomerOrders (cust_id, order_id) 
+        VALUES ({cust_id}, {order_id})
+    """
+    ).format(cust_id=sql.Literal(customer_id), order_id=sql.Literal(order_id))
+
+
 def customer_placed_order(customer_id: int, order_id: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            INSERT INTO CustomerOrders (cust_id, order_id) 
-            VALUES ({cust_id}, {order_id})
-        """
-        ).format(cust_id=sql.Literal(customer_id), order_id=sql.Literal(order_id))
+        query = _customer_placed_order_query(customer_id, order_id)
 
         _ = conn.execute(query)
         
@@ -618,34 +655,32 @@ def customer_placed_order(customer_id: int, order_id: int) -> ReturnValue:
             conn.close()
 
 
+def _get_customer_that_placed_order_query(order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+            SELECT 
+                CO.cust_id, 
+                C.full_name, 
+                C.phone, 
+                C.age 
+            FROM CustomerOrders CO 
+            JOIN Customers C ON CO.cust_id = C.cust_id 
+            WHERE CO.order_id = {id}"""
+    ).format(id=sql.Literal(order_id))
+
+
 def get_customer_that_placed_order(order_id: int) -> Customer:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-                SELECT 
-                    CO.cust_id, 
-                    C.full_name, 
-                    C.phone, 
-                    C.age 
-                FROM CustomerOrders CO 
-                JOIN Customers C ON CO.cust_id = C.cust_id 
-                WHERE CO.order_id = {id}"""
-        ).format(id=sql.Literal(order_id))
+        query = _get_customer_that_placed_order_query(order_id)
 
         rows_affected, result = conn.execute(query)
         
         if rows_affected == 0 or result.isEmpty():
             return BadCustomer()
         
-        row = result[0]
-        customer = Customer(
-            cust_id=row["cust_id"],
-            full_name=row["full_name"],
-            phone=row["phone"],
-            age=row["age"],
-        )
+        customer = Customer.from_row(result[0])
         
         return customer
     except Exception:
@@ -657,23 +692,27 @@ def get_customer_that_placed_order(order_id: int) -> Customer:
             conn.close()
 
 
+def _order_contains_dish_query(order_id: int, dish_id: int, amount: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO DishOrders (order_id, dish_id, amount, price) 
+        VALUES (
+            {oid}, 
+            {did}, 
+            {amt}, 
+            (SELECT price FROM Dishes WHERE dish_id = {did} AND is_active = true)
+        )
+    """
+    ).format(
+        oid=sql.Literal(order_id), did=sql.Literal(dish_id), amt=sql.Literal(amount)
+    )
+
+
 def order_contains_dish(order_id: int, dish_id: int, amount: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            INSERT INTO DishOrders (order_id, dish_id, amount, price) 
-            VALUES (
-                {oid}, 
-                {did}, 
-                {amt}, 
-                (SELECT price FROM Dishes WHERE dish_id = {did} AND is_active = true)
-            )
-        """
-        ).format(
-            oid=sql.Literal(order_id), did=sql.Literal(dish_id), amt=sql.Literal(amount)
-        )
+        query = _order_contains_dish_query(order_id, dish_id, amount)
         _ = conn.execute(query)
         
         conn.commit()
@@ -695,17 +734,65 @@ def order_contains_dish(order_id: int, dish_id: int, amount: int) -> ReturnValue
             conn.close()
 
 
-def order_does_not_contain_dish(order_id: int, dish_id: int) -> ReturnValue:
+def _set_order_item_amount_query(order_id: int, dish_id: int, amount: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO DishOrders (order_id, dish_id, amount, price) 
+        VALUES (
+            {oid}, 
+            {did}, 
+            {amt}, 
+            (SELECT price FROM Dishes WHERE dish_id = {did} AND is_active = true)
+        )
+        ON CONFLICT (order_id, dish_id) DO UPDATE SET amount = EXCLUDED.amount
+    """
+    ).format(
+        oid=sql.Literal(order_id), did=sql.Literal(dish_id), amt=sql.Literal(amount)
+    )
+
+
+# order_contains_dish that sets the amount of a dish already in the order instead of returning
+# ALREADY_EXISTS, in one statement; the price stays the one recorded when the dish was added, and
+# the dish must still be active either way
+def set_order_item_amount(order_id: int, dish_id: int, amount: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            DELETE FROM DishOrders 
-            WHERE order_id = {o_id} 
-              AND dish_id = {d_id}
+        query = _set_order_item_amount_query(order_id, dish_id, amount)
+        _ = conn.execute(query)
+        
+        conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except Exception:
+        if conn:
+            conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            conn.close()
+
+
+def _order_does_not_contain_dish_query(order_id: int, dish_id: int) -> sql.Composed:
+    return sql.SQL(
         """
-        ).format(o_id=sql.Literal(order_id), d_id=sql.Literal(dish_id))
+        DELETE FROM DishOrders 
+        WHERE order_id = {o_id} 
+          AND dish_id = {d_id}
+    """
+    ).format(o_id=sql.Literal(order_id), d_id=sql.Literal(dish_id))
+
+
+def order_does_not_contain_dish(order_id: int, dish_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        query = _order_does_not_contain_dish_query(order_id, dish_id)
         rows_affected, _ = conn.execute(query)
         
         if rows_affected == 0:
@@ -722,28 +809,25 @@ def order_does_not_contain_dish(order_id: int, dish_id: int) -> ReturnValue:
             conn.close()
 
 
+def _get_all_order_items_query(order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT * 
+        FROM DishOrders 
+        WHERE order_id = {o_id} 
+        ORDER BY dish_id ASC
+    """
+    ).format(o_id=sql.Literal(order_id))
+
+
 def get_all_order_items(order_id: int) -> List[OrderDish]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT * 
-            FROM DishOrders 
-            WHERE order_id = {o_id} 
-            ORDER BY dish_id ASC
-        """
-        ).format(o_id=sql.Literal(order_id))
+        query = _get_all_order_items_query(order_id)
         _, result = conn.execute(query)
         
-        customer_orders_list = []
-        for row in result:
-            order_dish = OrderDish(
-                dish_id=row["dish_id"], amount=row["amount"], price=float(row["price"])
-            )
-            customer_orders_list.append(order_dish)
-        
-        return customer_orders_list
+        return OrderDish.from_rows(result)
     except Exception:
         return []
     finally:
@@ -751,18 +835,22 @@ def get_all_order_items(order_id: int) -> List[OrderDish]:
             conn.close()
 
 
+def _customer_rated_dish_query(cust_id: int, dish_id: int, rating: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO Ratings (cust_id, dish_id, rating) 
+        VALUES ({c_id}, {d_id}, {r})
+    """
+    ).format(
+        c_id=sql.Literal(cust_id), d_id=sql.Literal(dish_id), r=sql.Literal(rating)
+    )
+
+
 def customer_rated_dish(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            INSERT INTO Ratings (cust_id, dish_id, rating) 
-            VALUES ({c_id}, {d_id}, {r})
-        """
-        ).format(
-            c_id=sql.Literal(cust_id), d_id=sql.Literal(dish_id), r=sql.Literal(rating)
-        )
+        query = _customer_rated_dish_query(cust_id, dish_id, rating)
         _ = conn.execute(query)
         
         conn.commit()
@@ -782,17 +870,99 @@ def customer_rated_dish(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
             conn.close()
 
 
-def customer_deleted_rating_on_dish(cust_id: int, dish_id: int) -> ReturnValue:
+def _upsert_rating_query(cust_id: int, dish_id: int, rating: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO Ratings (cust_id, dish_id, rating) 
+        VALUES ({c_id}, {d_id}, {r})
+        ON CONFLICT (cust_id, dish_id) DO UPDATE SET rating = EXCLUDED.rating
+    """
+    ).format(
+        c_id=sql.Literal(cust_id), d_id=sql.Literal(dish_id), r=sql.Literal(rating)
+    )
+
+
+# customer_rated_dish that replaces an existing rating instead of returning ALREADY_EXISTS, in
+# one statement, so a resubmitted or changed rating needs no delete first
+def upsert_rating(cust_id: int, dish_id: int, rating: int) -> ReturnValue:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            DELETE FROM Ratings 
-            WHERE cust_id = {c_id} 
-              AND dish_id = {d_id}
+        query = _upsert_rating_query(cust_id, dish_id, rating)
+        _ = conn.execute(query)
+        
+        conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            conn.close()
+
+
+def _upsert_ratings_query(latest: Dict[Tuple[int, int], int]) -> sql.Composed:
+    return sql.SQL(
+        """
+        INSERT INTO Ratings (cust_id, dish_id, rating) 
+        VALUES {rows}
+        ON CONFLICT (cust_id, dish_id) DO UPDATE SET rating = EXCLUDED.rating
+    """
+    ).format(rows=sql.SQL(", ").join(
+        sql.SQL("({c_id}, {d_id}, {r})").format(c_id=sql.Literal(cust_id), d_id=sql.Literal(dish_id),
+                                               r=sql.Literal(rating))
+        for (cust_id, dish_id), rating in latest.items()
+    ))
+
+
+# upsert_rating for many (cust_id, dish_id, rating) at once, in one statement and one commit; all
+# or nothing, the result is the one upsert_rating gives for the first failing rating. The last
+# rating of a (cust_id, dish_id) given twice wins
+def upsert_ratings(ratings: List[Tuple[int, int, int]]) -> ReturnValue:
+    latest = {(cust_id, dish_id): rating for cust_id, dish_id, rating in ratings}
+    if not latest:
+        return ReturnValue.OK
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        query = _upsert_ratings_query(latest)
+        _ = conn.execute(query)
+        
+        conn.commit()
+        return ReturnValue.OK
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except Exception:
+        if conn:
+            conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            conn.close()
+
+
+def _customer_deleted_rating_on_dish_query(cust_id: int, dish_id: int) -> sql.Composed:
+    return sql.SQL(
         """
-        ).format(c_id=sql.Literal(cust_id), d_id=sql.Literal(dish_id))
+        DELETE FROM Ratings 
+        WHERE cust_id = {c_id} 
+          AND dish_id = {d_id}
+    """
+    ).format(c_id=sql.Literal(cust_id), d_id=sql.Literal(dish_id))
+
+
+def customer_deleted_rating_on_dish(cust_id: int, dish_id: int) -> ReturnValue:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        query = _customer_deleted_rating_on_dish_query(cust_id, dish_id)
         rows_affected, _ = conn.execute(query)
         
         if rows_affected == 0:
@@ -811,18 +981,22 @@ def customer_deleted_rating_on_dish(cust_id: int, dish_id: int) -> ReturnValue:
             conn.close()
 
 
+# also streamed by iter_all_customer_ratings
+_CUSTOMER_RATINGS = sql.SQL(
+    """
+        SELECT * 
+        FROM Ratings 
+        WHERE cust_id = {c_id} 
+        ORDER BY dish_id ASC
+    """
+)
+
+
 def get_all_customer_ratings(cust_id: int) -> List[Tuple[int, int]]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT * 
-            FROM Ratings 
-            WHERE cust_id = {c_id} 
-            ORDER BY dish_id ASC
-        """
-        ).format(c_id=sql.Literal(cust_id))
+        query = _CUSTOMER_RATINGS.format(c_id=sql.Literal(cust_id))
         _, result = conn.execute(query)
         
         ratings_list = []
@@ -839,22 +1013,90 @@ def get_all_customer_ratings(cust_id: int) -> List[Tuple[int, int]]:
             conn.close()
 
 
+def _get_all_order_items_columnar_query(order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT dish_id, amount, price
+        FROM DishOrders
+        WHERE order_id = {o_id}
+        ORDER BY dish_id ASC
+    """
+    ).format(o_id=sql.Literal(order_id))
+
+
+# get_all_order_items as an OrderItems: one array per column instead of an OrderDish per row
+def get_all_order_items_columnar(order_id: int) -> OrderItems:
+    try:
+        return _read_columnar(_get_all_order_items_columnar_query(order_id), OrderItems())
+    except Exception:
+        return OrderItems()
+
+
+def _get_all_customer_ratings_columnar_query(cust_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT dish_id, rating
+        FROM Ratings
+        WHERE cust_id = {c_id}
+        ORDER BY dish_id ASC
+    """
+    ).format(c_id=sql.Literal(cust_id))
+
+
+# get_all_customer_ratings as a CustomerRatings: one array per column instead of a tuple per row
+def get_all_customer_ratings_columnar(cust_id: int) -> CustomerRatings:
+    try:
+        return _read_columnar(_get_all_customer_ratings_columnar_query(cust_id), CustomerRatings())
+    except Exception:
+        return CustomerRatings()
+
+
+# rows of a columnar result read per fetch, a server-side cursor's worth at a time
+_COLUMNAR_BATCH_SIZE = 10000
+
+
+# fills columnar (an OrderItems or CustomerRatings) with the rows of query, read in batches through
+# DBConnector.iterate, so at most one batch is held as row tuples beside the arrays being filled
+def _read_columnar(query: sql.Composable, columnar):
+    conn = None
+    batches = None
+    try:
+        conn = Connector.DBConnector()
+        batches = conn.iterate(query, _COLUMNAR_BATCH_SIZE)
+        for batch in batches:
+            columnar.extend_rows(batch)
+        return columnar
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if batches is not None:
+            batches.close()
+        if conn:
+            conn.close()
+
+
 # ---------------------------------- BASIC API: ----------------------------------
 
 # Basic API
 
 
+def _get_order_total_price_query(order_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT total_price
+        FROM totalPricePerOrder 
+        WHERE order_id = {o_id}
+    """
+    ).format(o_id=sql.Literal(order_id))
+
+
 def get_order_total_price(order_id: int) -> float:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT total_price
-            FROM totalPricePerOrder 
-            WHERE order_id = {o_id}
-        """
-        ).format(o_id=sql.Literal(order_id))
+        query = _get_order_total_price_query(order_id)
         rows_affected, result = conn.execute(query)
         
         if rows_affected == 0 or result.isEmpty():
@@ -872,25 +1114,32 @@ def get_order_total_price(order_id: int) -> float:
             conn.close()
 
 
+# also streamed by iter_customers_spent_max_avg_amount_money
+_CUSTOMERS_SPENT_MAX_AVG_AMOUNT_MONEY = sql.SQL(
+    """
+        SELECT CO.cust_id 
+        FROM CustomerOrders CO
+        JOIN totalPricePerOrder TP ON CO.order_id = TP.order_id 
+        GROUP BY CO.cust_id 
+        HAVING AVG(TP.total_price) >= (
+            SELECT MAX(customer_avg.avg_total_price)
+            FROM (
+                SELECT AVG(inner_tp.total_price) AS avg_total_price
+                FROM CustomerOrders inner_co
+                JOIN totalPricePerOrder inner_tp ON inner_co.order_id = inner_tp.order_id 
+                GROUP BY inner_co.cust_id
+            ) AS customer_avg
+        ) 
+        ORDER BY CO.cust_id ASC
+    """
+)
+
+
 def get_customers_spent_max_avg_amount_money() -> List[int]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT CO.cust_id 
-            FROM CustomerOrders CO
-            JOIN totalPricePerOrder TP ON CO.order_id = TP.order_id 
-            GROUP BY CO.cust_id 
-            HAVING AVG(TP.total_price) >= ALL (
-                SELECT AVG(inner_tp.total_price) 
-                FROM CustomerOrders inner_co
-                JOIN totalPricePerOrder inner_tp ON inner_co.order_id = inner_tp.order_id 
-                GROUP BY inner_co.cust_id
-            ) 
-            ORDER BY CO.cust_id ASC
-        """
-        )
+        query = _CUSTOMERS_SPENT_MAX_AVG_AMOUNT_MONEY
         _, result = conn.execute(query)
         
         max_customer_list = []
@@ -907,33 +1156,37 @@ def get_customers_spent_max_avg_amount_money() -> List[int]:
             conn.close()
 
 
+def _get_most_ordered_dish_in_period_query(start: datetime, end: datetime) -> sql.Composed:
+    return sql.SQL(
+        """
+        WITH DishAmounts AS (
+            SELECT 
+                od.dish_id,
+                SUM(od.amount) AS total_amount
+            FROM DishOrders od
+            JOIN Orders o ON od.order_id = o.order_id
+            WHERE o.date >= {start} AND o.date <= {end}
+            GROUP BY od.dish_id
+        ),
+        MaxAmount AS (
+            SELECT MAX(total_amount) AS max_total_amount
+            FROM DishAmounts
+        )
+        SELECT d.*
+        FROM Dishes d
+        JOIN DishAmounts da ON d.dish_id = da.dish_id
+        JOIN MaxAmount ma ON da.total_amount = ma.max_total_amount
+        ORDER BY d.dish_id
+        LIMIT 1
+    """
+    ).format(start=sql.Literal(start), end=sql.Literal(end))
+
+
 def get_most_ordered_dish_in_period(start: datetime, end: datetime) -> Dish:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            WITH DishAmounts AS (
-                SELECT 
-                    od.dish_id,
-                    SUM(od.amount) AS total_amount
-                FROM DishOrders od
-                JOIN Orders o ON od.order_id = o.order_id
-                WHERE o.date >= {start} AND o.date <= {end}
-                GROUP BY od.dish_id
-            ),
-            MaxAmount AS (
-                SELECT MAX(total_amount) AS max_total_amount
-                FROM DishAmounts
-            )
-            SELECT d.*
-            FROM Dishes d
-            JOIN DishAmounts da ON d.dish_id = da.dish_id
-            JOIN MaxAmount ma ON da.total_amount = ma.max_total_amount
-            ORDER BY d.dish_id
-            LIMIT 1
-        """
-        ).format(start=sql.Literal(start), end=sql.Literal(end))
+        query = _get_most_ordered_dish_in_period_query(start, end)
 
         rows_affected, result = conn.execute(query)
         
@@ -941,13 +1194,7 @@ def get_most_ordered_dish_in_period(start: datetime, end: datetime) -> Dish:
         if rows_affected == 0 or result.isEmpty():
             return BadDish()
         
-        row = result[0]
-        dish = Dish(
-            dish_id=row["dish_id"],
-            name=row["name"],
-            price=float(row["price"]),
-            is_active=row["is_active"],
-        )
+        dish = Dish.from_row(result[0])
         
         return dish
     except Exception:
@@ -959,19 +1206,23 @@ def get_most_ordered_dish_in_period(start: datetime, end: datetime) -> Dish:
             conn.close()
 
 
+def _did_customer_order_top_rated_dishes_query(cust_id: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        SELECT DISTINCT CO.cust_id 
+        FROM CustomerOrders AS CO
+        JOIN DishOrders AS D ON CO.order_id = D.order_id
+        JOIN sortRatingsDesc AS SR ON D.dish_id = SR.dish_id
+        WHERE CO.cust_id = {c_id}
+    """
+    ).format(c_id=sql.Literal(cust_id))
+
+
 def did_customer_order_top_rated_dishes(cust_id: int) -> bool:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT DISTINCT CO.cust_id 
-            FROM CustomerOrders AS CO
-            JOIN DishOrders AS D ON CO.order_id = D.order_id
-            JOIN sortRatingsDesc AS SR ON D.dish_id = SR.dish_id
-            WHERE CO.cust_id = {c_id}
-        """
-        ).format(c_id=sql.Literal(cust_id))
+        query = _did_customer_order_top_rated_dishes_query(cust_id)
 
         rows_affected, _ = conn.execute(query)
         
@@ -990,33 +1241,37 @@ def did_customer_order_top_rated_dishes(cust_id: int) -> bool:
 # Advanced API
 
 
+# also streamed by iter_customers_rated_but_not_ordered
+_CUSTOMERS_RATED_BUT_NOT_ORDERED = sql.SQL(
+    """
+        SELECT DISTINCT C.cust_id 
+        FROM Customers AS C 
+        JOIN Ratings AS R ON R.cust_id = C.cust_id
+        JOIN (
+            SELECT D.dish_id, COALESCE(AVG(DR.rating), 3) AS avg_rating 
+            FROM Ratings DR 
+            RIGHT OUTER JOIN Dishes D ON D.dish_id = DR.dish_id 
+            GROUP BY D.dish_id 
+            ORDER BY avg_rating ASC, D.dish_id ASC
+            LIMIT 5
+        ) AS RA ON R.dish_id = RA.dish_id
+        WHERE R.rating < 3
+          AND R.dish_id NOT IN (
+            SELECT D.dish_id 
+            FROM CustomerOrders AS CO
+            JOIN DishOrders AS D ON CO.order_id = D.order_id
+            WHERE CO.cust_id = C.cust_id
+          )
+        ORDER BY C.cust_id
+    """
+)
+
+
 def get_customers_rated_but_not_ordered() -> List[int]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT DISTINCT C.cust_id 
-            FROM Customers AS C 
-            JOIN Ratings AS R ON R.cust_id = C.cust_id
-            JOIN (
-                SELECT D.dish_id, COALESCE(AVG(DR.rating), 3) AS avg_rating 
-                FROM Ratings DR 
-                RIGHT OUTER JOIN Dishes D ON D.dish_id = DR.dish_id 
-                GROUP BY D.dish_id 
-                ORDER BY avg_rating ASC, D.dish_id ASC
-                LIMIT 5
-            ) AS RA ON R.dish_id = RA.dish_id
-            WHERE R.rating < 3
-              AND R.dish_id NOT IN (
-                SELECT D.dish_id 
-                FROM CustomerOrders AS CO
-                JOIN DishOrders AS D ON CO.order_id = D.order_id
-                WHERE CO.cust_id = C.cust_id
-              )
-            ORDER BY C.cust_id
-        """
-        )
+        query = _CUSTOMERS_RATED_BUT_NOT_ORDERED
 
         _, result = conn.execute(query)
         
@@ -1034,36 +1289,28 @@ def get_customers_rated_but_not_ordered() -> List[int]:
             conn.close()
 
 
+# also streamed by iter_non_worth_price_increase. One pass over comparedPrices, grouped per dish:
+# at least two compared prices, and the current price's avg_price below the best of them (NULL,
+# so not below, when the dish has no orders at its current price)
+_NON_WORTH_PRICE_INCREASE = sql.SQL(
+    """
+        SELECT D.dish_id 
+        FROM Dishes D 
+        JOIN comparedPrices CP ON CP.dish_id = D.dish_id 
+        WHERE D.is_active = true 
+        GROUP BY D.dish_id, D.price 
+        HAVING COUNT(*) >= 2 
+           AND MAX(CP.avg_price) FILTER (WHERE CP.price = D.price) < MAX(CP.avg_price) 
+        ORDER BY D.dish_id ASC
+    """
+)
+
+
 def get_non_worth_price_increase() -> List[int]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT D.dish_id 
-            FROM Dishes D 
-            WHERE D.is_active = true 
-              AND (D.dish_id, D.price) IN (
-                  SELECT dish_id, price 
-                  FROM comparedPrices
-              ) 
-              AND (
-                  SELECT avg_price 
-                  FROM comparedPrices 
-                  WHERE dish_id = D.dish_id AND price = D.price
-              ) < (
-                  SELECT MAX(avg_price) 
-                  FROM comparedPrices 
-                  WHERE dish_id = D.dish_id
-              ) 
-              AND (
-                  SELECT COUNT(*) 
-                  FROM comparedPrices 
-                  WHERE dish_id = D.dish_id
-              ) >= 2 
-            ORDER BY D.dish_id ASC
-        """
-        )
+        query = _NON_WORTH_PRICE_INCREASE
         _, result = conn.execute(query)
         
         dish_id_list = []
@@ -1080,47 +1327,51 @@ def get_non_worth_price_increase() -> List[int]:
             conn.close()
 
 
+def _get_cumulative_profit_per_month_query(year: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        WITH RECURSIVE months(month_num) AS (
+            SELECT 1
+            UNION ALL
+            SELECT month_num + 1 
+            FROM months 
+            WHERE month_num < 12
+        ),
+        monthly_profits_for_year AS (
+            SELECT 
+                month, 
+                COALESCE(SUM(monthly_profit), 0) AS profit
+            FROM monthlyProfit
+            WHERE year = {year}
+            GROUP BY month
+        ),
+        all_months AS (
+            SELECT 
+                m.month_num, 
+                COALESCE(mp.profit, 0) AS monthly_profit
+            FROM months m
+            LEFT JOIN monthly_profits_for_year mp ON m.month_num = mp.month
+        ),
+        cumulative_profits AS (
+            SELECT 
+                month_num,
+                SUM(monthly_profit) OVER (ORDER BY month_num) AS cumulative_profit
+            FROM all_months
+        )
+        SELECT 
+            month_num AS month, 
+            cumulative_profit 
+        FROM cumulative_profits 
+        ORDER BY month DESC
+    """
+    ).format(year=sql.Literal(year))
+
+
 def get_cumulative_profit_per_month(year: int) -> List[Tuple[int, float]]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            WITH RECURSIVE months(month_num) AS (
-                SELECT 1
-                UNION ALL
-                SELECT month_num + 1 
-                FROM months 
-                WHERE month_num < 12
-            ),
-            monthly_profits_for_year AS (
-                SELECT 
-                    month, 
-                    COALESCE(SUM(monthly_profit), 0) AS profit
-                FROM monthlyProfit
-                WHERE year = {year}
-                GROUP BY month
-            ),
-            all_months AS (
-                SELECT 
-                    m.month_num, 
-                    COALESCE(mp.profit, 0) AS monthly_profit
-                FROM months m
-                LEFT JOIN monthly_profits_for_year mp ON m.month_num = mp.month
-            ),
-            cumulative_profits AS (
-                SELECT 
-                    month_num,
-                    SUM(monthly_profit) OVER (ORDER BY month_num) AS cumulative_profit
-                FROM all_months
-            )
-            SELECT 
-                month_num AS month, 
-                cumulative_profit 
-            FROM cumulative_profits 
-            ORDER BY month DESC
-        """
-        ).format(year=sql.Literal(year))
+        query = _get_cumulative_profit_per_month_query(year)
 
         _, result = conn.execute(query)
         
@@ -1138,25 +1389,107 @@ def get_cumulative_profit_per_month(year: int) -> List[Tuple[int, float]]:
             conn.close()
 
 
-def get_potential_dish_recommendations(cust_id: int) -> List[int]:
+def _get_cumulative_profit_per_month_range_query(start_year: int, end_year: int) -> sql.Composed:
+    return sql.SQL(
+        """
+        WITH RECURSIVE months(month_num) AS (
+            SELECT 1
+            UNION ALL
+            SELECT month_num + 1 
+            FROM months 
+            WHERE month_num < 12
+        ),
+        years(year_num) AS (
+            SELECT {start_year}
+            WHERE {start_year} <= {end_year}
+            UNION ALL
+            SELECT year_num + 1 
+            FROM years 
+            WHERE year_num < {end_year}
+        ),
+        monthly_profits_for_years AS (
+            SELECT 
+                year, 
+                month, 
+                COALESCE(SUM(monthly_profit), 0) AS profit
+            FROM monthlyProfit
+            WHERE year BETWEEN {start_year} AND {end_year}
+            GROUP BY year, month
+        ),
+        all_months AS (
+            SELECT 
+                y.year_num, 
+                m.month_num, 
+                COALESCE(mp.profit, 0) AS monthly_profit
+            FROM years y
+            CROSS JOIN months m
+            LEFT JOIN monthly_profits_for_years mp ON y.year_num = mp.year AND m.month_num = mp.month
+        ),
+        cumulative_profits AS (
+            SELECT 
+                year_num,
+                month_num,
+                SUM(monthly_profit) OVER (PARTITION BY year_num ORDER BY month_num) AS cumulative_profit
+            FROM all_months
+        )
+        SELECT 
+            year_num AS year, 
+            month_num AS month, 
+            cumulative_profit 
+        FROM cumulative_profits 
+        ORDER BY year ASC, month DESC
+    """
+    ).format(start_year=sql.Literal(start_year), end_year=sql.Literal(end_year))
+
+
+def get_cumulative_profit_per_month_range(start_year: int, end_year: int) -> Dict[int, List[Tuple[int, float]]]:
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            """
-            SELECT RA.dish_id AS rec 
-            FROM similarCustomers AS SC 
-            JOIN Ratings AS RA ON (SC.C1 = {c_id} AND SC.C2 = RA.cust_id) 
-            WHERE RA.rating > 3 
-            EXCEPT (
-                SELECT D.dish_id AS rec 
-                FROM CustomerOrders AS CO 
-                JOIN DishOrders AS D ON CO.order_id = D.order_id 
-                WHERE CO.cust_id = {c_id}
-            ) 
-            ORDER BY rec ASC
+        query = _get_cumulative_profit_per_month_range_query(start_year, end_year)
+
+        _, result = conn.execute(query)
+        
+        profits_per_year = {}
+        for row in result:
+            profits_per_year.setdefault(row["year"], []).append((row["month"], float(row["cumulative_profit"])))
+        
+        return profits_per_year
+    except Exception:
+        if conn:
+            conn.rollback()
+        return {}
+    finally:
+        if conn:
+            conn.close()
+
+
+# the rows of similarCustomers with C1 = cust_id, read from Ratings directly: the customers who liked
+# (rating > 3) a dish the customer liked, the customer included (the view's recursive step only
+# re-derives these pairs). Filtering the view instead builds every customer's pairs first.
+def _get_potential_dish_recommendations_query(cust_id: int) -> sql.Composed:
+    return sql.SQL(
         """
-        ).format(c_id=sql.Literal(cust_id))
+        SELECT RA.dish_id AS rec 
+        FROM Ratings AS A 
+        JOIN Ratings AS B ON (B.dish_id = A.dish_id AND B.rating > 3) 
+        JOIN Ratings AS RA ON (RA.cust_id = B.cust_id) 
+        WHERE A.cust_id = {c_id} AND A.rating > 3 AND RA.rating > 3 
+        EXCEPT
+        SELECT D.dish_id AS rec 
+        FROM CustomerOrders AS CO 
+        JOIN DishOrders AS D ON CO.order_id = D.order_id 
+        WHERE CO.cust_id = {c_id}
+        ORDER BY rec ASC
+    """
+    ).format(c_id=sql.Literal(cust_id))
+
+
+def get_potential_dish_recommendations(cust_id: int) -> List[int]:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        query = _get_potential_dish_recommendations_query(cust_id)
 
         _, result = conn.execute(query)
         
@@ -1172,3 +1505,189 @@ def get_potential_dish_recommendations(cust_id: int) -> List[int]:
     finally:
         if conn:
             conn.close()
+
+
+# ---------------------------------- ORDER PLACEMENT API: ----------------------------------
+
+# add_order, customer_placed_order and order_contains_dish for every (dish_id, amount) of items,
+# as one transaction with one commit instead of 2 + len(items) of them. With
+# Utility/GroupCommit.py enabled, concurrent calls are written together by place_full_orders.
+
+
+# the statements of place_full_order on conn, in its caller's transaction: the ReturnValue of the
+# first that fails (as add_order, customer_placed_order or order_contains_dish return it), the
+# statements before it are left for the caller to undo
+def _place_full_order(conn: Connector.DBConnector, order: Order, cust_id: int,
+                      items: List[Tuple[int, int]]) -> ReturnValue:
+    query = _add_order_query(order)
+    try:
+        _ = conn.execute(query)
+    except (DatabaseException.NOT_NULL_VIOLATION, DatabaseException.CHECK_VIOLATION,
+            DatabaseException.FOREIGN_KEY_VIOLATION):
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+
+    query = _customer_placed_order_query(cust_id, order.get_order_id())
+    try:
+        _ = conn.execute(query)
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+
+    if not items:
+        return ReturnValue.OK
+    # every dish in one statement, each priced as order_contains_dish prices it
+    query = sql.SQL(
+        """
+        INSERT INTO DishOrders (order_id, dish_id, amount, price) 
+        VALUES {rows}
+    """
+    ).format(rows=sql.SQL(", ").join(
+        sql.SQL("({oid}, {did}, {amt}, (SELECT price FROM Dishes WHERE dish_id = {did} AND is_active = true))")
+        .format(oid=sql.Literal(order.get_order_id()), did=sql.Literal(dish_id), amt=sql.Literal(amount))
+        for dish_id, amount in items
+    ))
+    try:
+        _ = conn.execute(query)
+    except (DatabaseException.NOT_NULL_VIOLATION, DatabaseException.FOREIGN_KEY_VIOLATION):
+        return ReturnValue.NOT_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        return ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        return ReturnValue.ALREADY_EXISTS
+    return ReturnValue.OK
+
+
+# all or nothing: OK, or the ReturnValue of the first step that failed with none of the rows added
+def place_full_order(order: Order, cust_id: int, items: List[Tuple[int, int]]) -> ReturnValue:
+    committer = GroupCommit.active()
+    if committer is not None:
+        try:
+            return committer.place(order, cust_id, items).result()
+        except RuntimeError:
+            # group commit was turned off meanwhile, placed on its own
+            pass
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.begin()
+        result = _place_full_order(conn, order, cust_id, items)
+        if result is ReturnValue.OK:
+            conn.commit()
+        else:
+            conn.rollback()
+        return result
+    except Exception:
+        if conn:
+            conn.rollback()
+        return ReturnValue.ERROR
+    finally:
+        if conn:
+            conn.close()
+
+
+# place_full_order for each (order, cust_id, items), in one transaction with one commit; each order
+# is placed in a savepoint, so one that fails is undone alone. Returns the ReturnValue of each
+# order, all ERROR if the transaction itself failed
+def place_full_orders(orders: List[Tuple[Order, int, List[Tuple[int, int]]]]) -> List[ReturnValue]:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.begin()
+        results = []
+        for order, cust_id, items in orders:
+            conn.savepoint("place_full_order")
+            try:
+                result = _place_full_order(conn, order, cust_id, items)
+            except DatabaseException.ConnectionInvalid:
+                raise
+            except Exception:
+                result = ReturnValue.ERROR
+            if result is not ReturnValue.OK:
+                conn.rollback_to_savepoint("place_full_order")
+            conn.release_savepoint("place_full_order")
+            results.append(result)
+        conn.commit()
+        return results
+    except Exception:
+        if conn:
+            conn.rollback()
+        return [ReturnValue.ERROR] * len(orders)
+    finally:
+        if conn:
+            conn.close()
+
+
+# ---------------------------------- STREAMING API: ----------------------------------
+
+# Generator counterparts of the functions whose results grow with the tables: the rows are read
+# through DBConnector.iterate, batch_size at a time, instead of all at once. The connection is
+# held until the generator is exhausted or closed; on an error the iteration just stops, like
+# the list functions return [].
+
+
+# the column's value of every row of query, a tuple of their values with several columns
+def _iterate(query: sql.Composable, batch_size: int, *columns: str) -> Iterator:
+    conn = None
+    batches = None
+    try:
+        conn = Connector.DBConnector()
+        batches = conn.iterate(query, batch_size)
+        for batch in batches:
+            if len(columns) == 1:
+                yield from batch[columns[0]]
+            else:
+                yield from zip(*(batch[column] for column in columns))
+    except Exception:
+        if conn:
+            conn.rollback()
+    finally:
+        # closed early by the caller, the server-side cursor goes before the connection
+        if batches is not None:
+            batches.close()
+        if conn:
+            conn.close()
+
+
+def iter_customers_rated_but_not_ordered(batch_size: int = 1000) -> Iterator[int]:
+    yield from _iterate(_CUSTOMERS_RATED_BUT_NOT_ORDERED, batch_size, "cust_id")
+
+
+def iter_non_worth_price_increase(batch_size: int = 1000) -> Iterator[int]:
+    yield from _iterate(_NON_WORTH_PRICE_INCREASE, batch_size, "dish_id")
+
+
+def iter_customers_spent_max_avg_amount_money(batch_size: int = 1000) -> Iterator[int]:
+    yield from _iterate(_CUSTOMERS_SPENT_MAX_AVG_AMOUNT_MONEY, batch_size, "cust_id")
+
+
+# (dish_id, rating) pairs, by dish_id
+def iter_all_customer_ratings(cust_id: int, batch_size: int = 1000) -> Iterator[Tuple[int, int]]:
+    yield from _iterate(_CUSTOMER_RATINGS.format(c_id=sql.Literal(cust_id)), batch_size, "dish_id", "rating")
+
+
+# ---------------------------------- BACKEND: ----------------------------------
+
+# "engine = memory" under [backend] in database.ini (or DB_BACKEND=memory) swaps every function
+# above for its in-memory counterpart, see MemorySolution.py
+if Connector.get_backend() == "memory":
+    from MemorySolution import *
+
+
+# ---------------------------------- INSTRUMENTATION: ----------------------------------
+
+# every public function above reports its calls to the listeners of Utility/Instrumentation.py
+# (metrics, tracing); kept last so the in-memory functions are covered too
+Instrumentation.instrument(globals())
+
+# DB_TRACE_FILE=trace.json traces every call and writes the spans there at exit, see Utility/Tracing.py
+if os.environ.get("DB_TRACE_FILE"):
+    import Utility.Tracing as Tracing
+    Tracing.enable(os.environ["DB_TRACE_FILE"])
+
+# DB_PROFILE=get_customer,add_order (or all) profiles those functions, see Utility/Profiler.py
+if os.environ.get("DB_PROFILE"):
+    import Utility.Profiler as Profiler
+    Profiler.enable_from_environment()
@@ -1,10 +1,43 @@
+import atexit
+import os
 import unittest
 import Solution as Solution
+import Utility.DBConnector as Connector
+
+# TEST_ISOLATION=transaction creates the tables once per run and rolls every test back,
+# instead of dropping and recreating them around each test
+TRANSACTIONS = os.environ.get("TEST_ISOLATION") == "transaction" and Connector.get_backend() == "postgresql"
+
+# whether the tables created for the transactional tests are still in place
+_schema_ready = False
+
+# under pytest-xdist every worker process works in a schema of its own (Tests/parallel.py sets
+# DB_SCHEMA itself), so the workers' tables do not collide
+if os.environ.get("PYTEST_XDIST_WORKER") and not os.environ.get("DB_SCHEMA"):
+    os.environ["DB_SCHEMA"] = "test_" + os.environ["PYTEST_XDIST_WORKER"]
+    if Connector.get_backend() == "postgresql":
+        Connector.create_schema(os.environ["DB_SCHEMA"])
+        atexit.register(Connector.drop_schema, os.environ["DB_SCHEMA"])
+    elif Connector.get_backend() == "sqlite":
+        import Utility.SQLiteConnector as SQLiteConnector
+        atexit.register(SQLiteConnector.drop_schema, os.environ["DB_SCHEMA"])
 
 
 class AbstractTest(unittest.TestCase):
+    # tests whose writes must really be committed (e.g. to be seen from other connections) set this to False
+    transactional = True
+
     # before each test, setUp is executed
     def setUp(self) -> None:
+        global _schema_ready
+        if TRANSACTIONS and self.transactional:
+            if not _schema_ready:
+                Solution.drop_tables()
+                Solution.create_tables()
+                _schema_ready = True
+                atexit.register(Solution.drop_tables)
+            Connector.begin_outer_transaction()
+            return
         # Drop tables if they exist to ensure clean start
         Solution.drop_tables()
         # Create new tables
@@ -12,4 +45,9 @@ class AbstractTest(unittest.TestCase):
 
     # after each test, tearDown is executed
     def tearDown(self) -> None:
+        global _schema_ready
+        if TRANSACTIONS and self.transactional:
+            Connector.rollback_outer_transaction()
+            return
         Solution.drop_tables()
+        _schema_ready = False
@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import AsyncSolution as AsyncSolution
+import Utility.AsyncDBConnector as AsyncConnector
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer, BadCustomer
+from Business.Order import Order
+from Business.Dish import Dish
+from Business.OrderDish import OrderDish
+
+
+@unittest.skipIf(Connector.get_backend() != "postgresql", "the asynchronous connector only talks to PostgreSQL")
+class Test(AbstractTest):
+    # the asynchronous connections must see the committed tables
+    transactional = False
+
+    def test_001_crud_matches_blocking_api(self) -> None:
+        async def scenario():
+            c = Customer(1, 'Async Person', 30, "1234567890")
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.add_customer(c))
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, await AsyncSolution.add_customer(c))
+            self.assertEqual(ReturnValue.BAD_PARAMS,
+                             await AsyncSolution.add_customer(Customer(2, 'Too Young', 17, "1234567890")))
+            self.assertEqual(c, await AsyncSolution.get_customer(1))
+            self.assertEqual(BadCustomer(), await AsyncSolution.get_customer(2))
+
+            o = Order(1, datetime(2024, 3, 1, 12, 0), 5.0, 'Async Street 1')
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.add_order(o))
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.add_dish(Dish(1, 'Soup', 10.0, True)))
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.customer_placed_order(1, 1))
+            self.assertEqual(ReturnValue.NOT_EXISTS, await AsyncSolution.customer_placed_order(3, 2))
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.order_contains_dish(1, 1, 3))
+            self.assertEqual([OrderDish(1, 3, 10.0)], await AsyncSolution.get_all_order_items(1))
+            self.assertEqual(35.0, await AsyncSolution.get_order_total_price(1))
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.customer_rated_dish(1, 1, 5))
+            self.assertEqual([(1, 5)], await AsyncSolution.get_all_customer_ratings(1))
+
+        asyncio.run(scenario())
+
+        # the asynchronous writes are visible to the blocking API and vice versa
+        self.assertEqual(Solution.get_order_total_price(1), 35.0)
+        self.assertEqual(Solution.get_cumulative_profit_per_month(2024),
+                         asyncio.run(AsyncSolution.get_cumulative_profit_per_month(2024)))
+
+    def test_002_pool_keeps_queries_in_flight(self) -> None:
+        async def scenario():
+            pool = await AsyncConnector.init_pool(minsize=2, maxsize=8)
+            try:
+                results = await asyncio.gather(*[
+                    AsyncSolution.add_customer(Customer(i, 'Pooled Person', 30, "1234567890"))
+                    for i in range(1, 51)
+                ])
+                self.assertEqual([ReturnValue.OK] * 50, results)
+                customers = await asyncio.gather(*[AsyncSolution.get_customer(i) for i in range(1, 51)])
+                self.assertEqual(list(range(1, 51)), [c.get_cust_id() for c in customers])
+                self.assertLessEqual(pool.size(), 8)
+            finally:
+                AsyncConnector.close_pool()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
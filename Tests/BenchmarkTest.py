@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import MemorySolution as MemorySolution
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import BadCustomer
+from Benchmarks.dataset import Dataset, load
+import Benchmarks.suite as suite
+from Benchmarks.suite import _cases, compare, percentile, run_cases
+from Utility.ReturnValue import ReturnValue
+
+
+class Test(AbstractTest):
+    def test_001_every_function_is_measured(self) -> None:
+        dataset = Dataset(150, seed=5)
+        load(dataset, fresh=False)
+        results = run_cases(dataset, iterations=3, advanced_iterations=1, max_seconds=5.0)
+
+        api = set(MemorySolution.__all__) - {"create_tables", "clear_tables", "drop_tables"}
+        self.assertEqual(api, set(results))
+        self.assertEqual(3, results["get_customer"]["calls"])
+        self.assertEqual(1, results["get_non_worth_price_increase"]["calls"])
+        for name, stats in results.items():
+            # every call timed the path it was meant to, none of them failed
+            self.assertEqual({"OK": stats["calls"]}, stats["outcomes"], name)
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+            self.assertLessEqual(stats["p99_ms"], stats["max_ms"])
+        # the writes only touched rows past the generated ids, and cleaned up after themselves
+        self.assertEqual(dataset.customer_count, Solution.get_customer(dataset.customer_count).get_cust_id())
+        self.assertEqual(BadCustomer(), Solution.get_customer(dataset.customer_count + 1))
+
+    def test_002_compare_flags_regressions(self) -> None:
+        self.assertEqual(1, percentile([3, 1, 2], 0.1))
+        self.assertEqual(2, percentile([3, 1, 2], 0.5))
+        self.assertEqual(3, percentile([3, 1, 2], 0.99))
+
+        def report(**p50):
+            return {"scales": {"1000": {"functions": {name: {"p50_ms": value} for name, value in p50.items()}}}}
+
+        baseline = report(get_customer=1.0, get_non_worth_price_increase=50.0, get_order=0.1)
+        current = report(get_customer=1.1, get_non_worth_price_increase=70.0, get_order=0.3, get_dish=9.0)
+        # get_order tripled but stays under the noise floor, get_dish has no baseline
+        self.assertEqual([("1000", "get_non_worth_price_increase", 50.0, 70.0)],
+                         compare(current, baseline, threshold=0.2, min_delta_ms=0.5))
+        self.assertEqual([], compare(current, baseline, threshold=0.5, min_delta_ms=0.5))
+
+    def test_003_orders_are_placed(self) -> None:
+        dataset = Dataset(150, seed=5)
+        load(dataset, fresh=False)
+        cases = dict(_cases(dataset, seed=0))
+        self.assertEqual(ReturnValue.OK, Solution.place_full_order(*cases["place_full_order"](0)))
+        self.assertEqual([ReturnValue.OK] * 8, Solution.place_full_orders(*cases["place_full_orders"](0)))
+
+    def test_004_cases_run_as_far_as_their_prerequisites(self) -> None:
+        dataset = Dataset(150, seed=5)
+        load(dataset, fresh=False)
+        # add_customer made one call only, as if the time budget had cut it short
+        with mock.patch.object(suite, "ADVANCED", suite.ADVANCED | {"add_customer"}):
+            results = run_cases(dataset, iterations=3, advanced_iterations=1, max_seconds=5.0)
+        for name in ("add_customer", "customer_placed_order", "customer_rated_dish", "customer_deleted_rating_on_dish",
+                     "upsert_ratings", "delete_customer"):
+            self.assertEqual(1, results[name]["calls"], name)
+        self.assertEqual(3, results["add_order"]["calls"])
+        self.assertTrue(all(stats["failed"] == 0 for stats in results.values()))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
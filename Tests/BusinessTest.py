@@ -0,0 +1,87 @@
+import pickle
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+from Utility.DBConnector import ResultSet
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer, BadCustomer
+from Business.Order import Order, BadOrder
+from Business.Dish import Dish, BadDish
+from Business.OrderDish import OrderDish
+
+
+class _Column:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+def result_set(columns: list, rows: list) -> ResultSet:
+    return ResultSet([_Column(column) for column in columns], rows)
+
+
+class Test(AbstractTest):
+    def test_001_slotted(self) -> None:
+        for business in (Customer(1, 'Slotted Person', 30, "1234567890"), BadCustomer(), Order(1), BadOrder(),
+                         Dish(1, 'Soup', 9.5, True), BadDish(), OrderDish(1, 2, 3.0)):
+            self.assertFalse(hasattr(business, "__dict__"), type(business).__name__)
+            with self.assertRaises(AttributeError):
+                business.extra = 1
+
+        dish = Dish(1, 'Soup', 9.5, True)
+        dish.set_price(10)
+        self.assertEqual(10.0, dish.get_price())
+        self.assertIsInstance(dish.get_price(), float)
+        copied = pickle.loads(pickle.dumps(dish))
+        self.assertEqual(dish, copied)
+        self.assertNotEqual(dish, Dish(1, 'Soup', 9.5, True))
+
+    def test_002_from_row(self) -> None:
+        date = datetime(2024, 5, 1, 12, 30)
+        self.assertEqual(Customer(1, 'Row Person', 30, "1234567890"),
+                         Customer.from_row({"cust_id": 1, "full_name": 'Row Person', "age": 30, "phone": "1234567890"}))
+        order = Order.from_row({"order_id": 2, "date": date, "delivery_fee": 5, "delivery_address": "Row Street"})
+        self.assertEqual(Order(2, date, 5.0, "Row Street"), order)
+        self.assertIsInstance(order.get_delivery_fee(), float)
+        self.assertEqual(Dish(3, 'Soup', 9.5, False),
+                         Dish.from_row({"dish_id": 3, "name": 'Soup', "price": 9.5, "is_active": False}))
+        self.assertEqual(OrderDish(3, 2, 19.0), OrderDish.from_row({"dish_id": 3, "amount": 2, "price": 19}))
+
+    def test_003_from_rows(self) -> None:
+        # column order and extra columns do not matter
+        result = result_set(["order_id", "price", "amount", "dish_id"], [(1, 19, 2, 3), (1, 4.5, 1, 4)])
+        self.assertEqual([OrderDish(3, 2, 19.0), OrderDish(4, 1, 4.5)], OrderDish.from_rows(result))
+        self.assertEqual([], OrderDish.from_rows(ResultSet()))
+        self.assertEqual([], Customer.from_rows(result_set(["cust_id"], [])))
+
+        result = result_set(["phone", "age", "full_name", "cust_id"], [("1234567890", 30, 'Row Person', 1)])
+        self.assertEqual([Customer(1, 'Row Person', 30, "1234567890")], Customer.from_rows(result))
+
+        result = result_set(list(Dish.COLUMNS), [(3, 'Soup', 9, False), (4, 'Salad', None, True)])
+        dishes = Dish.from_rows(result)
+        self.assertEqual([Dish(3, 'Soup', 9.0, False), Dish(4, 'Salad', None, True)], dishes)
+        self.assertIsInstance(dishes[0].get_price(), float)
+
+    def test_004_solution_returns_hydrated_objects(self) -> None:
+        date = datetime(2024, 5, 1, 12, 30)
+        Solution.add_customer(Customer(1, 'Row Person', 30, "1234567890"))
+        Solution.add_order(Order(1, date, 5.0, "Row Street"))
+        Solution.add_dish(Dish(1, 'Soup', 9.5, True))
+        Solution.add_dish(Dish(2, 'Salad', 7.0, True))
+        Solution.customer_placed_order(1, 1)
+        Solution.order_contains_dish(1, 2, 3)
+        Solution.order_contains_dish(1, 1, 2)
+
+        self.assertEqual(Customer(1, 'Row Person', 30, "1234567890"), Solution.get_customer(1))
+        self.assertEqual(Order(1, date, 5.0, "Row Street"), Solution.get_order(1))
+        self.assertEqual(Dish(1, 'Soup', 9.5, True), Solution.get_dish(1))
+        self.assertEqual([OrderDish(1, 2, 9.5), OrderDish(2, 3, 7.0)], Solution.get_all_order_items(1))
+        self.assertEqual(Customer(1, 'Row Person', 30, "1234567890"), Solution.get_customer_that_placed_order(1))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Business.Columnar as Columnar
+from Business.Columnar import OrderItems, CustomerRatings
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Order import Order
+from Business.Dish import Dish
+from Business.OrderDish import OrderDish
+
+
+def add_rows() -> None:
+    Solution.add_customer(Customer(1, 'Column Person', 30, "1234567890"))
+    Solution.add_order(Order(1, datetime(2024, 5, 1, 12, 30), 5.0, "Column Street"))
+    for dish_id, name, price in ((1, 'Soup', 9.5), (2, 'Salad', 7.25), (3, 'Pasta', 12.0)):
+        Solution.add_dish(Dish(dish_id, name, price, True))
+    Solution.order_contains_dish(1, 3, 1)
+    Solution.order_contains_dish(1, 1, 2)
+    Solution.customer_rated_dish(1, 2, 4)
+    Solution.customer_rated_dish(1, 1, 5)
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        add_rows()
+
+    def test_001_same_rows_as_the_list_variants(self) -> None:
+        items = Solution.get_all_order_items_columnar(1)
+        self.assertIsInstance(items, OrderItems)
+        self.assertEqual(Solution.get_all_order_items(1), items)
+        self.assertEqual(Solution.get_all_order_items(1), items.to_list())
+        self.assertEqual(OrderDish(3, 1, 12.0), items[-1])
+        self.assertEqual(3, items.total_amount())
+        self.assertAlmostEqual(31.0, items.total_price())
+
+        ratings = Solution.get_all_customer_ratings_columnar(1)
+        self.assertIsInstance(ratings, CustomerRatings)
+        self.assertEqual(Solution.get_all_customer_ratings(1), ratings)
+        self.assertEqual((1, 5), ratings[0])
+        self.assertEqual(4.5, ratings.mean_rating())
+
+        self.assertEqual(0, len(Solution.get_all_order_items_columnar(2)))
+        self.assertEqual([], Solution.get_all_customer_ratings_columnar(2))
+        self.assertIsNone(Solution.get_all_customer_ratings_columnar(2).mean_rating())
+
+    def test_002_collections(self) -> None:
+        items = OrderItems([1, 2], [3, 1], [2.5, 4])
+        self.assertEqual("d", items.prices.typecode)
+        self.assertEqual(4, items.dish_ids.itemsize)
+        items.append(7, 2, 1)
+        self.assertEqual([OrderDish(1, 3, 2.5), OrderDish(2, 1, 4.0), OrderDish(7, 2, 1.0)], items)
+        self.assertEqual(OrderItems([1, 2, 7], [3, 1, 2], [2.5, 4.0, 1.0]), items)
+        self.assertNotEqual(OrderItems([1], [3], [2.5]), items)
+        self.assertAlmostEqual(13.5, items.total_price())
+        iterator = iter(items)
+        self.assertEqual(OrderDish(1, 3, 2.5), next(iterator))
+        with self.assertRaises(ValueError):
+            OrderItems([1], [1, 2], [1.0])
+        with self.assertRaises(OverflowError):
+            CustomerRatings([2 ** 31], [1])
+
+    @unittest.skipIf(Columnar.numpy is None, "NumPy is not installed")
+    def test_003_numpy_views(self) -> None:
+        items = Solution.get_all_order_items_columnar(1)
+        columns = items.to_numpy()
+        self.assertEqual([1, 3], columns["dish_id"].tolist())
+        self.assertEqual("int32", str(columns["amount"].dtype))
+        self.assertAlmostEqual(31.0, float((columns["amount"] * columns["price"]).sum()))
+        self.assertEqual([5, 4], Solution.get_all_customer_ratings_columnar(1).to_numpy()["rating"].tolist())
+
+    @unittest.skipIf(Columnar.numpy is not None, "NumPy is installed")
+    def test_004_without_numpy(self) -> None:
+        items = Solution.get_all_order_items_columnar(1)
+        self.assertAlmostEqual(31.0, items.total_price())
+        with self.assertRaises(ImportError):
+            items.to_numpy()
+
+
+
+@unittest.skipIf(Connector.get_backend() != "postgresql", "AsyncSolution runs on PostgreSQL")
+class AsyncTest(AbstractTest):
+    # the asynchronous connector has connections of its own, outside the test's transaction
+    transactional = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        add_rows()
+
+    def test_005_async_variants(self) -> None:
+        import AsyncSolution
+        self.assertEqual(Solution.get_all_order_items(1),
+                         asyncio.run(AsyncSolution.get_all_order_items_columnar(1)))
+        self.assertEqual(Solution.get_all_customer_ratings(1),
+                         asyncio.run(AsyncSolution.get_all_customer_ratings_columnar(1)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+import csv
+import random
+import tempfile
+import unittest
+import sys
+import os
+from collections import Counter
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+from Utility.Exceptions import DatabaseException
+from Utility.ReturnValue import ReturnValue
+from Business.Dish import Dish
+from Tests.AbstractTest import AbstractTest
+from Benchmarks.dataset import Dataset, TABLES, _Zipf, load, parse_scale, write_csv
+
+
+class Test(AbstractTest):
+    def test_001_same_seed_same_rows(self) -> None:
+        first = [list(rows) for _, _, rows in Dataset(300, seed=7).tables()]
+        second = [list(rows) for _, _, rows in Dataset(300, seed=7).tables()]
+        other = [list(rows) for _, _, rows in Dataset(300, seed=8).tables()]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(10_000_000, parse_scale("10M"))
+        self.assertEqual(1_500, parse_scale("1.5k"))
+
+    def test_002_load_matches_generated_rows(self) -> None:
+        dataset = Dataset(400, seed=1)
+        counts = load(dataset, fresh=False)
+        self.assertEqual({table: sum(1 for _ in rows) for table, _, rows in dataset.tables()}, counts)
+
+        self.assertEqual(dataset.order_date(1), Solution.get_order(1).get_datetime())
+        for order_id in (1, 200, 400):
+            for item in Solution.get_all_order_items(order_id):
+                self.assertEqual(dataset.price_at(item.get_dish_id(), dataset.order_date(order_id)),
+                                 item.get_price())
+        ratings = [rating for cust_id in range(1, 11) for _, rating in Solution.get_all_customer_ratings(cust_id)]
+        self.assertTrue(all(1 <= rating <= 5 for rating in ratings))
+
+    @unittest.skipIf(Connector.get_backend() == "memory", "the bulk path belongs to the SQL connectors")
+    def test_003_copy_from_maps_constraint_violations(self) -> None:
+        conn = Solution.Connector.DBConnector()
+        try:
+            self.assertEqual(2, conn.copy_from("Dishes", ["dish_id", "name", "price", "is_active"],
+                                               [(1, "Soup of the day", 9.5, True), (2, "Pita", 3.0, False)]))
+        finally:
+            conn.close()
+        for table, columns, row, violation in [
+                ("Ratings", ["cust_id", "dish_id", "rating"], (1, 1, 5), DatabaseException.FOREIGN_KEY_VIOLATION),
+                ("Dishes", ["dish_id", "name", "price", "is_active"], (3, "Pasta", -1.0, True),
+                 DatabaseException.CHECK_VIOLATION),
+                ("Dishes", ["dish_id", "name", "price", "is_active"], (1, "Soup", 1.0, True),
+                 DatabaseException.UNIQUE_VIOLATION)]:
+            conn = Solution.Connector.DBConnector()
+            try:
+                with self.assertRaises(violation):
+                    conn.copy_from(table, columns, [row])
+                conn.rollback()
+            finally:
+                conn.close()
+        self.assertEqual(9.5, Solution.get_dish(1).get_price())
+        self.assertFalse(Solution.get_dish(2).get_is_active())
+
+    def test_004_csv_files(self) -> None:
+        dataset = Dataset(200, seed=3)
+        with tempfile.TemporaryDirectory() as directory:
+            counts = write_csv(dataset, directory)
+            for table, columns in TABLES:
+                with open(os.path.join(directory, table + ".csv"), newline="") as file:
+                    lines = list(csv.reader(file))
+                self.assertEqual(columns, lines[0])
+                self.assertEqual(counts[table], len(lines) - 1)
+        self.assertEqual(200, counts["Orders"])
+
+    @unittest.skipIf(Connector.get_backend() != "memory", "MemorySolution.copy_from is the memory backend's bulk path")
+    def test_005_memory_copy_from_loads_all_or_nothing(self) -> None:
+        import MemorySolution
+        columns = ["dish_id", "name", "price", "is_active"]
+        self.assertEqual(2, MemorySolution.copy_from("Dishes", columns,
+                                                     [(1, "Soup of the day", 9.5, True), (2, "Pita", 3.0, False)]))
+        with self.assertRaises(DatabaseException.CHECK_VIOLATION):
+            MemorySolution.copy_from("Dishes", columns, [(3, "Pasta", 4.0, True), (4, "Salad", -1.0, True)])
+        with self.assertRaises(DatabaseException.UNIQUE_VIOLATION):
+            MemorySolution.copy_from("Dishes", columns, [(5, "Pasta", 4.0, True), (1, "Soup", 1.0, True)])
+        with self.assertRaises(DatabaseException.FOREIGN_KEY_VIOLATION):
+            MemorySolution.copy_from("Ratings", ["cust_id", "dish_id", "rating"], [(1, 1, 5)])
+        self.assertEqual(9.5, Solution.get_dish(1).get_price())
+        for dish_id in (3, 4, 5):
+            self.assertEqual(-1, Solution.get_dish(dish_id).get_dish_id())
+        self.assertEqual(ReturnValue.OK, Solution.add_dish(Dish(3, "Pasta", 4.0, True)))
+
+
+    @unittest.skipIf(Connector.get_backend() == "memory", "the bulk path belongs to the SQL connectors")
+    def test_006_copy_from_keeps_empty_strings_apart_from_null(self) -> None:
+        columns = ["cust_id", "full_name", "age", "phone"]
+        conn = Solution.Connector.DBConnector()
+        try:
+            self.assertEqual(2, conn.copy_from("Customers", columns, [(1, "", 30, "0501234567"),
+                                                                      (2, 'Quoted "Name", Jr.\n', 30, "0501234567")]))
+        finally:
+            conn.close()
+        conn = Solution.Connector.DBConnector()
+        try:
+            with self.assertRaises(DatabaseException.NOT_NULL_VIOLATION):
+                conn.copy_from("Customers", columns, [(3, None, 30, "0501234567")])
+            conn.rollback()
+        finally:
+            conn.close()
+        self.assertEqual("", Solution.get_customer(1).get_full_name())
+        self.assertEqual('Quoted "Name", Jr.\n', Solution.get_customer(2).get_full_name())
+        self.assertEqual(-1, Solution.get_customer(3).get_cust_id())
+
+
+class ZipfTest(unittest.TestCase):
+    def test_001_distribution(self) -> None:
+        for n, s in ((10, 0.8), (10, 1.0), (10, 1.1), (1, 0.8)):
+            zipf, rng = _Zipf(n, s), random.Random(5)
+            counts = Counter(zipf.sample(rng) for _ in range(50_000))
+            total = sum(1 / rank ** s for rank in range(1, n + 1))
+            for rank in range(1, n + 1):
+                self.assertAlmostEqual(1 / rank ** s / total, counts[rank] / 50_000, delta=0.01, msg=(n, s, rank))
+        # no table per rank
+        zipf = _Zipf(10_000_000, 0.8)
+        self.assertTrue(1 <= zipf.sample(random.Random(5)) <= 10_000_000)
+        self.assertLess(sys.getsizeof(vars(zipf)) + sum(map(sys.getsizeof, vars(zipf).values())), 4_000)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+from Utility.Executor import SolutionExecutor
+from Utility.ReturnValue import ReturnValue
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Order import Order
+from Business.Dish import Dish
+
+
+class Test(AbstractTest):
+    def test_001_fan_out_matches_sequential_results(self) -> None:
+        Solution.add_customer(Customer(1, 'Report Person', 30, "1234567890"))
+        Solution.add_dish(Dish(1, 'Soup', 10.0, True))
+        for order_id, year in [(1, 2020), (2, 2021), (3, 2022)]:
+            Solution.add_order(Order(order_id, datetime(year, 5, 1), 2.0, 'Report Street'))
+            Solution.customer_placed_order(1, order_id)
+            Solution.order_contains_dish(order_id, 1, order_id)
+
+        years = list(range(2020, 2023))
+        with SolutionExecutor(max_workers=3) as executor:
+            profits = executor.map(Solution.get_cumulative_profit_per_month, years)
+            max_avg = executor.submit(Solution.get_customers_spent_max_avg_amount_money)
+            non_worth = executor.submit(Solution.get_non_worth_price_increase)
+
+            for year, future in zip(years, profits):
+                self.assertEqual(Solution.get_cumulative_profit_per_month(year), future.result())
+            self.assertEqual([1], max_avg.result())
+            self.assertEqual([], non_worth.result())
+
+            timings = executor.timings()
+            self.assertEqual(5, len(timings))
+            self.assertTrue(all(t.finished is not None and t.elapsed() > 0 for t in timings))
+            self.assertEqual('get_customers_spent_max_avg_amount_money', max_avg.timing.name)
+            self.assertLessEqual(Connector.get_pool().stats().size, 3)
+
+        # the executor's own pool is released on shutdown
+        self.assertIsNone(Connector.get_pool())
+
+    def test_002_pooled_connections_are_reset_between_borrowers(self) -> None:
+        Connector.enable_pool(minconn=1, maxconn=1)
+        try:
+            c = Customer(1, 'Pooled Person', 30, "1234567890")
+            self.assertEqual(ReturnValue.OK, Solution.add_customer(c))
+            # leaves the shared connection in an aborted transaction unless putconn resets it
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.add_customer(c))
+            self.assertEqual(c, Solution.get_customer(1))
+            self.assertEqual(1, Connector.get_pool().stats().size)
+        finally:
+            Connector.disable_pool()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.QueryStats as QueryStats
+from Tests.AbstractTest import AbstractTest
+from Utility.ReturnValue import ReturnValue
+from Business.Customer import Customer, BadCustomer
+from Business.Order import Order
+from Business.Dish import Dish
+from datetime import datetime
+
+
+@unittest.skipIf(Connector.get_backend() != "postgresql", "EXPLAIN capture is a DBConnector feature")
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        threshold = QueryStats.slow_threshold() * 1000
+        self.addCleanup(QueryStats.configure, slow_ms=threshold, explain=False)
+        QueryStats.reset()
+
+    def test_001_explain_leaves_no_trace(self) -> None:
+        conn = Connector.DBConnector()
+        try:
+            plan = conn.explain("INSERT INTO Customers VALUES (1, 'Ghost Person', 30, '1234567890')")
+        finally:
+            conn.close()
+        self.assertEqual("ModifyTable", plan["Plan"]["Node Type"])
+        self.assertIn("Execution Time", plan)
+        self.assertEqual(BadCustomer(), Solution.get_customer(1))
+
+    def test_002_slow_statements_carry_their_plan(self) -> None:
+        Solution.add_customer(Customer(1, 'Plan Person', 30, "1234567890"))
+        Solution.add_dish(Dish(1, 'Soup', 10.0, True))
+        Solution.add_order(Order(1, datetime(2024, 1, 1), 5.0, 'Plan Street'))
+        Solution.order_contains_dish(1, 1, 2)
+        QueryStats.configure(slow_ms=0, explain=True)
+
+        self.assertEqual(25.0, Solution.get_order_total_price(1))
+        # DDL is timed and logged, never explained
+        conn = Connector.DBConnector()
+        try:
+            conn.execute("CREATE TEMPORARY TABLE explain_probe (x INTEGER)")
+        finally:
+            conn.close()
+
+        entries = QueryStats.slow_queries()
+        select = next(entry for entry in entries if entry.caller == "Solution.get_order_total_price")
+        self.assertIn("Plan", select.plan)
+        ddl = next(entry for entry in entries if entry.shape.startswith("CREATE TEMPORARY TABLE"))
+        self.assertIsNone(ddl.plan)
+
+        summary = QueryStats.plan_summary()
+        self.assertEqual(1, summary["totalPricePerOrder"]["plans"])
+        self.assertEqual([], summary["totalPricePerOrder"]["misses"])
+        self.assertIn("totalPricePerOrder: 1 plans", QueryStats.plan_report())
+
+    def test_003_writes_are_explained_without_running_them_again(self) -> None:
+        Solution.add_customer(Customer(1, 'Plan Person', 30, "1234567890"))
+        QueryStats.configure(slow_ms=0, explain=True, explain_analyze=True)
+        self.addCleanup(QueryStats.configure, explain_analyze=QueryStats._load_settings()["analyze"])
+
+        self.assertEqual(ReturnValue.OK, Solution.add_customer(Customer(2, 'Plan Person', 30, "1234567890")))
+        self.assertEqual(ReturnValue.OK, Solution.delete_customer(1))
+        self.assertEqual(Customer(2, 'Plan Person', 30, "1234567890"), Solution.get_customer(2))
+
+        entries = QueryStats.slow_queries()
+        for caller in ("Solution.add_customer", "Solution.delete_customer"):
+            write = next(entry for entry in entries if entry.caller == caller)
+            self.assertEqual("ModifyTable", write.plan["Plan"]["Node Type"], caller)
+            self.assertNotIn("Execution Time", write.plan, caller)
+        select = next(entry for entry in entries if entry.caller == "Solution.get_customer")
+        self.assertIn("Execution Time", select.plan)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
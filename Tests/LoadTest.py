@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Utility.DBConnector as Connector
+from Tests.AbstractTest import AbstractTest
+from Benchmarks.dataset import Dataset, load
+from Benchmarks.loadgen import DEFAULT_MIX, parse_mix, run_load
+
+
+class Test(AbstractTest):
+    # the clients' pooled connections must see the committed dataset
+    transactional = False
+
+    def test_001_clients_run_the_mix(self) -> None:
+        dataset = Dataset(300, seed=2)
+        load(dataset, fresh=False)
+        report = run_load(dataset, clients=3, duration=0.5, seed=1)
+
+        self.assertEqual(set(DEFAULT_MIX), set(report["operations"]))
+        for operation, stats in report["operations"].items():
+            self.assertEqual(stats["calls"], sum(stats["outcomes"].values()))
+            self.assertEqual(0, stats["errors"], f'{operation}: {stats["outcomes"]}')
+        self.assertGreater(report["operations"]["add_order"]["outcomes"]["OK"], 0)
+        self.assertGreater(report["throughput_per_s"], 0)
+
+    @unittest.skipIf(Connector.get_backend() != "postgresql", "the connection pool is a DBConnector feature")
+    def test_002_pool_usage_is_reported(self) -> None:
+        dataset = Dataset(100, seed=2)
+        load(dataset, fresh=False)
+        Connector.enable_pool(0, 2)
+        self.addCleanup(Connector.disable_pool)
+        report = run_load(dataset, clients=4, duration=0.3, mix=parse_mix("read=1"), seed=1)
+        self.assertEqual(2, report["pool"]["max_size"])
+        self.assertLessEqual(report["pool"]["peak_in_use"], 2)
+        self.assertEqual(report["operations"]["read"]["calls"], report["pool"]["acquired"])
+
+    def test_003_parse_mix(self) -> None:
+        self.assertEqual({"add_order": 5.0, "read": 1.0}, parse_mix("add_order=5,read"))
+        with self.assertRaises(Exception):
+            parse_mix("drop_everything=1")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
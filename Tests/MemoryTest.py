@@ -0,0 +1,94 @@
+import random
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import MemorySolution as MemorySolution
+import Utility.DBConnector as Connector
+from Tests import SimpleTest
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Order import Order
+from Business.Dish import Dish
+
+
+# SimpleTest's cases, run against the in-memory backend whatever database.ini selects
+class Test(SimpleTest.Test):
+    transactional = False
+
+    def setUp(self) -> None:
+        patcher = mock.patch.multiple(Solution, **{name: getattr(MemorySolution, name)
+                                                   for name in MemorySolution.__all__})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+# random workloads replayed on both backends must give identical answers
+@unittest.skipIf(Connector.get_backend() == "memory", "needs the PostgreSQL backend to compare against")
+class EquivalenceTest(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        MemorySolution.drop_tables()
+        MemorySolution.create_tables()
+
+    def tearDown(self) -> None:
+        MemorySolution.drop_tables()
+        super().tearDown()
+
+    def both(self, name: str, *args):
+        expected = getattr(Solution, name)(*args)
+        actual = getattr(MemorySolution, name)(*args)
+        self.assertEqual(expected, actual, f'{name}{args}')
+        return expected
+
+    def test_001_random_workload(self) -> None:
+        rng = random.Random(236363)
+        for step in range(400):
+            op = rng.randrange(9)
+            if op == 0:
+                self.both("add_customer", Customer(rng.randint(0, 12), "Customer", rng.choice([17, 30, 60]),
+                                                   rng.choice(["1234567890", "123"])))
+            elif op == 1:
+                self.both("add_order", Order(rng.randint(0, 15), datetime(rng.choice([2022, 2023]), rng.randint(1, 12),
+                                                                          rng.randint(1, 28)),
+                                             rng.choice([0.0, 2.5, 10.0, -1.0]), "Order Street"))
+            elif op == 2:
+                self.both("add_dish", Dish(rng.randint(0, 10), "Dish name", rng.choice([5.5, 10.0, 12.25, 0.0]),
+                                           rng.random() < 0.8))
+            elif op == 3:
+                self.both("customer_placed_order", rng.randint(1, 12), rng.randint(1, 15))
+            elif op == 4:
+                self.both("order_contains_dish", rng.randint(1, 15), rng.randint(1, 10), rng.randint(-1, 6))
+            elif op == 5:
+                self.both("customer_rated_dish", rng.randint(1, 12), rng.randint(1, 10), rng.randint(0, 6))
+            elif op == 6:
+                self.both("update_dish_price", rng.randint(1, 10), rng.choice([5.5, 8.0, 10.0, 15.75, -2.0]))
+            elif op == 7:
+                self.both("update_dish_active_status", rng.randint(1, 10), rng.random() < 0.7)
+            elif step % 5 == 0:
+                self.both(rng.choice(["delete_customer", "delete_order"]), rng.randint(1, 15))
+
+            if step % 20 == 19:
+                for cust_id in range(1, 13):
+                    self.both("get_all_customer_ratings", cust_id)
+                    self.both("did_customer_order_top_rated_dishes", cust_id)
+                    self.both("get_potential_dish_recommendations", cust_id)
+                for order_id in range(1, 16):
+                    self.both("get_all_order_items", order_id)
+                    self.both("get_order_total_price", order_id)
+                    self.both("get_customer_that_placed_order", order_id)
+                self.both("get_customers_spent_max_avg_amount_money")
+                self.both("get_most_ordered_dish_in_period", datetime(2022, 3, 1), datetime(2023, 6, 30))
+                self.both("get_customers_rated_but_not_ordered")
+                self.both("get_non_worth_price_increase")
+                self.both("get_cumulative_profit_per_month_range", 2021, 2023)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+import urllib.request
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.Metrics as Metrics
+import Utility.QueryStats as QueryStats
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        Metrics.reset()
+        QueryStats.reset()
+        Metrics.enable()
+        self.addCleanup(Metrics.disable)
+
+    def test_001_function_calls_and_latencies(self) -> None:
+        Solution.add_customer(Customer(1, 'Metric Person', 30, "1234567890"))
+        Solution.get_customer(1)
+        Solution.get_customer(2)
+
+        text = Metrics.render()
+        self.assertIn('cs236363_function_calls_total{function="Solution.get_customer"} 2', text)
+        self.assertIn('cs236363_function_errors_total{function="Solution.get_customer"} 0', text)
+        self.assertIn('cs236363_function_duration_seconds_bucket{function="Solution.get_customer",le="+Inf"} 2', text)
+        self.assertIn('cs236363_function_duration_seconds_count{function="Solution.add_customer"} 1', text)
+        self.assertIn("# TYPE cs236363_function_duration_seconds histogram", text)
+        if Connector.get_backend() != "memory":
+            self.assertIn('cs236363_statements_total{function="Solution.get_customer"} 2', text)
+
+    def test_002_registered_caches(self) -> None:
+        Metrics.register_cache("test_cache", lambda: (3, 1))
+        self.addCleanup(Metrics.unregister_cache, "test_cache")
+        text = Metrics.render()
+        self.assertIn('cs236363_cache_hits_total{cache="test_cache"} 3', text)
+        self.assertIn('cs236363_cache_hit_ratio{cache="test_cache"} 0.75', text)
+        if Connector.get_backend() == "postgresql":
+            self.assertIn('cs236363_cache_hit_ratio{cache="postgresql_buffers"}', text)
+
+    @unittest.skipIf(Connector.get_backend() != "postgresql", "the connection pool is a DBConnector feature")
+    def test_003_pool_metrics(self) -> None:
+        pool = Connector.enable_pool(0, 3)
+        self.addCleanup(Connector.disable_pool)
+        connection = pool.getconn()
+        text = Metrics.render()
+        self.assertIn('cs236363_pool_connections{state="in_use"} 1', text)
+        pool.putconn(connection)
+        text = Metrics.render()
+        self.assertIn("cs236363_pool_max_connections 3", text)
+        self.assertIn("cs236363_pool_acquired_total 1", text)
+
+    def test_004_served_and_dumped(self) -> None:
+        Solution.get_dish(1)
+        server = Metrics.serve(port=0)
+        try:
+            url = "http://127.0.0.1:%d/metrics" % server.server_address[1]
+            with urllib.request.urlopen(url) as response:
+                served = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('cs236363_function_calls_total{function="Solution.get_dish"} 1', served)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cs236363.prom")
+            Metrics.dump(path)
+            with open(path) as file:
+                self.assertIn('function="Solution.get_dish"', file.read())
+
+
+    def test_005_snapshots(self) -> None:
+        Solution.add_customer(Customer(1, 'Metric Person', 30, "1234567890"))
+        Metrics.register_cache("test_cache", lambda: (1, 1))
+        self.addCleanup(Metrics.unregister_cache, "test_cache")
+        Metrics.register_cache("broken_cache", lambda: 1 / 0)
+        self.addCleanup(Metrics.unregister_cache, "broken_cache")
+
+        calls, errors, total, buckets = Metrics.functions()["Solution.add_customer"]
+        self.assertEqual((1, 0), (calls, errors))
+        self.assertEqual(1, sum(buckets))
+        self.assertEqual(len(Metrics.BUCKETS) + 1, len(buckets))
+        self.assertEqual((1, 1), Metrics.caches()["test_cache"])
+        self.assertNotIn("broken_cache", Metrics.caches())
+
+    @unittest.skipIf(Connector.get_backend() != "postgresql", "reads pg_stat_user_tables")
+    def test_006_postgresql_table_sizes(self) -> None:
+        sizes = {row["table"]: row for row in Metrics.postgresql_table_sizes()}
+        self.assertIn("customers", sizes)
+        self.assertGreater(sizes["customers"]["index_bytes"], 0)
+        self.assertEqual({"table", "live_rows", "dead_rows", "table_bytes", "index_bytes", "seq_scans", "index_scans"},
+                         set(sizes["customers"]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,151 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.GroupCommit as GroupCommit
+import Utility.QueryStats as QueryStats
+from Utility.GroupCommit import OrderGroupCommit
+from Utility.Executor import SolutionExecutor
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer, BadCustomer
+from Business.Order import Order, BadOrder
+from Business.Dish import Dish
+from Business.OrderDish import OrderDish
+
+
+def order(order_id: int, fee: float = 5.0) -> Order:
+    return Order(order_id, datetime(2024, 5, 1, 12, 30), fee, "Placement Street")
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        Solution.add_customer(Customer(1, 'Placing Person', 30, "1234567890"))
+        Solution.add_dish(Dish(1, 'Soup', 9.5, True))
+        Solution.add_dish(Dish(2, 'Salad', 7.25, True))
+        Solution.add_dish(Dish(3, 'Old Dish', 5.0, False))
+
+    def assertNotPlaced(self, order_id: int) -> None:
+        self.assertEqual(BadOrder(), Solution.get_order(order_id))
+        self.assertEqual(BadCustomer(), Solution.get_customer_that_placed_order(order_id))
+        self.assertEqual([], Solution.get_all_order_items(order_id))
+
+    def test_001_placed_in_full(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.place_full_order(order(1), 1, [(2, 1), (1, 3)]))
+        self.assertEqual(order(1), Solution.get_order(1))
+        self.assertEqual(1, Solution.get_customer_that_placed_order(1).get_cust_id())
+        self.assertEqual([OrderDish(1, 3, 9.5), OrderDish(2, 1, 7.25)], Solution.get_all_order_items(1))
+        self.assertEqual(ReturnValue.OK, Solution.place_full_order(order(2), 1, []))
+        self.assertEqual([], Solution.get_all_order_items(2))
+
+    def test_002_all_or_nothing(self) -> None:
+        Solution.place_full_order(order(1), 1, [(1, 1)])
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.place_full_order(order(1), 1, [(2, 1)]))
+        self.assertEqual([OrderDish(1, 1, 9.5)], Solution.get_all_order_items(1))
+
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.place_full_order(order(2, fee=-1.0), 1, [(1, 1)]))
+        self.assertNotPlaced(2)
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.place_full_order(order(3), 7, [(1, 1)]))
+        self.assertNotPlaced(3)
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.place_full_order(order(4), 1, [(1, 1), (3, 1)]))
+        self.assertNotPlaced(4)
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.place_full_order(order(5), 1, [(9, 1)]))
+        self.assertNotPlaced(5)
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.place_full_order(order(6), 1, [(1, -2)]))
+        self.assertNotPlaced(6)
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.place_full_order(order(7), 1, [(1, 1), (1, 2)]))
+        self.assertNotPlaced(7)
+
+    def test_003_several_orders_one_transaction(self) -> None:
+        results = Solution.place_full_orders([
+            (order(1), 1, [(1, 2)]),
+            (order(2), 1, [(3, 1)]),
+            (order(3), 1, [(2, 1)]),
+            (order(1), 1, [(2, 1)]),
+        ])
+        self.assertEqual([ReturnValue.OK, ReturnValue.NOT_EXISTS, ReturnValue.OK, ReturnValue.ALREADY_EXISTS],
+                         results)
+        self.assertEqual([OrderDish(1, 2, 9.5)], Solution.get_all_order_items(1))
+        self.assertNotPlaced(2)
+        self.assertEqual([OrderDish(2, 1, 7.25)], Solution.get_all_order_items(3))
+        self.assertEqual([], Solution.place_full_orders([]))
+
+    def test_004_group_commit(self) -> None:
+        with OrderGroupCommit(max_batch=3, max_delay=60) as orders:
+            futures = [orders.place(order(order_id), 1, [(1, order_id)]) for order_id in (1, 2, 3)]
+            self.assertEqual([ReturnValue.OK] * 3, [future.result(timeout=10) for future in futures])
+            outcome = []
+            late = orders.place(order(2), 1, [], callback=outcome.append)
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, late.result(timeout=0))
+        self.assertEqual([ReturnValue.ALREADY_EXISTS], outcome)
+        self.assertEqual({"orders": 4, "batches": 2, "largest_batch": 3}, orders.stats())
+        self.assertEqual([OrderDish(1, 3, 9.5)], Solution.get_all_order_items(3))
+        with self.assertRaises(RuntimeError):
+            orders.place(order(4), 1, [])
+
+    @unittest.skipIf(Connector.get_backend() == "memory", "the in-memory place_full_order is not grouped")
+    def test_005_group_commit_mode(self) -> None:
+        committer = GroupCommit.enable(max_batch=8, max_delay=0.05)
+        self.addCleanup(GroupCommit.disable)
+        with SolutionExecutor(max_workers=8) as executor:
+            futures = executor.map(Solution.place_full_order, [order(order_id) for order_id in range(1, 9)],
+                                   [1] * 8, [[(1, 1), (2, 2)]] * 8)
+            self.assertEqual([ReturnValue.OK] * 8, [future.result(timeout=10) for future in futures])
+        self.assertEqual(8, committer.stats()["orders"])
+        self.assertLess(committer.stats()["batches"], 8)
+        GroupCommit.disable()
+        self.assertIsNone(GroupCommit.active())
+        self.assertEqual(ReturnValue.OK, Solution.place_full_order(order(9), 1, [(2, 1)]))
+        self.assertEqual(8, committer.stats()["orders"])
+        self.assertEqual(9, len([order_id for order_id in range(1, 10) if Solution.get_all_order_items(order_id)]))
+
+    @unittest.skipIf(Connector.get_backend() == "memory", "the in-memory backend has no connector")
+    def test_006_connector_transaction_and_savepoints(self) -> None:
+        conn = Solution.Connector.DBConnector()
+        try:
+            conn.begin()
+            conn.execute("INSERT INTO Ratings (cust_id, dish_id, rating) VALUES (1, 1, 4)")
+            conn.savepoint("rating")
+            with self.assertRaises(DatabaseException.CHECK_VIOLATION):
+                conn.execute("INSERT INTO Ratings (cust_id, dish_id, rating) VALUES (1, 2, 9)")
+            conn.rollback_to_savepoint("rating")
+            conn.release_savepoint("rating")
+            conn.execute("INSERT INTO Ratings (cust_id, dish_id, rating) VALUES (1, 2, 3)")
+            conn.commit()
+            conn.begin()
+            conn.execute("INSERT INTO Ratings (cust_id, dish_id, rating) VALUES (1, 3, 3)")
+            conn.rollback()
+        finally:
+            conn.close()
+        self.assertEqual([(1, 4), (2, 3)], Solution.get_all_customer_ratings(1))
+
+    @unittest.skipIf(Connector.get_backend() != "postgresql", "slow statements are explained on PostgreSQL")
+    def test_007_explained_statements_keep_the_transaction(self) -> None:
+        self.addCleanup(QueryStats.configure, slow_ms=QueryStats.slow_threshold() * 1000,
+                        explain=QueryStats.explain_enabled())
+        QueryStats.configure(explain=True, slow_ms=0)
+        self.assertEqual(ReturnValue.OK, Solution.place_full_order(order(1), 1, [(1, 2), (2, 1)]))
+        self.assertEqual([ReturnValue.OK, ReturnValue.NOT_EXISTS, ReturnValue.OK], Solution.place_full_orders([
+            (order(2), 1, [(1, 1)]),
+            (order(3), 1, [(3, 1)]),
+            (order(4), 1, [(2, 4)]),
+        ]))
+        QueryStats.configure(explain=False)
+        self.assertEqual(order(1), Solution.get_order(1))
+        self.assertEqual(1, Solution.get_customer_that_placed_order(1).get_cust_id())
+        self.assertEqual([OrderDish(1, 2, 9.5), OrderDish(2, 1, 7.25)], Solution.get_all_order_items(1))
+        self.assertEqual([OrderDish(1, 1, 9.5)], Solution.get_all_order_items(2))
+        self.assertNotPlaced(3)
+        self.assertEqual(1, Solution.get_customer_that_placed_order(4).get_cust_id())
+        self.assertEqual([OrderDish(2, 4, 7.25)], Solution.get_all_order_items(4))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
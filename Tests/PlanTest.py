@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.QueryStats as QueryStats
+from Tests.AbstractTest import AbstractTest
+from Benchmarks.dataset import Dataset, load
+
+# Plan regressions of the advanced queries: each test loads the same generated dataset, runs one
+# function with the planner's estimates captured for its statements (EXPLAIN without ANALYZE) and
+# checks the shape of the plans. The cost budgets are per row loaded, about twice what the current
+# queries are estimated at on this dataset, so they stay as tight at any DATASET size: a plan that
+# grows faster than the data (a per-row rescan, a closure over all customers) outgrows its budget.
+# A query or schema change that blows through one, loses an index, or rescans the whole Ratings or
+# DishOrders table per row fails here before it shows in production.
+
+DATASET = dict(orders=5_000, seed=236363, dishes=300, ratings_per_customer=2.0)
+
+
+def _nested_loops_over_full_ratings(plan: dict) -> list:
+    # nested loops whose inner side scans Ratings sequentially, once per outer row
+    found = []
+    for node in QueryStats.plan_nodes(plan):
+        if node["Node Type"] != "Nested Loop":
+            continue
+        for inner in (child for child in node.get("Plans", []) if child.get("Parent Relationship") == "Inner"):
+            if any(n["Node Type"] == "Seq Scan" and n.get("Relation Name") == "ratings"
+                   for n in QueryStats.plan_nodes(inner)):
+                found.append(node)
+    return found
+
+
+def _rescanning_subplans(plan: dict) -> list:
+    # correlated subqueries that scan DishOrders or Ratings sequentially, once per outer row
+    found = []
+    for node in QueryStats.plan_nodes(plan):
+        if node.get("Parent Relationship") != "SubPlan":
+            continue
+        if any(n["Node Type"] == "Seq Scan" and n.get("Relation Name") in ("dishorders", "ratings")
+               for n in QueryStats.plan_nodes(node)):
+            found.append(node)
+    return found
+
+
+@unittest.skipIf(Connector.get_backend() != "postgresql", "plans are PostgreSQL's")
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.dataset = Dataset(**DATASET)
+        self.rows = sum(load(self.dataset, fresh=False).values())
+        threshold = QueryStats.slow_threshold() * 1000
+        self.addCleanup(QueryStats.configure, slow_ms=threshold, explain=False, explain_analyze=True)
+        QueryStats.reset()
+
+    # the plans of the statements function ran
+    def plans_of(self, name: str, *args) -> list:
+        QueryStats.configure(slow_ms=0, explain=True, explain_analyze=False)
+        getattr(Solution, name)(*args)
+        QueryStats.configure(explain=False)
+        plans = [stats.plan["Plan"] for stats in QueryStats.shapes()
+                 if stats.plan is not None and "Solution." + name in stats.callers]
+        self.assertTrue(plans, f"no plan captured for {name}")
+        return plans
+
+    def assertPlan(self, name: str, args: tuple, cost_per_row: float, index: str = None) -> None:
+        for plan in self.plans_of(name, *args):
+            self.assertLessEqual(plan["Total Cost"], cost_per_row * self.rows, f"{name}: estimated cost over budget")
+            self.assertEqual([], _nested_loops_over_full_ratings(plan), f"{name}: nested loop over full Ratings")
+            self.assertEqual([], _rescanning_subplans(plan), f"{name}: subquery rescans a whole table per row")
+            if index is not None:
+                indexes = {node.get("Index Name") for node in QueryStats.plan_nodes(plan)}
+                self.assertIn(index, indexes, f"{name}: {index} not used")
+
+    def test_001_get_customers_spent_max_avg_amount_money(self) -> None:
+        self.assertPlan("get_customers_spent_max_avg_amount_money", (), cost_per_row=0.15)
+
+    def test_002_get_most_ordered_dish_in_period(self) -> None:
+        self.assertPlan("get_most_ordered_dish_in_period", (datetime(2021, 1, 1), datetime(2021, 3, 1)),
+                        cost_per_row=0.04, index="dishes_pkey")
+
+    def test_003_did_customer_order_top_rated_dishes(self) -> None:
+        self.assertPlan("did_customer_order_top_rated_dishes", (5,), cost_per_row=0.015, index="customerorders_pkey")
+
+    def test_004_get_customers_rated_but_not_ordered(self) -> None:
+        self.assertPlan("get_customers_rated_but_not_ordered", (), cost_per_row=0.012, index="dishorders_pkey")
+
+    def test_005_get_non_worth_price_increase(self) -> None:
+        # comparedPrices is aggregated once, not once per dish
+        self.assertPlan("get_non_worth_price_increase", (), cost_per_row=0.55)
+
+    def test_006_get_cumulative_profit_per_month(self) -> None:
+        self.assertPlan("get_cumulative_profit_per_month", (2021,), cost_per_row=0.035, index="dishorders_pkey")
+        self.assertPlan("get_cumulative_profit_per_month_range", (2020, 2024), cost_per_row=0.05,
+                        index="dishorders_pkey")
+
+    def test_007_get_potential_dish_recommendations(self) -> None:
+        # starts from the customer's own ratings, the similar customers' ratings are index lookups
+        self.assertPlan("get_potential_dish_recommendations", (5,), cost_per_row=0.04, index="ratings_pkey")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
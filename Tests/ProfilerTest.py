@@ -0,0 +1,79 @@
+import os
+import pstats
+import tempfile
+import unittest
+import sys
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.Profiler as Profiler
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+
+
+@Profiler.profile
+def add_and_get(customer_id: int) -> Customer:
+    Solution.add_customer(Customer(customer_id, 'Profiled Person', 30, "1234567890"))
+    return Solution.get_customer(customer_id)
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        Profiler.reset()
+        self.addCleanup(Profiler.reset)
+        self.addCleanup(Profiler.disable)
+
+    def test_001_selected_functions(self) -> None:
+        Profiler.enable(["get_customer"])
+        Solution.add_customer(Customer(1, 'Profiled Person', 30, "1234567890"))
+        for _ in range(3):
+            Solution.get_customer(1)
+
+        profiles = Profiler.profiles()
+        self.assertEqual(["Solution.get_customer"], list(profiles))
+        summary = profiles["Solution.get_customer"].to_dict()
+        self.assertEqual(3, summary["calls"])
+        self.assertEqual(set(Profiler.CATEGORIES), set(summary["breakdown_seconds"]))
+        if Connector.get_backend() != "memory":
+            self.assertEqual(3, summary["statements"])
+            self.assertGreater(summary["breakdown_seconds"][Profiler.DATABASE], 0)
+            self.assertGreater(summary["breakdown_seconds"][Profiler.RESULT_SETS], 0)
+        self.assertGreater(summary["breakdown_seconds"][Profiler.BUSINESS], 0)
+        self.assertIn("Solution.get_customer", Profiler.report())
+
+    def test_002_decorator_counts_nested_calls_once(self) -> None:
+        Profiler.enable()
+        self.assertEqual(Customer(1, 'Profiled Person', 30, "1234567890"), add_and_get(1))
+        profiles = Profiler.profiles()
+        self.assertEqual([add_and_get.__module__ + ".add_and_get"], list(profiles))
+        self.assertEqual(1, profiles[add_and_get.__module__ + ".add_and_get"].calls)
+
+    def test_003_dump(self) -> None:
+        Profiler.enable(["Solution.get_customer"])
+        Solution.get_customer(1)
+        with tempfile.TemporaryDirectory() as directory:
+            written = Profiler.dump(directory)
+            self.assertEqual(sorted(os.path.join(directory, "Solution.get_customer" + extension)
+                                    for extension in (".collapsed", ".pstats")), sorted(written))
+            stats = pstats.Stats(os.path.join(directory, "Solution.get_customer.pstats"))
+            self.assertTrue(any(name == "get_customer" for _, _, name in stats.stats))
+            with open(os.path.join(directory, "Solution.get_customer.collapsed")) as file:
+                lines = file.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertIn("Solution.py:", stack.split(";")[0])
+            self.assertGreater(int(microseconds), 0)
+
+    def test_004_disabled(self) -> None:
+        Profiler.enable(["get_customer"])
+        Profiler.disable()
+        Solution.get_customer(1)
+        self.assertEqual({}, Profiler.profiles())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
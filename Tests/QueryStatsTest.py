@@ -0,0 +1,86 @@
+import json
+import tempfile
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.QueryStats as QueryStats
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Dish import Dish
+
+
+@unittest.skipIf(Connector.get_backend() == "memory", "the in-memory backend runs no statements")
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        threshold = QueryStats.slow_threshold() * 1000
+        self.addCleanup(QueryStats.configure, slow_ms=threshold, log_path="")
+        QueryStats.reset()
+
+    def test_001_statements_are_grouped_by_shape(self) -> None:
+        Solution.add_customer(Customer(1, 'Shape Person', 30, "1234567890"))
+        Solution.add_customer(Customer(2, 'Other Person', 40, "1234567890"))
+        Solution.add_customer(Customer(2, 'Other Person', 40, "1234567890"))
+        Solution.get_customer(1)
+        Solution.get_customer(2)
+
+        stats = {s.shape: s for s in QueryStats.shapes()}
+        insert = next(s for shape, s in stats.items() if shape.startswith("INSERT INTO Customers"))
+        self.assertIn("VALUES ($1, $2, $3, $4)", insert.shape)
+        self.assertEqual((3, 1, 2), (insert.calls, insert.errors, insert.rows))
+        self.assertEqual({"Solution.add_customer": 3}, insert.callers)
+        self.assertEqual(3, sum(count for _, count in insert.histogram()))
+
+        select = next(s for shape, s in stats.items() if s.callers.get("Solution.get_customer"))
+        self.assertEqual((2, 0, 2), (select.calls, select.errors, select.rows))
+        self.assertLessEqual(select.max * 1000, select.percentile_ms(1.0))
+
+    def test_002_slow_statements_are_logged_with_parameters(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "slow.jsonl")
+            QueryStats.configure(slow_ms=0, log_path=path)
+            Solution.add_customer(Customer(7, 'Slow Person', 30, "1234567890"))
+            QueryStats.configure(slow_ms=60_000)
+            Solution.get_customer(7)
+
+            entries = QueryStats.slow_queries()
+            self.assertEqual(1, len(entries))
+            self.assertEqual("Solution.add_customer", entries[0].caller)
+            self.assertEqual([7, 'Slow Person', "1234567890", 30], entries[0].parameters)
+            with open(path) as file:
+                logged = [json.loads(line) for line in file]
+        self.assertEqual(1, len(logged))
+        self.assertEqual(entries[0].shape, logged[0]["shape"])
+        self.assertIn("Solution.add_customer", QueryStats.report())
+
+    def test_003_recording_can_be_turned_off(self) -> None:
+        QueryStats.configure(enabled=False)
+        self.addCleanup(QueryStats.configure, enabled=True)
+        Solution.get_customer(1)
+        self.assertEqual([], QueryStats.shapes())
+
+    def test_004_batches_share_a_shape_and_shapes_are_capped(self) -> None:
+        Solution.add_customer(Customer(1, 'Shape Person', 30, "1234567890"))
+        for dish_id in range(1, 4):
+            Solution.add_dish(Dish(dish_id, 'Shape Dish', 10.0, True))
+        Solution.upsert_ratings([(1, 1, 3), (1, 2, 4)])
+        Solution.upsert_ratings([(1, 1, 5), (1, 2, 5), (1, 3, 5)])
+        upserts = [s for s in QueryStats.shapes() if s.callers.get("Solution.upsert_ratings")]
+        self.assertEqual(1, len(upserts))
+        self.assertEqual(2, upserts[0].calls)
+        self.assertIn("VALUES ($1, $2, $3), ... ON CONFLICT", upserts[0].shape)
+
+        with mock.patch.object(QueryStats, "MAX_SHAPES", 40):
+            for n in range(100):
+                QueryStats.record(f"SELECT {n}", 0.001, 1)
+            self.assertLessEqual(len(QueryStats.shapes()), 40)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
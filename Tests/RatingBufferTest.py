@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+from Utility.RatingBuffer import RatingBuffer
+from Utility.ReturnValue import ReturnValue
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Dish import Dish
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        for cust_id in range(1, 3):
+            Solution.add_customer(Customer(cust_id, 'Buffered Person', 30, "1234567890"))
+        for dish_id in range(1, 5):
+            Solution.add_dish(Dish(dish_id, 'Buffered Dish', 10.0, True))
+
+    def test_001_written_once_max_batch_ratings_wait(self) -> None:
+        with RatingBuffer(max_batch=3, max_delay=60) as ratings:
+            futures = [ratings.submit(1, dish_id, dish_id) for dish_id in range(1, 5)]
+            self.assertEqual([ReturnValue.OK] * 3, [future.result(timeout=10) for future in futures[:3]])
+            self.assertFalse(futures[3].done())
+            self.assertEqual(1, ratings.pending())
+        self.assertEqual(ReturnValue.OK, futures[3].result(timeout=0))
+        self.assertEqual({"submitted": 4, "coalesced": 0, "written": 4, "batches": 2, "fallbacks": 0}, ratings.stats())
+        self.assertEqual([(1, 1), (2, 2), (3, 3), (4, 4)], Solution.get_all_customer_ratings(1))
+
+    def test_002_written_once_the_oldest_waited_max_delay(self) -> None:
+        with RatingBuffer(max_batch=1000, max_delay=0.01) as ratings:
+            self.assertEqual(ReturnValue.OK, ratings.submit(1, 1, 4).result(timeout=10))
+            self.assertEqual([(1, 4)], Solution.get_all_customer_ratings(1))
+
+    def test_003_duplicates_are_coalesced(self) -> None:
+        Solution.customer_rated_dish(1, 1, 1)
+        with RatingBuffer(max_batch=1000, max_delay=60) as ratings:
+            first = ratings.submit(1, 1, 2)
+            second = ratings.submit(1, 1, 5)
+            ratings.submit(2, 1, 3)
+            self.assertEqual(2, ratings.pending())
+            ratings.flush()
+            self.assertEqual((ReturnValue.OK, ReturnValue.OK), (first.result(timeout=0), second.result(timeout=0)))
+        self.assertEqual([(1, 5)], Solution.get_all_customer_ratings(1))
+        self.assertEqual([(1, 3)], Solution.get_all_customer_ratings(2))
+        self.assertEqual((3, 1, 2, 1), tuple(ratings.stats()[key] for key in
+                                             ("submitted", "coalesced", "written", "batches")))
+
+    def test_004_outcome_per_event(self) -> None:
+        outcomes = {}
+        with RatingBuffer(max_batch=1000, max_delay=60) as ratings:
+            for cust_id, dish_id, rating in [(1, 1, 4), (1, 2, 7), (1, 9, 3), (3, 1, 3), (1, 3, 5)]:
+                ratings.submit(cust_id, dish_id, rating,
+                               callback=lambda result, key=(cust_id, dish_id): outcomes.__setitem__(key, result))
+        self.assertEqual({(1, 1): ReturnValue.OK, (1, 2): ReturnValue.BAD_PARAMS, (1, 9): ReturnValue.NOT_EXISTS,
+                          (3, 1): ReturnValue.NOT_EXISTS, (1, 3): ReturnValue.OK}, outcomes)
+        self.assertEqual(1, ratings.stats()["fallbacks"])
+        self.assertEqual([(1, 4), (3, 5)], Solution.get_all_customer_ratings(1))
+
+    def test_005_closed(self) -> None:
+        ratings = RatingBuffer(max_batch=1000, max_delay=60)
+        future = ratings.submit(2, 4, 1)
+        ratings.close()
+        self.assertEqual(ReturnValue.OK, future.result(timeout=0))
+        self.assertEqual([(4, 1)], Solution.get_all_customer_ratings(2))
+        with self.assertRaises(RuntimeError):
+            ratings.submit(2, 3, 1)
+        ratings.close()
+        with self.assertRaises(ValueError):
+            RatingBuffer(max_batch=0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1712,6 +1712,64 @@ class Test(AbstractTest):
         self.assertEqual(ordered_id_result, [5003, 5007], 
                          "Expected recommendations ordered by dish_id")
 
+    def test_027_get_cumulative_profit_per_month_range_edge_cases(self) -> None:
+        from Business.Dish import Dish
+        from Business.Customer import Customer
+        from Business.Order import Order
+        from datetime import datetime
+
+        # Test with an empty range - start year after end year
+        self.assertEqual({}, Solution.get_cumulative_profit_per_month_range(2024, 2023), "Expected empty dict for empty range")
+
+        # Test with no orders in the database - every year in the range has 12 months of 0.0 profit
+        empty_result = Solution.get_cumulative_profit_per_month_range(2022, 2023)
+        self.assertEqual([2022, 2023], list(empty_result.keys()), "Expected one entry per year in range")
+        for year in (2022, 2023):
+            self.assertEqual(Solution.get_cumulative_profit_per_month(year), empty_result[year],
+                             "Expected the same series as the single-year function")
+
+        # Setup data for testing
+        self.assertEqual(ReturnValue.OK, Solution.add_customer(Customer(4100, "Range Test Customer", 25, "1234567890")))
+        self.assertEqual(ReturnValue.OK, Solution.add_dish(Dish(4100, "Range Test Pizza", 50.0, True)))
+
+        # Orders in December 2021, March 2022 and January 2024 (2023 has no orders)
+        orders = [(4100, datetime(2021, 12, 31, 23, 0, 0), 10.0, 1),
+                  (4101, datetime(2022, 3, 1, 0, 0, 0), 5.0, 2),
+                  (4102, datetime(2024, 1, 15, 12, 0, 0), 0.0, 3)]
+        for order_id, date_time, fee, amount in orders:
+            self.assertEqual(ReturnValue.OK, Solution.add_order(Order(order_id, date_time, fee, "Address 123456")))
+            self.assertEqual(ReturnValue.OK, Solution.customer_placed_order(4100, order_id))
+            self.assertEqual(ReturnValue.OK, Solution.order_contains_dish(order_id, 4100, amount))
+
+        # The cumulative sum restarts every year
+        range_result = Solution.get_cumulative_profit_per_month_range(2021, 2024)
+        self.assertEqual([2021, 2022, 2023, 2024], list(range_result.keys()), "Expected years in ascending order")
+        for year in range(2021, 2025):
+            self.assertEqual(Solution.get_cumulative_profit_per_month(year), range_result[year],
+                             f"Expected {year} to match the single-year function")
+        self.assertEqual((12, 60.0), range_result[2021][0], "December 2021 order counted in 2021 only")
+        self.assertEqual((2, 0.0), range_result[2022][10], "Nothing before March 2022")
+        self.assertEqual((3, 105.0), range_result[2022][9], "March 2022 order")
+        self.assertEqual((12, 0.0), range_result[2023][0], "No orders in 2023")
+        self.assertEqual((1, 150.0), range_result[2024][11], "January 2024 order")
+
+        # A single-year range equals the single-year function
+        self.assertEqual({2022: Solution.get_cumulative_profit_per_month(2022)},
+                         Solution.get_cumulative_profit_per_month_range(2022, 2022), "Single-year range")
+
+    def test_028_values_that_read_like_sql_are_stored_as_given(self) -> None:
+        from Business.Dish import Dish
+        from Business.Order import Order
+        from datetime import datetime
+
+        # the SQLite backend rewrites PostgreSQL-only constructs; values must not be rewritten with them
+        dish = Dish(1, 'EXTRACT(YEAR FROM price)', 10.0, True)
+        self.assertEqual(ReturnValue.OK, Solution.add_dish(dish), "Adding a dish named like SQL should succeed")
+        self.assertEqual(dish, Solution.get_dish(1), "Expected the name exactly as given")
+        order = Order(1, datetime(2024, 1, 1, 12, 0), 5.0, "1 INTEGER PRIMARY KEY St")
+        self.assertEqual(ReturnValue.OK, Solution.add_order(order), "Adding an order should succeed")
+        self.assertEqual(order, Solution.get_order(1), "Expected the address exactly as given")
+
 # *** DO NOT RUN EACH TEST MANUALLY ***
 if __name__ == '__main__':
     # Install colorama if it's not already installed
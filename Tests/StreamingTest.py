@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.QueryStats as QueryStats
+import Utility.Tracing as Tracing
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Order import Order
+from Business.Dish import Dish
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        for cust_id in range(1, 4):
+            Solution.add_customer(Customer(cust_id, 'Stream Person', 30, "1234567890"))
+        for dish_id in range(1, 8):
+            Solution.add_dish(Dish(dish_id, 'Stream Dish', 10.0 + dish_id, True))
+        for dish_id in range(1, 8):
+            Solution.customer_rated_dish(1, dish_id, dish_id % 5 + 1)
+        Solution.customer_rated_dish(2, 1, 1)
+        Solution.customer_rated_dish(3, 2, 2)
+        Solution.add_order(Order(1, datetime(2024, 5, 1, 12, 30), 5.0, "Stream Street"))
+        Solution.customer_placed_order(3, 1)
+        Solution.order_contains_dish(1, 2, 3)
+
+    def test_001_same_rows_as_the_list_functions(self) -> None:
+        self.assertEqual(Solution.get_all_customer_ratings(1), list(Solution.iter_all_customer_ratings(1)))
+        self.assertEqual(7, len(list(Solution.iter_all_customer_ratings(1))))
+        self.assertEqual([], list(Solution.iter_all_customer_ratings(4)))
+        self.assertEqual([1, 2], Solution.get_customers_rated_but_not_ordered())
+        self.assertEqual([1, 2], list(Solution.iter_customers_rated_but_not_ordered()))
+        self.assertEqual(Solution.get_customers_spent_max_avg_amount_money(),
+                         list(Solution.iter_customers_spent_max_avg_amount_money()))
+        self.assertEqual(Solution.get_non_worth_price_increase(), list(Solution.iter_non_worth_price_increase()))
+
+    def test_002_batches(self) -> None:
+        for batch_size in (1, 2, 7, 100):
+            self.assertEqual(Solution.get_all_customer_ratings(1),
+                             list(Solution.iter_all_customer_ratings(1, batch_size=batch_size)))
+
+    def test_003_closed_early(self) -> None:
+        ratings = Solution.iter_all_customer_ratings(1, batch_size=2)
+        self.assertEqual((1, 2), next(ratings))
+        ratings.close()
+        # the connection and its cursor were given back, the next calls run as usual
+        Solution.customer_rated_dish(2, 5, 4)
+        self.assertEqual([(1, 1), (5, 4)], list(Solution.iter_all_customer_ratings(2, batch_size=1)))
+
+    @unittest.skipIf(Connector.get_backend() == "memory", "the in-memory backend runs no statements")
+    def test_004_statement_recorded_once(self) -> None:
+        QueryStats.reset()
+        list(Solution.iter_all_customer_ratings(1, batch_size=3))
+        streamed = [stats for stats in QueryStats.shapes() if "Solution.iter_all_customer_ratings" in stats.callers]
+        self.assertEqual(1, len(streamed))
+        self.assertEqual((1, 0, 7), (streamed[0].calls, streamed[0].errors, streamed[0].rows))
+
+    def test_005_one_span_for_the_whole_iteration(self) -> None:
+        Tracing.reset()
+        Tracing.enable()
+        self.addCleanup(Tracing.disable)
+        self.addCleanup(Tracing.reset)
+        ratings = Solution.iter_all_customer_ratings(1, batch_size=3)
+        self.assertEqual([], [span for span in Tracing.spans() if span.kind == Tracing.SPAN_KIND_INTERNAL])
+        self.assertEqual(7, len(list(ratings)))
+        functions = [span for span in Tracing.spans() if span.kind == Tracing.SPAN_KIND_INTERNAL]
+        self.assertEqual(["Solution.iter_all_customer_ratings"], [span.name for span in functions])
+        self.assertEqual(Tracing.STATUS_OK, functions[0].status)
+        if Connector.get_backend() != "memory":
+            statements = [span for span in Tracing.spans() if span.parent_id == functions[0].span_id]
+            self.assertEqual(1, len(statements))
+            self.assertEqual(7, statements[0].attributes["db.rows"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
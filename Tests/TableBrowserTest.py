@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.TableBrowser as TableBrowser
+from Tests.AbstractTest import AbstractTest
+from Benchmarks.dataset import Dataset, load
+
+
+@unittest.skipIf(Connector.get_backend() == "memory", "the table browser reads the SQL tables")
+class Test(AbstractTest):
+    def test_001_pages_cover_the_table_in_key_order(self) -> None:
+        counts = load(Dataset(300, seed=3), fresh=False)
+        for table, key in TableBrowser.TABLES.items():
+            seen, after, pages = [], None, 0
+            while True:
+                rows, after = TableBrowser.page(table, after, 7)
+                self.assertLessEqual(rows.size(), 7)
+                seen += [tuple(row[rows.cols[column]] for column in key) for row in rows.rows]
+                pages += 1
+                if after is None:
+                    break
+            self.assertEqual(counts[table], len(seen), table)
+            self.assertEqual(sorted(seen), seen, table)
+            self.assertEqual(len(set(seen)), len(seen), table)
+            self.assertEqual(max(1, -(-counts[table] // 7)), pages, table)
+
+    def test_002_last_and_empty_pages(self) -> None:
+        rows, after = TableBrowser.page("Customers")
+        self.assertTrue(rows.isEmpty())
+        self.assertIsNone(after)
+        load(Dataset(300, seed=3), fresh=False)
+        conn = TableBrowser.Connector.DBConnector()
+        try:
+            rows, after = TableBrowser.page("DishOrders", (300, 10 ** 6), 5, conn)
+            self.assertTrue(rows.isEmpty())
+            self.assertIsNone(after)
+        finally:
+            conn.close()
+        with self.assertRaises(ValueError):
+            TableBrowser.page("pg_authid")
+
+    def test_003_approximate_count(self) -> None:
+        counts = load(Dataset(300, seed=3), fresh=False)
+        for table in ("Orders", "DishOrders"):
+            estimate = TableBrowser.approximate_count(table)
+            self.assertIsNotNone(estimate, table)
+            self.assertTrue(counts[table] * 0.5 <= estimate <= counts[table] * 1.5, (table, estimate))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import unittest
+import sys
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+import Utility.Tracing as Tracing
+from Utility.Executor import SolutionExecutor
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Dish import Dish
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        Tracing.reset()
+        Tracing.enable()
+        self.addCleanup(Tracing.disable)
+        self.addCleanup(Tracing.reset)
+
+    def test_001_function_and_statement_spans(self) -> None:
+        Solution.add_customer(Customer(1, 'Traced Person', 30, "1234567890"))
+        Solution.get_customer(1)
+
+        spans = Tracing.spans()
+        functions = [span for span in spans if span.kind == Tracing.SPAN_KIND_INTERNAL]
+        self.assertEqual(["Solution.add_customer", "Solution.get_customer"], [span.name for span in functions])
+        self.assertEqual("OK", functions[0].attributes["cs236363.result"])
+        self.assertTrue(all(span.parent_id is None for span in functions))
+        self.assertNotEqual(functions[0].trace_id, functions[1].trace_id)
+        if Connector.get_backend() != "memory":
+            statements = [span for span in spans if span.kind == Tracing.SPAN_KIND_CLIENT]
+            lookup = [span for span in statements if span.parent_id == functions[1].span_id]
+            self.assertEqual(1, len(lookup))
+            self.assertEqual(functions[1].trace_id, lookup[0].trace_id)
+            self.assertEqual(1, lookup[0].attributes["db.rows"])
+            self.assertIn("$1", lookup[0].attributes["db.statement"])
+            self.assertIn("db.pool_wait_ms", lookup[0].attributes)
+            self.assertGreaterEqual(lookup[0].start, functions[1].start)
+
+    def test_002_errors_and_user_spans(self) -> None:
+        with Tracing.span("request", customer=1) as request:
+            Solution.add_customer(Customer(1, 'Traced Person', 30, "1234567890"))
+            Solution.add_customer(Customer(-1, 'Bad Person', 30, "1234567890"))
+        spans = {span.span_id: span for span in Tracing.spans()}
+        children = [span for span in spans.values() if span.parent_id == request.span_id]
+        self.assertEqual(2, len(children))
+        self.assertTrue(all(span.trace_id == request.trace_id for span in spans.values()))
+        self.assertEqual(["OK", "BAD_PARAMS"], [span.attributes["cs236363.result"] for span in children])
+        self.assertEqual(Tracing.STATUS_OK, request.status)
+        self.assertIsNone(Tracing.current_span())
+
+        with self.assertRaises(ZeroDivisionError):
+            with Tracing.span("failing") as failing:
+                1 / 0
+        self.assertEqual(Tracing.STATUS_ERROR, failing.status)
+        self.assertIn("ZeroDivisionError", failing.to_otlp()["status"]["message"])
+
+    def test_003_executor_tasks_join_the_trace(self) -> None:
+        with SolutionExecutor(2) as executor, Tracing.span("batch") as batch:
+            futures = [executor.submit(Solution.get_customer, i) for i in range(1, 4)]
+            for future in futures:
+                future.result()
+        lookups = [span for span in Tracing.spans() if span.name == "Solution.get_customer"]
+        self.assertEqual(3, len(lookups))
+        self.assertTrue(all(span.parent_id == batch.span_id for span in lookups))
+
+    def test_004_otlp_export(self) -> None:
+        Solution.get_customer(1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            written = Tracing.export(path)
+            with open(path) as file:
+                exported = json.load(file)
+        spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(written, len(spans))
+        function = next(span for span in spans if span["name"] == "Solution.get_customer")
+        self.assertEqual(32, len(function["traceId"]))
+        self.assertEqual(16, len(function["spanId"]))
+        self.assertLessEqual(int(function["startTimeUnixNano"]), int(function["endTimeUnixNano"]))
+        if Connector.get_backend() != "memory":
+            statement = next(span for span in spans if span.get("parentSpanId") == function["spanId"])
+            attributes = {attribute["key"]: attribute["value"] for attribute in statement["attributes"]}
+            self.assertEqual({"stringValue": Connector.get_backend()}, attributes["db.system"])
+            self.assertEqual({"intValue": "0"}, attributes["db.rows"])
+
+    def test_005_disabled(self) -> None:
+        Tracing.disable()
+        Solution.get_customer(1)
+        self.assertEqual([], Tracing.spans())
+
+    def test_006_generator_spans_are_current_only_while_they_run(self) -> None:
+        Solution.add_customer(Customer(1, 'Traced Person', 30, "1234567890"))
+        for dish_id in (1, 2):
+            Solution.add_dish(Dish(dish_id, 'Traced Dish', 10.0, True))
+            Solution.customer_rated_dish(1, dish_id, 4)
+        Tracing.reset()
+
+        ratings = Solution.iter_all_customer_ratings(1, batch_size=1)
+        try:
+            next(ratings)
+            self.assertIsNone(Tracing.current_span())
+            Solution.get_customer(1)
+            self.assertEqual(1, len(list(ratings)))
+            self.assertIsNone(Tracing.current_span())
+        finally:
+            ratings.close()
+
+        functions = {span.name: span for span in Tracing.spans() if span.kind == Tracing.SPAN_KIND_INTERNAL}
+        self.assertIsNone(functions["Solution.get_customer"].parent_id)
+        self.assertIsNone(functions["Solution.iter_all_customer_ratings"].parent_id)
+        if Connector.get_backend() != "memory":
+            streamed = functions["Solution.iter_all_customer_ratings"]
+            statements = [span for span in Tracing.spans() if span.kind == Tracing.SPAN_KIND_CLIENT]
+            self.assertTrue(any(span.parent_id == streamed.span_id for span in statements))
+            self.assertFalse(any(span.parent_id == streamed.span_id and "Customers" in span.attributes["db.statement"]
+                                 for span in statements))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
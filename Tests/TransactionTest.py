@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+from unittest import mock
+import psycopg2
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer, BadCustomer
+
+
+@unittest.skipIf(Connector.get_backend() != "postgresql", "outer transactions are a DBConnector feature")
+class Test(AbstractTest):
+    # manages the outer transaction itself
+    transactional = False
+
+    def test_001_outer_transaction_is_rolled_back(self) -> None:
+        c = Customer(1, 'Kept Person', 30, "1234567890")
+        self.assertEqual(ReturnValue.OK, Solution.add_customer(c))
+
+        Connector.begin_outer_transaction()
+        try:
+            self.assertEqual(ReturnValue.OK, Solution.add_customer(Customer(2, 'Rolled Back', 30, "1234567890")))
+            # a violation inside the outer transaction must not abort it
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.add_customer(c))
+            self.assertEqual(ReturnValue.BAD_PARAMS, Solution.add_customer(Customer(3, 'Too Young', 17, "1234567890")))
+            self.assertEqual(ReturnValue.OK, Solution.delete_customer(1))
+            self.assertEqual(BadCustomer(), Solution.get_customer(1))
+            self.assertEqual('Rolled Back', Solution.get_customer(2).get_full_name())
+        finally:
+            Connector.rollback_outer_transaction()
+
+        self.assertEqual(c, Solution.get_customer(1))
+        self.assertEqual(BadCustomer(), Solution.get_customer(2))
+
+    def test_002_schema_keeps_the_configured_options(self) -> None:
+        config = Connector.DBConnector._DBConnector__config()
+        config["options"] = "-c statement_timeout=4321"
+        with mock.patch.object(Connector.DBConnector, "_DBConnector__config", staticmethod(lambda: dict(config))), \
+                mock.patch.dict(os.environ, DB_SCHEMA="public"):
+            params = Connector.DBConnector.connection_params()
+        self.assertEqual("-c statement_timeout=4321 -c search_path=public", params["options"])
+        connection = psycopg2.connect(**params)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT current_setting('statement_timeout'), current_setting('search_path')")
+            self.assertEqual(("4321ms", "public"), cursor.fetchone())
+        finally:
+            connection.close()
+
+
+@unittest.skipIf(Connector.get_backend() != "sqlite", "the SQLite connectors share one connection")
+class SQLiteTest(AbstractTest):
+    def test_001_other_connectors_stay_out_of_an_open_transaction(self) -> None:
+        owner = Solution.Connector.DBConnector()
+        other = Solution.Connector.DBConnector()
+        try:
+            owner.begin()
+            owner.execute("INSERT INTO Customers VALUES (1, 'Owner Person', 30, '1234567890')")
+            with self.assertRaises(DatabaseException.UNKNOWN_ERROR):
+                other.execute("INSERT INTO Customers VALUES (2, 'Other Person', 30, '1234567890')")
+            # neither ends the owner's transaction
+            other.commit()
+            other.rollback()
+            # a Solution.py call on the same thread fails instead of joining the transaction
+            self.assertEqual(ReturnValue.ERROR, Solution.add_customer(Customer(3, 'Third Person', 30, "1234567890")))
+            owner.rollback()
+        finally:
+            other.close()
+            owner.close()
+        self.assertEqual(BadCustomer(), Solution.get_customer(1))
+        self.assertEqual(BadCustomer(), Solution.get_customer(2))
+        self.assertEqual(ReturnValue.OK, Solution.add_customer(Customer(3, 'Third Person', 30, "1234567890")))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Solution as Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Tests.AbstractTest import AbstractTest
+from Business.Customer import Customer
+from Business.Order import Order
+from Business.Dish import Dish
+from Business.OrderDish import OrderDish
+
+
+def add_rows() -> None:
+    Solution.add_customer(Customer(1, 'Upsert Person', 30, "1234567890"))
+    Solution.add_order(Order(1, datetime(2024, 5, 1, 12, 30), 5.0, "Upsert Street"))
+    Solution.add_dish(Dish(1, 'Soup', 9.5, True))
+    Solution.add_dish(Dish(2, 'Salad', 7.25, True))
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        add_rows()
+
+    def test_001_upsert_rating(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.upsert_rating(1, 1, 4))
+        self.assertEqual([(1, 4)], Solution.get_all_customer_ratings(1))
+        # a retry, then a change
+        self.assertEqual(ReturnValue.OK, Solution.upsert_rating(1, 1, 4))
+        self.assertEqual(ReturnValue.OK, Solution.upsert_rating(1, 1, 2))
+        self.assertEqual([(1, 2)], Solution.get_all_customer_ratings(1))
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.customer_rated_dish(1, 1, 5))
+
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.upsert_rating(1, 1, 6))
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.upsert_rating(1, 2, 0))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.upsert_rating(2, 1, 3))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.upsert_rating(1, 3, 3))
+        self.assertEqual([(1, 2)], Solution.get_all_customer_ratings(1))
+
+    def test_002_set_order_item_amount(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.set_order_item_amount(1, 1, 2))
+        self.assertEqual([OrderDish(1, 2, 9.5)], Solution.get_all_order_items(1))
+        self.assertEqual(ReturnValue.OK, Solution.set_order_item_amount(1, 1, 2))
+        # a new amount keeps the price recorded when the dish was added
+        Solution.update_dish_price(1, 11.0)
+        self.assertEqual(ReturnValue.OK, Solution.set_order_item_amount(1, 1, 5))
+        self.assertEqual([OrderDish(1, 5, 9.5)], Solution.get_all_order_items(1))
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.order_contains_dish(1, 1, 1))
+
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.set_order_item_amount(1, 1, -1))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.set_order_item_amount(2, 1, 1))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.set_order_item_amount(1, 3, 1))
+        Solution.update_dish_active_status(2, False)
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.set_order_item_amount(1, 2, 1))
+        Solution.update_dish_active_status(1, False)
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.set_order_item_amount(1, 1, 1))
+        self.assertEqual([OrderDish(1, 5, 9.5)], Solution.get_all_order_items(1))
+
+    def test_004_upsert_ratings(self) -> None:
+        Solution.upsert_rating(1, 1, 1)
+        self.assertEqual(ReturnValue.OK, Solution.upsert_ratings([(1, 1, 3), (1, 2, 2), (1, 2, 5)]))
+        self.assertEqual([(1, 3), (2, 5)], Solution.get_all_customer_ratings(1))
+        self.assertEqual(ReturnValue.OK, Solution.upsert_ratings([]))
+        # all or nothing
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.upsert_ratings([(1, 1, 4), (1, 2, 9)]))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.upsert_ratings([(1, 1, 4), (1, 3, 4)]))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.upsert_ratings([(2, 1, 4)]))
+        self.assertEqual([(1, 3), (2, 5)], Solution.get_all_customer_ratings(1))
+
+
+@unittest.skipIf(Connector.get_backend() != "postgresql", "AsyncSolution runs on PostgreSQL")
+class AsyncTest(AbstractTest):
+    # the asynchronous connector has connections of its own, outside the test's transaction
+    transactional = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        add_rows()
+
+    def test_003_async_variants(self) -> None:
+        import AsyncSolution
+        self.assertEqual(ReturnValue.OK, asyncio.run(AsyncSolution.upsert_rating(1, 1, 4)))
+        self.assertEqual(ReturnValue.OK, asyncio.run(AsyncSolution.upsert_rating(1, 1, 3)))
+        self.assertEqual(ReturnValue.BAD_PARAMS, asyncio.run(AsyncSolution.upsert_rating(1, 1, 9)))
+        self.assertEqual([(1, 3)], Solution.get_all_customer_ratings(1))
+        self.assertEqual(ReturnValue.OK, asyncio.run(AsyncSolution.upsert_ratings([(1, 1, 5), (1, 2, 1)])))
+        self.assertEqual(ReturnValue.NOT_EXISTS, asyncio.run(AsyncSolution.upsert_ratings([(1, 1, 2), (1, 4, 1)])))
+        self.assertEqual([(1, 5), (2, 1)], Solution.get_all_customer_ratings(1))
+        self.assertEqual(ReturnValue.OK, asyncio.run(AsyncSolution.set_order_item_amount(1, 2, 1)))
+        self.assertEqual(ReturnValue.OK, asyncio.run(AsyncSolution.set_order_item_amount(1, 2, 4)))
+        self.assertEqual(ReturnValue.NOT_EXISTS, asyncio.run(AsyncSolution.set_order_item_amount(1, 3, 4)))
+        self.assertEqual([OrderDish(2, 4, 7.25)], Solution.get_all_order_items(1))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,100 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+# Add the parent directory to the path so we can import Solution
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Utility.DBConnector as Connector
+
+if Connector.get_backend() == "sqlite":
+    import Utility.SQLiteConnector as Connector
+
+# Runs the test suite on several worker processes. Every worker gets a schema of its own through
+# DB_SCHEMA (its connections, pooled ones included, set search_path to it), so tests that use the
+# same table names do not collide. Run from the repository root:
+#     python -m Tests.parallel -n 4
+#     python -m Tests.parallel -n 4 Tests/SimpleTest.py
+# With pytest-xdist installed, "python -m pytest -n 4 Tests/*Test.py" isolates workers the same way.
+
+
+def _collect(paths: list) -> list:
+    # Tests/ is a namespace package, which unittest discovery does not walk into
+    paths = paths or sorted(glob.glob(os.path.join("Tests", "*Test.py")))
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite(loader.loadTestsFromName(os.path.normpath(path)[:-len(".py")].replace(os.sep, "."))
+                               for path in paths)
+
+    def flatten(tests):
+        for test in tests:
+            if isinstance(test, unittest.TestSuite):
+                yield from flatten(test)
+            else:
+                yield test.id()
+
+    return list(flatten(suite))
+
+
+def _run_worker(test_ids: list) -> dict:
+    suite = unittest.TestLoader().loadTestsFromNames(test_ids)
+    result = unittest.TestResult()
+    suite.run(result)
+    return {
+        "run": result.testsRun,
+        "skipped": len(result.skipped),
+        "failures": [(str(test), trace) for test, trace in result.failures + result.errors],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the tests on parallel workers, one schema per worker")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("paths", nargs="*", help="test files (default: every Tests/*Test.py)")
+    parser.add_argument("--worker", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(_run_worker(args.worker)))
+        return
+
+    test_ids = _collect(args.paths)
+    workers = max(1, min(args.workers, len(test_ids)))
+    start = time.perf_counter()
+    processes = []
+    for i in range(workers):
+        schema = f"test_worker_{os.getpid()}_{i}"
+        if Connector.get_backend() != "memory":
+            Connector.create_schema(schema)
+        env = dict(os.environ, DB_SCHEMA=schema)
+        process = subprocess.Popen([sys.executable, "-m", "Tests.parallel", "--worker", *test_ids[i::workers]],
+                                   env=env, stdout=subprocess.PIPE, text=True)
+        processes.append((schema, process))
+
+    run, skipped, failures = 0, 0, []
+    for schema, process in processes:
+        out, _ = process.communicate()
+        if Connector.get_backend() != "memory":
+            Connector.drop_schema(schema)
+        if process.returncode != 0:
+            failures.append((schema, f"worker exited with code {process.returncode}"))
+            continue
+        result = json.loads(out.strip().splitlines()[-1])
+        run += result["run"]
+        skipped += result["skipped"]
+        failures += result["failures"]
+
+    for test, trace in failures:
+        print("=" * 70)
+        print("FAIL: " + test)
+        print(trace)
+    print(f"Ran {run} tests on {workers} workers in {time.perf_counter() - start:.3f}s "
+          f"({len(failures)} failed, {skipped} skipped)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import asyncio
+import time
+import psycopg2
+from psycopg2 import errors, extensions, sql
+from typing import Optional, Union
+from Utility.DBConnector import DBConnector, ResultSet
+from Utility.Exceptions import DatabaseException
+import Utility.QueryStats as QueryStats
+
+
+# drives a psycopg2 asynchronous connection until the pending operation completes,
+# parking on the event loop instead of blocking the thread
+async def _wait(connection) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            state = connection.poll()
+        except errors.lookup("23502"):
+            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+        except errors.lookup("23503"):
+            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+        except errors.lookup("23505"):
+            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+        except errors.lookup("23514"):
+            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+
+        if state == extensions.POLL_OK:
+            return
+
+        fd = connection.fileno()
+        ready = loop.create_future()
+        if state == extensions.POLL_READ:
+            loop.add_reader(fd, ready.set_result, None)
+            try:
+                await ready
+            finally:
+                loop.remove_reader(fd)
+        elif state == extensions.POLL_WRITE:
+            loop.add_writer(fd, ready.set_result, None)
+            try:
+                await ready
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise DatabaseException.ConnectionInvalid("Unexpected poll state " + str(state))
+
+
+async def _connect():
+    try:
+        connection = psycopg2.connect(**DBConnector.connection_params(), async_=True)
+        await _wait(connection)
+        return connection
+    except Exception:
+        raise DatabaseException.ConnectionInvalid("Could not connect to database")
+
+
+class AsyncConnectionPool:
+    # keeps up to maxsize asynchronous connections open, minsize of them eagerly
+    def __init__(self, minsize: int = 1, maxsize: int = 10):
+        if minsize < 0 or maxsize < 1 or minsize > maxsize:
+            raise ValueError("expected 0 <= minsize <= maxsize and maxsize >= 1")
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.__idle = []
+        self.__size = 0
+        self.__slots = None
+        self.__closed = False
+
+    # open the first minsize connections
+    async def open(self) -> "AsyncConnectionPool":
+        self.__slots = asyncio.Semaphore(self.maxsize)
+        while self.__size < self.minsize:
+            self.__idle.append(await _connect())
+            self.__size += 1
+        return self
+
+    # borrow a connection, waiting while maxsize connections are in use
+    async def acquire(self):
+        if self.__closed:
+            raise DatabaseException.ConnectionInvalid("Pool is closed")
+        if self.__slots is None:
+            await self.open()
+        await self.__slots.acquire()
+        try:
+            while self.__idle:
+                connection = self.__idle.pop()
+                if not connection.closed:
+                    return connection
+                self.__size -= 1
+            connection = await _connect()
+            self.__size += 1
+            return connection
+        except Exception:
+            self.__slots.release()
+            raise
+
+    # give a borrowed connection back to the pool, a connection still busy with a
+    # cancelled query cannot be reused and is dropped instead
+    def release(self, connection) -> None:
+        if self.__closed or connection.closed or connection.isexecuting():
+            self.__size -= 1
+            if not connection.closed:
+                connection.close()
+        else:
+            self.__idle.append(connection)
+        self.__slots.release()
+
+    # close every idle connection, borrowed ones are closed on release
+    def close(self) -> None:
+        self.__closed = True
+        while self.__idle:
+            self.__idle.pop().close()
+            self.__size -= 1
+
+    # how many connections are currently open (idle and borrowed)
+    def size(self) -> int:
+        return self.__size
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# pool used by AsyncDBConnector.create() when no pool is passed explicitly
+_default_pool: Optional[AsyncConnectionPool] = None
+
+
+async def init_pool(minsize: int = 1, maxsize: int = 10) -> AsyncConnectionPool:
+    global _default_pool
+    close_pool()
+    _default_pool = await AsyncConnectionPool(minsize, maxsize).open()
+    return _default_pool
+
+
+def close_pool() -> None:
+    global _default_pool
+    if _default_pool is not None:
+        _default_pool.close()
+        _default_pool = None
+
+
+class AsyncDBConnector:
+    # use "await AsyncDBConnector.create()", the constructor only wraps an open connection
+    def __init__(self, connection, pool: Optional[AsyncConnectionPool] = None):
+        self.connection = connection
+        self.pool = pool
+        self.cursor = connection.cursor()
+
+    @staticmethod
+    async def create(pool: Optional[AsyncConnectionPool] = None) -> "AsyncDBConnector":
+        pool = pool if pool is not None else _default_pool
+        if pool is not None:
+            return AsyncDBConnector(await pool.acquire(), pool)
+        return AsyncDBConnector(await _connect())
+
+    # close connection (or give it back to its pool)
+    async def close(self):
+        if self.connection is None:
+            return
+        if self.cursor is not None:
+            self.cursor.close()
+        if self.pool is not None:
+            self.pool.release(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+        self.cursor = None
+
+    # asynchronous connections run in autocommit mode, every statement is committed by execute
+    async def commit(self):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Could not commit changes")
+
+    async def rollback(self):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Could not rollback changes")
+
+    # same contract as DBConnector.execute: returns the number of rows effected and a ResultSet
+    async def execute(self, query: Union[str, sql.Composed], printSchema=False) -> tuple[int, ResultSet]:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        start = time.perf_counter()
+        try:
+            self.cursor.execute(query)
+            await _wait(self.connection)
+        except Exception as e:
+            QueryStats.record(query, time.perf_counter() - start, 0, error=type(e).__name__)
+            raise
+        row_effected = max(self.cursor.rowcount, 0)
+        QueryStats.record(query, time.perf_counter() - start, row_effected)
+
+        if self.cursor.description is not None:
+            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
+        else:
+            entries = ResultSet()
+
+        if printSchema:
+            print(entries)
+
+        return row_effected, entries
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,123 @@
+import threading
+import time
+import psycopg2
+from Utility.Exceptions import DatabaseException
+
+
+class PoolStats:
+    # snapshot of a ConnectionPool's counters
+    def __init__(self, size: int, in_use: int, max_size: int, acquired: int, waited: int,
+                 total_wait: float, max_wait: float) -> None:
+        self.size = size
+        self.in_use = in_use
+        self.max_size = max_size
+        self.acquired = acquired
+        self.waited = waited
+        self.total_wait = total_wait
+        self.max_wait = max_wait
+
+    def utilization(self) -> float:
+        return self.in_use / self.max_size
+
+    def avg_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    def __str__(self) -> str:
+        return (f'size={self.size}, in_use={self.in_use}, max_size={self.max_size}, acquired={self.acquired}, '
+                f'waited={self.waited}, avg_wait={self.avg_wait():.6f}s, max_wait={self.max_wait:.6f}s')
+
+
+class ConnectionPool:
+    # thread-safe pool of psycopg2 connections, getconn() blocks while all maxconn are borrowed
+    def __init__(self, params: dict, minconn: int = 1, maxconn: int = 10) -> None:
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("expected 0 <= minconn <= maxconn and maxconn >= 1")
+        self.params = params
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.__lock = threading.Condition()
+        self.__idle = []
+        self.__size = 0
+        self.__in_use = 0
+        self.__closed = False
+        self.__acquired = 0
+        self.__waited = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+        for _ in range(minconn):
+            self.__idle.append(self.__connect())
+            self.__size += 1
+
+    def __connect(self):
+        connection = psycopg2.connect(**self.params)
+        connection.autocommit = False
+        return connection
+
+    # borrow a connection, waiting at most timeout seconds (forever when None)
+    def getconn(self, timeout: float = None):
+        start = time.perf_counter()
+        waited = False
+        with self.__lock:
+            while True:
+                if self.__closed:
+                    raise DatabaseException.ConnectionInvalid("Pool is closed")
+                if self.__idle or self.__size < self.maxconn:
+                    break
+                waited = True
+                remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+                if remaining is not None and remaining <= 0:
+                    raise DatabaseException.ConnectionInvalid("Timed out waiting for a pooled connection")
+                self.__lock.wait(remaining)
+            connection = self.__idle.pop() if self.__idle else None
+            if connection is None:
+                self.__size += 1
+            self.__in_use += 1
+
+        if connection is None or connection.closed:
+            try:
+                connection = self.__connect()
+            except Exception:
+                with self.__lock:
+                    self.__size -= 1
+                    self.__in_use -= 1
+                    self.__lock.notify()
+                raise
+
+        wait = time.perf_counter() - start
+        with self.__lock:
+            self.__acquired += 1
+            self.__waited += waited
+            self.__total_wait += wait
+            self.__max_wait = max(self.__max_wait, wait)
+        return connection
+
+    # return a borrowed connection, whatever transaction it left open is rolled back
+    def putconn(self, connection) -> None:
+        if not connection.closed:
+            try:
+                connection.rollback()
+            except Exception:
+                connection.close()
+        with self.__lock:
+            self.__in_use -= 1
+            if self.__closed or connection.closed:
+                self.__size -= 1
+                if not connection.closed:
+                    connection.close()
+            else:
+                self.__idle.append(connection)
+            self.__lock.notify()
+
+    # close the idle connections, borrowed ones are closed when they are returned
+    def closeall(self) -> None:
+        with self.__lock:
+            self.__closed = True
+            while self.__idle:
+                self.__idle.pop().close()
+                self.__size -= 1
+            self.__lock.notify_all()
+
+    def stats(self) -> PoolStats:
+        with self.__lock:
+            return PoolStats(self.__size, self.__in_use, self.maxconn, self.__acquired, self.__waited,
+                             self.__total_wait, self.__max_wait)
@@ -2,8 +2,98 @@ import psycopg2
 from psycopg2 import errors, sql
 from configparser import ConfigParser
 from Utility.Exceptions import DatabaseException
+from Utility.ConnectionPool import ConnectionPool
+import Utility.QueryStats as QueryStats
+import io
+import itertools
 import os
-from typing import Union
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional, Union
+
+# reads an optional section of database.ini (looked up like DBConnector's credentials), {} when absent
+def read_config_section(section: str) -> dict:
+    parser = ConfigParser()
+    parser.read([os.path.join(os.getcwd(), "Utility", "database.ini"),
+                 os.path.join(os.path.dirname(os.getcwd()), "Utility", "database.ini")])
+    return dict(parser.items(section)) if parser.has_section(section) else {}
+
+
+# which implementation Solution.py runs on: "postgresql" (default) or "memory",
+# the DB_BACKEND environment variable overrides [backend] engine in database.ini
+def get_backend() -> str:
+    return os.environ.get("DB_BACKEND") or read_config_section("backend").get("engine", "postgresql")
+
+
+# suffixes of the server-side cursors of DBConnector.iterate, unique in the process
+_cursor_names = itertools.count(1)
+
+# when set, DBConnector borrows its connection from this pool instead of opening one
+_pool: Optional[ConnectionPool] = None
+
+
+# share up to maxconn connections between all DBConnector instances (thread-safe)
+def enable_pool(minconn: int = 1, maxconn: int = 10) -> ConnectionPool:
+    global _pool
+    disable_pool()
+    _pool = ConnectionPool(DBConnector.connection_params(), minconn, maxconn)
+    return _pool
+
+
+def disable_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+
+
+def get_pool() -> Optional[ConnectionPool]:
+    return _pool
+
+
+# create / drop a schema for DB_SCHEMA to point at (e.g. one per parallel test worker)
+def create_schema(name: str) -> None:
+    _run_admin(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(name)))
+
+
+def drop_schema(name: str) -> None:
+    _run_admin(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(name)))
+
+
+def _run_admin(query: sql.Composed) -> None:
+    connection = psycopg2.connect(**DBConnector.connection_params())
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+    finally:
+        connection.close()
+
+
+# when set, every DBConnector joins the transaction open on this connection instead of committing
+_outer = None
+_outer_lock = threading.RLock()
+
+
+# open a transaction that every DBConnector joins until rollback_outer_transaction():
+# commit() becomes a no-op, rollback() undoes only that connector's statements and each
+# statement runs under a savepoint, so a constraint violation does not abort the transaction
+def begin_outer_transaction() -> None:
+    global _outer
+    rollback_outer_transaction()
+    connection = psycopg2.connect(**DBConnector.connection_params())
+    connection.autocommit = False
+    _outer = connection
+
+
+# discard everything done since begin_outer_transaction()
+def rollback_outer_transaction() -> None:
+    global _outer
+    with _outer_lock:
+        if _outer is not None:
+            _outer.rollback()
+            _outer.close()
+            _outer = None
 
 
 class ResultSetDict(dict):
@@ -70,29 +160,123 @@ class ResultSet:
                 self.cols[col] = index
 
 
+# one field of a COPY CSV line: COPY reads an unquoted empty field as NULL, so None is written
+# as one and every string is quoted ('' as "", which stays an empty string)
+def _csv_field(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+# file-like object COPY reads from: renders rows as CSV lines only as fast as they are consumed
+class _CsvStream(io.TextIOBase):
+    def __init__(self, rows: Iterable[tuple]):
+        self.rows = iter(rows)
+        self.count = 0
+        self.buffer = io.StringIO()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or self.buffer.tell() < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self.buffer.write(",".join(map(_csv_field, row)) + "\n")
+            self.count += 1
+        data = self.buffer.getvalue()
+        chunk, rest = (data, "") if size < 0 else (data[:size], data[size:])
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.buffer.write(rest)
+        return chunk
+
+
 class DBConnector:
     # constructor
     def __init__(self):
+        self.outer = False
+        # inside begin() ... commit() / rollback(): execute leaves its statements uncommitted
+        self.transaction = False
+        # seconds spent waiting for a pooled connection, reported with every statement
+        self.pool_wait = 0.0
         try:
-            # Obtain the configuration parameters
-            params = DBConnector.__config()
-            self.connection = psycopg2.connect(**params)
-            self.connection.autocommit = False
+            self.pool = _pool
+            if _outer is not None:
+                # connectors take turns on the shared transaction, one at a time
+                _outer_lock.acquire()
+                self.outer = True
+                self.pool = None
+                self.connection = _outer
+                self.cursor = self.connection.cursor()
+                self.cursor.execute("SAVEPOINT dbconnector")
+                return
+            if self.pool is not None:
+                start = time.perf_counter()
+                self.connection = self.pool.getconn()
+                self.pool_wait = time.perf_counter() - start
+            else:
+                # Obtain the configuration parameters
+                params = DBConnector.connection_params()
+                self.connection = psycopg2.connect(**params)
+                self.connection.autocommit = False
             self.cursor = self.connection.cursor()
         except Exception as e:
+            if self.outer:
+                self.outer = False
+                _outer_lock.release()
             self.connection = None
             self.cursor = None
             raise DatabaseException.ConnectionInvalid("Could not connect to database")
 
-    # close connection
+    # close connection (pooled connections are handed back instead, the outer transaction stays open);
+    # a transaction still open is rolled back
     def close(self):
+        if self.outer:
+            try:
+                if self.connection is not None and not self.connection.closed:
+                    if self.transaction:
+                        # the outer transaction outlives this connector, undo what it left uncommitted
+                        self.cursor.execute("ROLLBACK TO SAVEPOINT dbconnector")
+                    self.cursor.execute("RELEASE SAVEPOINT dbconnector")
+                    self.cursor.close()
+            finally:
+                self.outer = False
+                self.transaction = False
+                self.cursor = None
+                self.connection = None
+                _outer_lock.release()
+            return
+        self.transaction = False
         if self.cursor is not None:
             self.cursor.close()
+            self.cursor = None
         if self.connection is not None:
-            self.connection.close()
+            if self.pool is not None:
+                self.pool.putconn(self.connection)
+            else:
+                self.connection.close()
+            self.connection = None
+
+    # group the statements executed from here on into one transaction, committed (once) by
+    # commit() or undone by rollback(); savepoints inside it undo part of it
+    def begin(self):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        self.transaction = True
 
     # commit connection's changes
     def commit(self):
+        ended, self.transaction = self.transaction, False
+        if self.outer:
+            if ended and self.connection is not None:
+                # a later rollback() must not undo the committed transaction
+                self.cursor.execute("RELEASE SAVEPOINT dbconnector")
+                self.cursor.execute("SAVEPOINT dbconnector")
+            return
         if self.connection is not None:
             try:
                 self.connection.commit()
@@ -101,23 +285,139 @@ class DBConnector:
 
     # rollback connection's changes
     def rollback(self):
+        self.transaction = False
         if self.connection is not None:
             try:
+                if self.outer:
+                    self.cursor.execute("ROLLBACK TO SAVEPOINT dbconnector")
+                    return
                 self.connection.rollback()
             except Exception:
                 raise DatabaseException.ConnectionInvalid("Could not rollback changes")
 
+    # SAVEPOINT name, inside begin(): rollback_to_savepoint(name) then undoes what was executed
+    # after it (a failed statement included) and leaves the transaction usable
+    def savepoint(self, name: str):
+        self.__savepoint("SAVEPOINT {}", name)
+
+    def rollback_to_savepoint(self, name: str):
+        self.__savepoint("ROLLBACK TO SAVEPOINT {}", name)
+
+    def release_savepoint(self, name: str):
+        self.__savepoint("RELEASE SAVEPOINT {}", name)
+
+    def __savepoint(self, statement: str, name: str):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        self.cursor.execute(sql.SQL(statement).format(sql.Identifier(name)))
+
     # executes the query, if it is SELECT you may ask to print the results with printSchema
     # returns the number of rows effected and a ResultSet (for SELECT)
     def execute(self, query: Union[str, sql.Composed], printSchema=False) -> tuple[int, ResultSet]:
         if self.connection is None:
             raise DatabaseException.ConnectionInvalid("Connection Invalid")
 
-        # try to execute the query
+        # try to execute the query, timing it for QueryStats
+        start = time.perf_counter()
         try:
-            self.cursor.execute(query)
+            row_effected, description, results = self.__run(query)
+        except Exception as e:
+            QueryStats.record(query, time.perf_counter() - start, 0, error=type(e).__name__, pool_wait=self.pool_wait)
+            raise
+        QueryStats.record(query, time.perf_counter() - start, row_effected, explain=self.explain,
+                          pool_wait=self.pool_wait)
+
+        # get entries in case of SELECT
+        if description is not None:
+            entries = ResultSet(description, results)
+        else:
+            entries = ResultSet()
+
+        # print SELECT entries
+        if printSchema:
+            print(entries)
+
+        return row_effected, entries
+
+    # streams the rows of a SELECT in ResultSets of up to batch_size rows, read through a
+    # server-side (named) cursor so only one batch is in memory at a time; the cursor lives in a
+    # transaction of its own, committed once the last batch was read (or the iteration stopped).
+    # Keep the connector to this iteration until it ends. QueryStats gets the time spent in the
+    # database, without the time the caller took between batches
+    def iterate(self, query: Union[str, sql.Composed], batch_size: int = 1000) -> Iterator[ResultSet]:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        cursor = self.connection.cursor(name=f"dbconnector_{next(_cursor_names)}")
+        seconds, rows, error = 0.0, 0, None
+        try:
+            start = time.perf_counter()
+            if self.outer:
+                self.cursor.execute("SAVEPOINT dbconnector_statement")
+            cursor.execute(query)
+            results = cursor.fetchmany(batch_size)
+            seconds += time.perf_counter() - start
+            while results:
+                rows += len(results)
+                yield ResultSet(cursor.description, results)
+                start = time.perf_counter()
+                results = cursor.fetchmany(batch_size)
+                seconds += time.perf_counter() - start
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            QueryStats.record(query, seconds, rows, error=error, pool_wait=self.pool_wait)
+            if error is None:
+                cursor.close()
+                if self.outer:
+                    self.cursor.execute("RELEASE SAVEPOINT dbconnector_statement")
+                if not self.transaction:
+                    self.commit()
+            elif self.outer:
+                # as in __run, a failed statement is undone on its own; otherwise the caller rolls back
+                self.cursor.execute("ROLLBACK TO SAVEPOINT dbconnector_statement")
+
+    # EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of the query, run in a savepoint that is rolled back
+    # so that writes leave no trace; returns the plan (the object holding "Plan", "Execution Time", ...).
+    # analyze=False returns the planner's estimates without running the query
+    def explain(self, query: Union[str, sql.Composed], analyze: bool = True) -> dict:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        statement = sql.SQL(query) if isinstance(query, str) else query
+        self.cursor.execute("SAVEPOINT dbconnector_explain")
+        try:
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+            self.cursor.execute(sql.SQL("EXPLAIN (" + options + ") ") + statement)
+            return self.cursor.fetchone()[0][0]
+        finally:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT dbconnector_explain")
+            self.cursor.execute("RELEASE SAVEPOINT dbconnector_explain")
+            # after a committed statement nothing else is pending; inside begin() (or the outer
+            # transaction) the savepoint alone undoes the EXPLAIN, the caller's statements stay
+            if not self.outer and not self.transaction:
+                self.connection.rollback()
+
+    # runs the query and commits (unless inside begin()), returns (rows effected, description, fetched rows)
+    def __run(self, query: Union[str, sql.Composed]) -> tuple:
+        try:
+            # inside the outer transaction a failing statement is rolled back on its own, as if it
+            # had run in its own transaction
+            if self.outer:
+                self.cursor.execute("SAVEPOINT dbconnector_statement")
+            try:
+                self.cursor.execute(query)
+            except Exception:
+                if self.outer:
+                    self.cursor.execute("ROLLBACK TO SAVEPOINT dbconnector_statement")
+                raise
             row_effected = max(self.cursor.rowcount, 0)
-            self.commit()
+            description = self.cursor.description
+            results = self.cursor.fetchall() if description is not None else None
+            if self.outer:
+                self.cursor.execute("RELEASE SAVEPOINT dbconnector_statement")
+            if not self.transaction:
+                self.commit()
         except errors.lookup("23502"):
             raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
         except errors.lookup("23503"):
@@ -126,18 +426,50 @@ class DBConnector:
             raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
         except errors.lookup("23514"):
             raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+        return row_effected, description, results
 
-        # get entries in case of SELECT
-        if self.cursor.description is not None:
-            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
-        else:
-            entries = ResultSet()
+    # bulk path: streams rows (tuples in the order of columns) into table with COPY ... FROM STDIN,
+    # committed as a single statement; returns the number of rows copied
+    def copy_from(self, table: str, columns: List[str], rows: Iterable[tuple]) -> int:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
 
-        # print SELECT entries
-        if printSchema:
-            print(entries)
+        query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+            sql.Identifier(table.lower()), sql.SQL(", ").join(map(sql.Identifier, columns)))
+        stream = _CsvStream(rows)
+        try:
+            if self.outer:
+                self.cursor.execute("SAVEPOINT dbconnector_statement")
+            try:
+                self.cursor.copy_expert(query, stream)
+            except Exception:
+                if self.outer:
+                    self.cursor.execute("ROLLBACK TO SAVEPOINT dbconnector_statement")
+                raise
+            if self.outer:
+                self.cursor.execute("RELEASE SAVEPOINT dbconnector_statement")
+            if not self.transaction:
+                self.commit()
+        except errors.lookup("23502"):
+            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+        except errors.lookup("23503"):
+            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+        except errors.lookup("23505"):
+            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+        except errors.lookup("23514"):
+            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+        return stream.count
 
-        return row_effected, entries
+    # connection parameters read from database.ini (shared with the other connectors),
+    # DB_SCHEMA puts every connection's tables in that schema instead of public
+    @staticmethod
+    def connection_params() -> dict:
+        params = DBConnector.__config()
+        schema = os.environ.get("DB_SCHEMA")
+        if schema:
+            # after any options of database.ini, which stay in effect
+            params["options"] = (params.get("options", "") + " -c search_path=" + schema).strip()
+        return params
 
     # grant credentials
     @staticmethod
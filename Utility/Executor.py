@@ -0,0 +1,88 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+import Utility.DBConnector as Connector
+
+
+class TaskTiming:
+    # wall-clock timeline of one submitted call, filled in as the task runs
+    def __init__(self, name: str, args: tuple) -> None:
+        self.name = name
+        self.args = args
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    # time spent waiting for a free worker
+    def queued(self) -> float:
+        return (self.started or time.perf_counter()) - self.submitted
+
+    # time spent running (including waiting for a pooled connection)
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def __str__(self) -> str:
+        args = ', '.join(repr(arg) for arg in self.args)
+        return f'{self.name}({args}): elapsed={self.elapsed():.6f}s, queued={self.queued():.6f}s'
+
+
+# Runs independent Solution.py calls concurrently on a bounded thread pool.
+# Each worker needs its own connection, so unless a connection pool is already enabled the
+# executor enables one with max_workers connections and disables it again on shutdown().
+# submit() returns a concurrent.futures.Future whose result is the call's return value, the
+# matching TaskTiming is available as future.timing and through timings() / report().
+class SolutionExecutor:
+    def __init__(self, max_workers: int = 4) -> None:
+        self.max_workers = max_workers
+        self.__owns_pool = Connector.get_pool() is None
+        if self.__owns_pool:
+            Connector.enable_pool(minconn=0, maxconn=max_workers)
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solution")
+        self.__timings: List[TaskTiming] = []
+        self.__lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        timing = TaskTiming(getattr(fn, "__name__", repr(fn)), args)
+        with self.__lock:
+            self.__timings.append(timing)
+
+        def run():
+            timing.started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timing.finished = time.perf_counter()
+
+        # the task runs in the submitter's context, so e.g. tracing spans nest under the caller's
+        future = self.__executor.submit(contextvars.copy_context().run, run)
+        future.timing = timing
+        return future
+
+    # submit fn once per argument tuple, in order
+    def map(self, fn: Callable, *iterables) -> List[Future]:
+        return [self.submit(fn, *args) for args in zip(*iterables)]
+
+    def timings(self) -> List[TaskTiming]:
+        with self.__lock:
+            return list(self.__timings)
+
+    # finished tasks, slowest first
+    def report(self) -> str:
+        done = [t for t in self.timings() if t.finished is not None]
+        done.sort(key=lambda t: t.elapsed(), reverse=True)
+        return '\n'.join(str(t) for t in done)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.__executor.shutdown(wait=wait)
+        if self.__owns_pool:
+            Connector.disable_pool()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
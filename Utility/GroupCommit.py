@@ -0,0 +1,141 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+from Utility.ReturnValue import ReturnValue
+
+# Group commit for Solution.place_full_order: concurrent calls are queued and a background thread
+# writes them together with Solution.place_full_orders, one transaction and one commit for up to
+# max_batch orders, each in a savepoint of its own so a failing order is undone alone. A batch is
+# written once max_batch orders wait or the first has waited max_delay seconds, and orders keep
+# queueing while one is being written, so the more callers there are the fuller the batches get.
+#     GroupCommit.enable(max_batch=64, max_delay=0.002)     every place_full_order call goes through it
+#     Solution.place_full_order(order, cust_id, items)      blocks until its batch was committed
+#     GroupCommit.disable()                                  writes what is queued, then stops
+# or explicitly, without the mode: with OrderGroupCommit() as orders: orders.place(...) -> Future.
+# A caller waits up to max_delay longer than a place_full_order of its own would take, in exchange
+# for sharing the commit (and its flush to disk) with the rest of the batch. Only the PostgreSQL
+# and SQLite backends route place_full_order through it.
+
+
+class _Queued:
+    __slots__ = ("order", "future", "since")
+
+    def __init__(self, order: tuple) -> None:
+        self.order = order
+        self.future = Future()
+        self.since = time.perf_counter()
+
+
+class OrderGroupCommit:
+    def __init__(self, max_batch: int = 64, max_delay: float = 0.002) -> None:
+        if max_batch < 1 or max_delay < 0:
+            raise ValueError("max_batch must be at least 1 and max_delay not negative")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.__queue: List[_Queued] = []
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__counts = {"orders": 0, "batches": 0, "largest_batch": 0}
+        self.__thread = threading.Thread(target=self.__run, name="group-commit", daemon=True)
+        self.__thread.start()
+
+    # queue place_full_order(order, cust_id, items); the future's result is its ReturnValue,
+    # which is also passed to callback
+    def place(self, order, cust_id: int, items: List[Tuple[int, int]],
+              callback: Callable[[ReturnValue], None] = None) -> Future:
+        queued = _Queued((order, cust_id, list(items)))
+        if callback is not None:
+            queued.future.add_done_callback(lambda done: callback(done.result()))
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("cannot place orders through a closed OrderGroupCommit")
+            self.__queue.append(queued)
+            if len(self.__queue) >= self.max_batch or len(self.__queue) == 1:
+                self.__condition.notify()
+        return queued.future
+
+    # stop accepting orders and write the queued ones; returns once they are committed
+    def close(self) -> None:
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join()
+
+    def pending(self) -> int:
+        with self.__condition:
+            return len(self.__queue)
+
+    # orders written, batches (transactions) committed and the most orders one of them held
+    def stats(self) -> Dict[str, int]:
+        with self.__condition:
+            return dict(self.__counts)
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                while not self.__closed:
+                    if self.__queue:
+                        if len(self.__queue) >= self.max_batch:
+                            break
+                        remaining = self.__queue[0].since + self.max_delay - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        self.__condition.wait(remaining)
+                    else:
+                        self.__condition.wait()
+                batch, self.__queue = self.__queue[:self.max_batch], self.__queue[self.max_batch:]
+                done = self.__closed and not self.__queue
+            if batch:
+                self.__write(batch)
+            if done:
+                return
+
+    def __write(self, batch: List[_Queued]) -> None:
+        import Solution
+        try:
+            results = Solution.place_full_orders([queued.order for queued in batch])
+        except Exception:
+            results = [ReturnValue.ERROR] * len(batch)
+        with self.__condition:
+            self.__counts["orders"] += len(batch)
+            self.__counts["batches"] += 1
+            self.__counts["largest_batch"] = max(self.__counts["largest_batch"], len(batch))
+        for queued, result in zip(batch, results):
+            queued.future.set_result(result)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_committer: List[Optional[OrderGroupCommit]] = [None]
+_lock = threading.Lock()
+
+
+# the committer place_full_order hands its calls to, None when group commit is off
+def active() -> Optional[OrderGroupCommit]:
+    return _committer[0]
+
+
+def enable(max_batch: int = 64, max_delay: float = 0.002) -> OrderGroupCommit:
+    with _lock:
+        previous, _committer[0] = _committer[0], OrderGroupCommit(max_batch, max_delay)
+    if previous is not None:
+        previous.close()
+    return _committer[0]
+
+
+def disable() -> None:
+    with _lock:
+        previous, _committer[0] = _committer[0], None
+    if previous is not None:
+        previous.close()
+
+
+atexit.register(disable)
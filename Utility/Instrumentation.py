@@ -0,0 +1,145 @@
+import functools
+import inspect
+import threading
+import time
+from typing import List, Optional
+
+# Hooks around the public Solution.py functions. Solution.py wraps every public function once, at
+# import; the wrappers tell the registered listeners (Utility/Metrics.py, ...) when a call starts
+# and how it ended. With no listener registered a call costs one extra list check.
+
+
+class FunctionListener:
+    # called when a wrapped function starts, the returned token is handed back to function_finished
+    def function_started(self, name: str) -> object:
+        return None
+
+    # result is the function's return value (None if it raised error)
+    def function_finished(self, name: str, token: object, seconds: float, result: object,
+                          error: Optional[BaseException]) -> None:
+        pass
+
+    # a generator function's call starts at its generator's first next(); the token is handed
+    # back to generator_resumed, generator_suspended and function_finished
+    def generator_started(self, name: str) -> object:
+        return self.function_started(name)
+
+    # the generator's body runs in pieces, one per next(), send(), throw() or close() of the
+    # caller; these are called right before and after each piece, on the caller's thread
+    def generator_resumed(self, name: str, token: object) -> object:
+        return None
+
+    def generator_suspended(self, name: str, token: object, resumed: object) -> None:
+        pass
+
+
+_listeners: List[FunctionListener] = []
+_lock = threading.Lock()
+
+
+def add_listener(listener: FunctionListener) -> None:
+    global _listeners
+    with _lock:
+        if listener not in _listeners:
+            # copied on write, so the wrappers can iterate without taking the lock
+            _listeners = _listeners + [listener]
+
+
+def remove_listener(listener: FunctionListener) -> None:
+    global _listeners
+    with _lock:
+        _listeners = [registered for registered in _listeners if registered is not listener]
+
+
+def listeners() -> List[FunctionListener]:
+    return list(_listeners)
+
+
+def _wrap(name: str, function):
+    if inspect.isgeneratorfunction(function):
+        return _wrap_generator(name, function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        registered = _listeners
+        if not registered:
+            return function(*args, **kwargs)
+        tokens = [listener.function_started(name) for listener in registered]
+        start = time.perf_counter()
+        result, error = None, None
+        try:
+            result = function(*args, **kwargs)
+            return result
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            for listener, token in zip(reversed(registered), reversed(tokens)):
+                listener.function_finished(name, token, seconds, result, error)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+# a generator function's call lasts until its generator is exhausted or closed, the caller's time
+# between items included; result is None
+def _wrap_generator(name: str, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        registered = _listeners
+        if not registered:
+            return (yield from function(*args, **kwargs))
+        tokens = [listener.generator_started(name) for listener in registered]
+        start = time.perf_counter()
+        error = None
+        generator = function(*args, **kwargs)
+        try:
+            # yield from, one piece of the body at a time, so the listeners see each resume
+            sent, thrown = None, None
+            while True:
+                try:
+                    if thrown is None:
+                        item = _resume(name, registered, tokens, generator.send, sent)
+                    else:
+                        item = _resume(name, registered, tokens, generator.throw, thrown)
+                except StopIteration as stop:
+                    return stop.value
+                sent, thrown = None, None
+                try:
+                    sent = yield item
+                except GeneratorExit:
+                    _resume(name, registered, tokens, generator.close)
+                    raise
+                except BaseException as e:
+                    thrown = e
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            for listener, token in zip(reversed(registered), reversed(tokens)):
+                listener.function_finished(name, token, seconds, None, error)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def _resume(name: str, registered: List[FunctionListener], tokens: list, step, *args):
+    resumed = [listener.generator_resumed(name, token) for listener, token in zip(registered, tokens)]
+    try:
+        return step(*args)
+    finally:
+        for listener, token, piece in zip(reversed(registered), reversed(tokens), reversed(resumed)):
+            listener.generator_suspended(name, token, piece)
+
+
+# wraps the public functions defined in the given modules (by name) found in namespace, reporting
+# them as prefix + function name
+def instrument(namespace: dict, modules: tuple = ("Solution", "MemorySolution"), prefix: str = "Solution.") -> None:
+    for name, value in list(namespace.items()):
+        if (inspect.isfunction(value) and not name.startswith("_") and value.__module__ in modules
+                and not getattr(value, "__instrumented__", False)):
+            namespace[name] = _wrap(prefix + name, value)
@@ -0,0 +1,218 @@
+import threading
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from Utility.Exceptions import DatabaseException
+
+
+class Table:
+    # rows are kept in a dict keyed by the primary key tuple (the hash index), every foreign key
+    # column additionally gets a value -> primary keys index for lookups and cascading deletes
+    def __init__(self, name: str, columns: List[str], primary_key: List[str], not_null: List[str] = (),
+                 checks: List[Callable[[dict], bool]] = (),
+                 foreign_keys: Dict[str, Tuple[str, str]] = None) -> None:
+        self.name = name
+        self.columns = columns
+        self.primary_key = primary_key
+        # primary key columns are implicitly NOT NULL
+        self.not_null = list(primary_key) + [c for c in not_null if c not in primary_key]
+        self.checks = checks
+        self.foreign_keys = foreign_keys or {}
+        self.rows: Dict[tuple, dict] = {}
+        self.indexes: Dict[str, Dict[object, set]] = {column: {} for column in self.foreign_keys}
+
+    def key(self, row: dict) -> tuple:
+        return tuple(row[column] for column in self.primary_key)
+
+    def get(self, *key) -> Optional[dict]:
+        return self.rows.get(key)
+
+    # rows whose column equals value, through the index when there is one
+    def lookup(self, column: str, value) -> List[dict]:
+        if value is None:
+            return []
+        if column in self.indexes:
+            return [self.rows[key] for key in self.indexes[column].get(value, ())]
+        if self.primary_key == [column]:
+            row = self.rows.get((value,))
+            return [row] if row is not None else []
+        return [row for row in self.rows.values() if row[column] == value]
+
+    def _index(self, row: dict) -> None:
+        key = self.key(row)
+        for column, index in self.indexes.items():
+            if row[column] is not None:
+                index.setdefault(row[column], set()).add(key)
+
+    def _unindex(self, row: dict) -> None:
+        key = self.key(row)
+        for column, index in self.indexes.items():
+            keys = index.get(row[column])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[row[column]]
+
+    def clear(self) -> None:
+        self.rows.clear()
+        for index in self.indexes.values():
+            index.clear()
+
+
+class MemoryDatabase:
+    # in-memory stand-in for the PostgreSQL schema of Solution.create_tables; constraint
+    # violations raise the same DatabaseException types DBConnector.execute raises, checked
+    # in PostgreSQL's order: NOT NULL, CHECK, UNIQUE, FOREIGN KEY
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.tables: Optional[Dict[str, Table]] = None
+
+    def create(self) -> None:
+        with self.lock:
+            if self.tables is not None:
+                raise DatabaseException.UNKNOWN_ERROR("tables already exist")
+            self.tables = {table.name: table for table in MemoryDatabase.__schema()}
+
+    def drop(self) -> None:
+        with self.lock:
+            self.tables = None
+
+    def clear(self) -> None:
+        with self.lock:
+            for table in self.__all_tables():
+                table.clear()
+
+    def table(self, name: str) -> Table:
+        if self.tables is None:
+            raise DatabaseException.UNKNOWN_ERROR(f'relation "{name}" does not exist')
+        return self.tables[name]
+
+    def insert(self, name: str, row: dict) -> None:
+        with self.lock:
+            table = self.table(name)
+            self.__validate(table, row)
+            if table.key(row) in table.rows:
+                raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+            self.__check_references(table, row)
+            table.rows[table.key(row)] = row
+            table._index(row)
+
+    # the rows inserted as one statement, like COPY: all of them, or none when one is rejected;
+    # returns the number of rows inserted
+    def insert_many(self, name: str, rows: Iterable[dict]) -> int:
+        with self.lock:
+            table = self.table(name)
+            inserted = 0
+            try:
+                for row in rows:
+                    self.insert(name, row)
+                    inserted += 1
+            except BaseException:
+                # new keys are appended to the dict, so the inserted rows are the last ones
+                for key in list(islice(reversed(table.rows), inserted)):
+                    table._unindex(table.rows.pop(key))
+                raise
+            return inserted
+
+    # INSERT ... ON CONFLICT (primary key) DO UPDATE SET update_columns: the proposed row is
+    # validated as by insert, an existing row then only takes its update_columns
+    def upsert(self, name: str, row: dict, update_columns: List[str]) -> None:
+        with self.lock:
+            table = self.table(name)
+            self.__validate(table, row)
+            existing = table.rows.get(table.key(row))
+            if existing is None:
+                self.__check_references(table, row)
+                table.rows[table.key(row)] = row
+                table._index(row)
+            else:
+                table._unindex(existing)
+                existing.update({column: row[column] for column in update_columns})
+                table._index(existing)
+
+    # set columns of the row with the given primary key, returns the number of rows updated
+    def update(self, name: str, key: tuple, changes: dict, where: Callable[[dict], bool] = None) -> int:
+        with self.lock:
+            table = self.table(name)
+            row = table.rows.get(key)
+            if row is None or (where is not None and not where(row)):
+                return 0
+            updated = dict(row, **changes)
+            self.__validate(table, updated)
+            table._unindex(row)
+            row.update(changes)
+            table._index(row)
+            return 1
+
+    # delete the row with the given primary key and cascade to the rows referencing it,
+    # returns the number of rows deleted from the table itself
+    def delete(self, name: str, key: tuple) -> int:
+        with self.lock:
+            table = self.table(name)
+            row = table.rows.get(key)
+            if row is None:
+                return 0
+            self.__delete_row(table, row)
+            return 1
+
+    def __delete_row(self, table: Table, row: dict) -> None:
+        table._unindex(row)
+        del table.rows[table.key(row)]
+        for other in self.__all_tables():
+            for column, (referenced, referenced_column) in other.foreign_keys.items():
+                if referenced == table.name:
+                    for dependant in other.lookup(column, row[referenced_column]):
+                        self.__delete_row(other, dependant)
+
+    def __all_tables(self) -> List[Table]:
+        if self.tables is None:
+            raise DatabaseException.UNKNOWN_ERROR("tables do not exist")
+        return list(self.tables.values())
+
+    @staticmethod
+    def __validate(table: Table, row: dict) -> None:
+        for column in table.not_null:
+            if row[column] is None:
+                raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+        for check in table.checks:
+            if not check(row):
+                raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+
+    def __check_references(self, table: Table, row: dict) -> None:
+        for column, (referenced, _) in table.foreign_keys.items():
+            if row[column] is not None and self.table(referenced).get(row[column]) is None:
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+
+    # same tables, NOT NULL / CHECK / FOREIGN KEY rules as Solution.create_tables
+    # (a CHECK on a NULL value passes, as in SQL)
+    @staticmethod
+    def __schema() -> List[Table]:
+        def check(column: str, predicate: Callable) -> Callable[[dict], bool]:
+            return lambda row: row[column] is None or predicate(row[column])
+
+        return [
+            Table("Customers", ["cust_id", "full_name", "age", "phone"], ["cust_id"],
+                  not_null=["full_name", "age", "phone"],
+                  checks=[check("cust_id", lambda v: v > 0),
+                          check("age", lambda v: 18 <= v <= 120),
+                          check("phone", lambda v: len(v) == 10)]),
+            Table("Orders", ["order_id", "date", "delivery_fee", "delivery_address"], ["order_id"],
+                  not_null=["date", "delivery_fee", "delivery_address"],
+                  checks=[check("order_id", lambda v: v > 0),
+                          check("delivery_fee", lambda v: v >= 0),
+                          check("delivery_address", lambda v: len(v) >= 5)]),
+            Table("Dishes", ["dish_id", "name", "price", "is_active"], ["dish_id"],
+                  not_null=["name", "price", "is_active"],
+                  checks=[check("dish_id", lambda v: v > 0),
+                          check("name", lambda v: len(v) >= 4),
+                          check("price", lambda v: v > 0)]),
+            Table("CustomerOrders", ["order_id", "cust_id"], ["order_id"],
+                  foreign_keys={"cust_id": ("Customers", "cust_id"), "order_id": ("Orders", "order_id")}),
+            Table("DishOrders", ["order_id", "dish_id", "amount", "price"], ["order_id", "dish_id"],
+                  not_null=["amount", "price"],
+                  checks=[check("amount", lambda v: v >= 0)],
+                  foreign_keys={"order_id": ("Orders", "order_id"), "dish_id": ("Dishes", "dish_id")}),
+            Table("Ratings", ["cust_id", "dish_id", "rating"], ["cust_id", "dish_id"],
+                  not_null=["rating"],
+                  checks=[check("rating", lambda v: 1 <= v <= 5)],
+                  foreign_keys={"cust_id": ("Customers", "cust_id"), "dish_id": ("Dishes", "dish_id")}),
+        ]
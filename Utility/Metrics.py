@@ -0,0 +1,275 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+import Utility.Instrumentation as Instrumentation
+import Utility.QueryStats as QueryStats
+from Utility.ReturnValue import ReturnValue
+
+# Prometheus text-format metrics of a running process: calls, errors (exceptions and
+# ReturnValue.ERROR) and latency histograms of the Solution.py functions, DBConnector pool usage
+# and waits, statement and slow-statement counts from QueryStats, and hit ratios of the
+# registered caches (PostgreSQL's buffer cache included). enable() starts collecting, then either
+#     Metrics.serve(9236)              serves http://127.0.0.1:9236/metrics from a daemon thread
+#     Metrics.dump("cs236363.prom")    writes the current values to a file (e.g. for a textfile collector)
+
+PREFIX = "cs236363_"
+
+# histogram bounds (seconds) of the function latencies, the same as QueryStats' statement buckets
+BUCKETS = [bound / 1000 for bound in QueryStats.BUCKETS_MS]
+
+
+class _FunctionStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+
+class FunctionMetrics(Instrumentation.FunctionListener):
+    # per Solution.py function: calls, errors and latency histogram
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.functions: Dict[str, _FunctionStats] = {}
+
+    def function_finished(self, name: str, token: object, seconds: float, result: object,
+                          error: Optional[BaseException]) -> None:
+        failed = error is not None or result is ReturnValue.ERROR
+        with self.lock:
+            stats = self.functions.get(name)
+            if stats is None:
+                stats = self.functions[name] = _FunctionStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.total += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[i] += 1
+                    break
+            else:
+                stats.buckets[-1] += 1
+
+    def reset(self) -> None:
+        with self.lock:
+            self.functions.clear()
+
+
+_functions = FunctionMetrics()
+# name -> () -> (hits, misses)
+_caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def enable() -> None:
+    import Utility.DBConnector as Connector
+    Instrumentation.add_listener(_functions)
+    if Connector.get_backend() == "postgresql":
+        register_cache("postgresql_buffers", postgresql_buffer_cache)
+
+
+def disable() -> None:
+    Instrumentation.remove_listener(_functions)
+    unregister_cache("postgresql_buffers")
+
+
+def reset() -> None:
+    _functions.reset()
+
+
+# report a cache's hit ratio; stats returns its (hits, misses) so far
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]) -> None:
+    _caches[name] = stats
+
+
+def unregister_cache(name: str) -> None:
+    _caches.pop(name, None)
+
+
+# (hits, reads) of PostgreSQL's shared buffers for the tables and indexes of the current database,
+# queried on a connection of its own so the scrape does not show up in QueryStats
+def postgresql_buffer_cache() -> Tuple[int, int]:
+    import psycopg2
+    from Utility.DBConnector import DBConnector
+    connection = psycopg2.connect(**DBConnector.connection_params())
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COALESCE(SUM(heap_blks_hit + COALESCE(idx_blks_hit, 0)), 0),
+                       COALESCE(SUM(heap_blks_read + COALESCE(idx_blks_read, 0)), 0)
+                FROM pg_statio_user_tables
+            """)
+            hits, reads = cursor.fetchone()
+            return int(hits), int(reads)
+    finally:
+        connection.close()
+
+
+# per table of the current database: live rows, table / index sizes (bytes) and scan counts from
+# pg_stat_user_tables, largest first, on a connection of its own like postgresql_buffer_cache
+def postgresql_table_sizes() -> List[dict]:
+    import psycopg2
+    from Utility.DBConnector import DBConnector
+    connection = psycopg2.connect(**DBConnector.connection_params())
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT relname, n_live_tup, n_dead_tup, pg_table_size(relid), pg_indexes_size(relid),
+                       seq_scan, COALESCE(idx_scan, 0)
+                FROM pg_stat_user_tables
+                WHERE schemaname = current_schema()
+                ORDER BY pg_total_relation_size(relid) DESC, relname
+            """)
+            return [{"table": name, "live_rows": live, "dead_rows": dead, "table_bytes": table_bytes,
+                     "index_bytes": index_bytes, "seq_scans": seq_scans, "index_scans": index_scans}
+                    for name, live, dead, table_bytes, index_bytes, seq_scans, index_scans in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+# name -> (calls, errors, total seconds, counts per BUCKETS bound and +Inf) of the Solution.py functions
+def functions() -> Dict[str, Tuple[int, int, float, List[int]]]:
+    with _functions.lock:
+        return {name: (stats.calls, stats.errors, stats.total, list(stats.buckets))
+                for name, stats in sorted(_functions.functions.items())}
+
+
+# name -> (hits, misses) of every registered cache that could be read
+def caches() -> Dict[str, Tuple[int, int]]:
+    counts = {}
+    for name, stats in sorted(_caches.items()):
+        try:
+            counts[name] = stats()
+        except Exception:
+            continue
+    return counts
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        self.lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    def sample(self, name: str, value: float, **labels) -> None:
+        rendered = ",".join(f'{key}="{_label(str(label))}"' for key, label in labels.items())
+        self.lines.append(f"{PREFIX}{name}{{{rendered}}} {value!r}" if rendered else f"{PREFIX}{name} {value!r}")
+
+
+def _render_functions(out: _Writer) -> None:
+    snapshot = functions()
+    out.family("function_calls_total", "counter", "Calls of each Solution.py function.")
+    for name, (calls, _, _, _) in snapshot.items():
+        out.sample("function_calls_total", calls, function=name)
+    out.family("function_errors_total", "counter", "Calls that raised or returned ReturnValue.ERROR.")
+    for name, (_, errors, _, _) in snapshot.items():
+        out.sample("function_errors_total", errors, function=name)
+    out.family("function_duration_seconds", "histogram", "Latency of each Solution.py function.")
+    for name, (calls, _, total, buckets) in snapshot.items():
+        cumulative = 0
+        for bound, count in zip(BUCKETS, buckets):
+            cumulative += count
+            out.sample("function_duration_seconds_bucket", cumulative, function=name, le=repr(bound))
+        out.sample("function_duration_seconds_bucket", calls, function=name, le="+Inf")
+        out.sample("function_duration_seconds_sum", total, function=name)
+        out.sample("function_duration_seconds_count", calls, function=name)
+
+
+def _render_pool(out: _Writer) -> None:
+    import Utility.DBConnector as Connector
+    pool = Connector.get_pool()
+    if pool is None:
+        return
+    stats = pool.stats()
+    out.family("pool_connections", "gauge", "Open DBConnector pool connections by state.")
+    out.sample("pool_connections", stats.in_use, state="in_use")
+    out.sample("pool_connections", stats.size - stats.in_use, state="idle")
+    out.family("pool_max_connections", "gauge", "Size limit of the DBConnector pool.")
+    out.sample("pool_max_connections", stats.max_size)
+    out.family("pool_utilization", "gauge", "Share of the pool's connections in use.")
+    out.sample("pool_utilization", stats.utilization())
+    out.family("pool_acquired_total", "counter", "Connections borrowed from the pool.")
+    out.sample("pool_acquired_total", stats.acquired)
+    out.family("pool_waits_total", "counter", "Borrows that had to wait for a free connection.")
+    out.sample("pool_waits_total", stats.waited)
+    out.family("pool_wait_seconds_total", "counter", "Time spent waiting for pool connections.")
+    out.sample("pool_wait_seconds_total", stats.total_wait)
+    out.family("pool_wait_seconds_max", "gauge", "Longest wait for a pool connection.")
+    out.sample("pool_wait_seconds_max", stats.max_wait)
+
+
+def _render_statements(out: _Writer) -> None:
+    statements, errors = {}, 0
+    for stats in QueryStats.shapes():
+        errors += stats.errors
+        for caller, count in stats.callers.items():
+            statements[caller] = statements.get(caller, 0) + count
+    out.family("statements_total", "counter", "Statements executed, by calling function.")
+    for caller, count in sorted(statements.items()):
+        out.sample("statements_total", count, function=caller)
+    out.family("statement_errors_total", "counter", "Statements that failed.")
+    out.sample("statement_errors_total", errors)
+    out.family("slow_statements_total", "counter", "Statements over the slow-query threshold.")
+    out.sample("slow_statements_total", QueryStats.slow_count())
+
+
+def _render_caches(out: _Writer) -> None:
+    counts = caches()
+    if not counts:
+        return
+    out.family("cache_hits_total", "counter", "Cache hits.")
+    for name, (hits, _) in counts.items():
+        out.sample("cache_hits_total", hits, cache=name)
+    out.family("cache_misses_total", "counter", "Cache misses.")
+    for name, (_, misses) in counts.items():
+        out.sample("cache_misses_total", misses, cache=name)
+    out.family("cache_hit_ratio", "gauge", "Hits over lookups.")
+    for name, (hits, misses) in counts.items():
+        out.sample("cache_hit_ratio", hits / (hits + misses) if hits + misses else 0.0, cache=name)
+
+
+# every metric in the Prometheus text exposition format
+def render() -> str:
+    out = _Writer()
+    _render_functions(out)
+    _render_pool(out)
+    _render_statements(out)
+    _render_caches(out)
+    return "\n".join(out.lines) + "\n"
+
+
+# write render() to path, replacing the file in one step so readers never see half of it
+def dump(path: str) -> None:
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        file.write(render())
+    os.replace(temporary, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+# serve /metrics on a daemon thread (port 0 picks a free port, see server.server_address);
+# stop it with server.shutdown()
+def serve(port: int = 9236, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
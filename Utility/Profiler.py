@@ -0,0 +1,300 @@
+import atexit
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import Utility.Instrumentation as Instrumentation
+import Utility.QueryStats as QueryStats
+
+# cProfile of selected Solution.py functions, aggregated over every call, with their time split
+# into the database's and the Python layer's (query composition, ResultSet construction, business
+# objects, the rest), to see what the Python side adds per call:
+#     DB_PROFILE=get_customer,get_all_order_items python Example.py     (DB_PROFILE=all: every function)
+#     Profiler.enable(["get_customer"]); ...; print(Profiler.report()); Profiler.dump("profiles")
+#     @Profiler.profile                                                  any other function
+# dump writes <function>.pstats (for pstats, snakeviz, gprof2dot) and <function>.collapsed (folded
+# stacks for flamegraph.pl, speedscope or inferno, rebuilt from the caller graph) per function;
+# DB_PROFILE_DIR sets where DB_PROFILE dumps them at exit (default: profiles). The split comes from
+# the self time of each function, so database time is the time spent in the driver's cursor and
+# connection methods, and a nested profiled call is counted in the outermost one only. cProfile
+# itself slows the Python side down, compare the shares rather than the absolute times.
+
+# category of a profile entry, by its (file, line, function name); the first match wins
+DATABASE = "database"
+COMPOSITION = "sql_composition"
+RESULT_SETS = "result_sets"
+BUSINESS = "business_objects"
+PYTHON = "python"
+CATEGORIES = [DATABASE, COMPOSITION, RESULT_SETS, BUSINESS, PYTHON]
+
+# the drivers' C methods (connect, execute, fetch, commit), whose self time is the database's
+_DRIVER_OBJECTS = ("psycopg2.", "sqlite3.")
+
+
+class FunctionProfile:
+    # everything recorded for one function: its merged profile, calls and wall / statement time
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.statements = 0
+        self.statement_seconds = 0.0
+        self.stats: Optional[pstats.Stats] = None
+
+    def add(self, profile: cProfile.Profile, seconds: float, statements: int, statement_seconds: float) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.statements += statements
+        self.statement_seconds += statement_seconds
+        if self.stats is None:
+            self.stats = pstats.Stats(profile)
+        else:
+            self.stats.add(profile)
+
+    # seconds of self time per category
+    def breakdown(self) -> Dict[str, float]:
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        if self.stats is not None:
+            for function, (_, _, self_time, _, _) in self.stats.stats.items():
+                if not _own(function):
+                    totals[category(function)] += self_time
+        return totals
+
+    def to_dict(self) -> dict:
+        breakdown = self.breakdown()
+        profiled = sum(breakdown.values())
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "mean_ms": self.seconds / self.calls * 1000 if self.calls else 0.0,
+            "statements": self.statements,
+            "statement_seconds": self.statement_seconds,
+            "breakdown_seconds": breakdown,
+            "python_share": (profiled - breakdown[DATABASE]) / profiled if profiled else 0.0,
+        }
+
+
+_result_set_lines: List[Tuple[str, int, int]] = []
+
+
+def _result_set_ranges() -> List[Tuple[str, int, int]]:
+    # (file, first line, last line) of the ResultSet classes of the connectors
+    if not _result_set_lines:
+        import Utility.DBConnector as Connector
+        for cls in (Connector.ResultSet, Connector.ResultSetDict):
+            lines, first = inspect.getsourcelines(cls)
+            _result_set_lines.append((os.path.normcase(inspect.getsourcefile(cls)), first, first + len(lines) - 1))
+    return _result_set_lines
+
+
+# the profiler's and the instrumentation's own frames, recorded around the profiled call
+def _own(function: Tuple[str, int, str]) -> bool:
+    return os.path.basename(function[0]) in ("Profiler.py", "Instrumentation.py")
+
+
+def category(function: Tuple[str, int, str]) -> str:
+    file, line, name = function
+    if file == "~":
+        return DATABASE if any(driver in name for driver in _DRIVER_OBJECTS) else PYTHON
+    normalized = os.path.normcase(file)
+    if normalized.endswith(os.path.normcase(os.path.join("psycopg2", "sql.py"))):
+        return COMPOSITION
+    if any(normalized == path and first <= line <= last for path, first, last in _result_set_ranges()):
+        return RESULT_SETS
+    if os.path.basename(os.path.dirname(normalized)) == os.path.normcase("Business"):
+        return BUSINESS
+    return PYTHON
+
+
+_lock = threading.Lock()
+_profiles: Dict[str, FunctionProfile] = {}
+# per thread: the profiler of the outermost profiled call and the statements it saw
+_active = threading.local()
+_listening = [False]
+
+
+def _start() -> Optional[list]:
+    if getattr(_active, "call", None) is not None:
+        return None
+    if not _listening[0]:
+        QueryStats.add_listener(_statement_finished)
+        _listening[0] = True
+    profile = cProfile.Profile()
+    # [profile, statements, statement seconds]
+    _active.call = [profile, 0, 0.0]
+    profile.enable()
+    return _active.call
+
+
+def _stop(name: str, call: Optional[list], seconds: float) -> None:
+    if call is None:
+        return
+    profile, statements, statement_seconds = call
+    profile.disable()
+    _active.call = None
+    with _lock:
+        recorded = _profiles.get(name)
+        if recorded is None:
+            recorded = _profiles[name] = FunctionProfile(name)
+        recorded.add(profile, seconds, statements, statement_seconds)
+
+
+def _statement_finished(shape: str, seconds: float, rows: int, error: Optional[str], pool_wait: float) -> None:
+    call = getattr(_active, "call", None)
+    if call is not None:
+        call[1] += 1
+        call[2] += seconds
+
+
+# profiles every call of function, under its qualified name; nested in another profiled call it
+# is counted in the outer one only
+def profile(function):
+    name = f"{function.__module__}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        call = _start()
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _stop(name, call, time.perf_counter() - start)
+
+    return wrapper
+
+
+class FunctionProfiler(Instrumentation.FunctionListener):
+    # profiles the selected Solution.py functions (all of them when functions is None)
+    def __init__(self, functions: Optional[List[str]] = None) -> None:
+        self.functions = None if functions is None else {
+            function if function.startswith("Solution.") else "Solution." + function for function in functions}
+
+    def function_started(self, name: str) -> object:
+        if self.functions is not None and name not in self.functions:
+            return None
+        return _start()
+
+    def function_finished(self, name: str, token: object, seconds: float, result: object,
+                          error: Optional[BaseException]) -> None:
+        _stop(name, token, seconds)
+
+
+_profiler: List[Optional[FunctionProfiler]] = [None]
+_dump_directory: List[Optional[str]] = [None]
+
+
+# profiles the given Solution.py functions (by name, all of them if None); with dump_directory
+# the profiles are also dumped there when the process exits
+def enable(functions: Optional[List[str]] = None, dump_directory: str = None) -> None:
+    disable()
+    _profiler[0] = FunctionProfiler(functions)
+    Instrumentation.add_listener(_profiler[0])
+    if dump_directory:
+        if _dump_directory[0] is None:
+            atexit.register(_dump_at_exit)
+        _dump_directory[0] = dump_directory
+
+
+def disable() -> None:
+    if _profiler[0] is not None:
+        Instrumentation.remove_listener(_profiler[0])
+        _profiler[0] = None
+    QueryStats.remove_listener(_statement_finished)
+    _listening[0] = False
+    _dump_directory[0] = None
+
+
+# DB_PROFILE: comma separated function names, or "all"
+def enable_from_environment() -> bool:
+    selected = os.environ.get("DB_PROFILE", "").strip()
+    if not selected:
+        return False
+    functions = None if selected == "all" else [name.strip() for name in selected.split(",") if name.strip()]
+    enable(functions, os.environ.get("DB_PROFILE_DIR", "profiles"))
+    return True
+
+
+def _dump_at_exit() -> None:
+    if _dump_directory[0]:
+        dump(_dump_directory[0])
+
+
+def profiles() -> Dict[str, FunctionProfile]:
+    with _lock:
+        return dict(_profiles)
+
+
+def reset() -> None:
+    with _lock:
+        _profiles.clear()
+
+
+def _frame(function: Tuple[str, int, str]) -> str:
+    file, line, name = function
+    label = name if file == "~" else f"{os.path.basename(file)}:{line}({name})"
+    return label.replace(";", ",")
+
+
+# folded stacks ("outer;inner;leaf microseconds"), the self time of every function shared out
+# along the call paths in proportion to the time each caller spent in it
+def collapsed(stats: pstats.Stats, max_depth: int = 64) -> List[str]:
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative
+    folded: Dict[str, float] = {}
+
+    def walk(function: tuple, path: List[tuple], share: float) -> None:
+        _, _, self_time, cumulative, _ = stats.stats[function]
+        path = path + [function]
+        if self_time * share > 0:
+            stack = ";".join(_frame(frame) for frame in path)
+            folded[stack] = folded.get(stack, 0.0) + self_time * share
+        if len(path) >= max_depth:
+            return
+        for callee, edge in callees.get(function, {}).items():
+            callee_cumulative = stats.stats[callee][3]
+            if callee in path or callee_cumulative <= 0:
+                continue
+            walk(callee, path, share * min(1.0, edge / callee_cumulative))
+
+    # the profiled calls; the builtins without callers were called by the profiler itself
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if function[0] != "~" and not _own(function) and not any(
+                caller in stats.stats and not _own(caller) for caller in callers):
+            walk(function, [], 1.0)
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(folded.items())
+            if round(seconds * 1e6) > 0]
+
+
+# writes <function>.pstats and <function>.collapsed per profiled function into directory;
+# returns the files written
+def dump(directory: str) -> List[str]:
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for name, recorded in sorted(profiles().items()):
+        if recorded.stats is None:
+            continue
+        path = os.path.join(directory, name)
+        recorded.stats.dump_stats(path + ".pstats")
+        with open(path + ".collapsed", "w") as file:
+            file.writelines(line + "\n" for line in collapsed(recorded.stats))
+        written += [path + ".pstats", path + ".collapsed"]
+    return written
+
+
+def report() -> str:
+    lines = [f'{"function":48}{"calls":>7}{"mean ms":>10}{"database":>10}{"sql":>8}{"results":>9}'
+             f'{"business":>10}{"python":>8}']
+    for name, recorded in sorted(profiles().items()):
+        summary = recorded.to_dict()
+        breakdown = summary["breakdown_seconds"]
+        profiled = sum(breakdown.values()) or 1.0
+        shares = "".join(f"{breakdown[key] / profiled:>{width}.0%}" for key, width in
+                         ((DATABASE, 10), (COMPOSITION, 8), (RESULT_SETS, 9), (BUSINESS, 10), (PYTHON, 8)))
+        lines.append(f'{name:48}{summary["calls"]:>7}{summary["mean_ms"]:>10.3f}{shares}')
+    return "\n".join(lines)
@@ -0,0 +1,375 @@
+import json
+import os
+import re
+import sys
+import threading
+from bisect import bisect_left
+from collections import deque
+from itertools import count
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from psycopg2 import sql
+
+# Timing of every statement the connectors execute, grouped by query shape (the statement with
+# its literals replaced by $1, $2, ... like pg_stat_statements, a multi-row VALUES list collapsed
+# to its first row, so batches of any size share a shape), plus a slow-query log of the
+# statements that took longer than a threshold, with their parameters and the Solution.py
+# function that ran them. Configured under [query_log] in database.ini, overridden by the
+# DB_SLOW_QUERY_MS / DB_SLOW_QUERY_LOG environment variables or by configure():
+#     slow_ms = 100         statements at least this slow are logged
+#     file = slow.jsonl     also append each logged statement to this file, one JSON object per line
+#     enabled = true        false turns the recording off
+#     explain = false       true also captures EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of slow statements
+#     explain_analyze = true  false captures the planner's estimates only (EXPLAIN (FORMAT JSON)), which
+#                           does not run the statement again
+# The plans (PostgreSQL only) are kept with the slow-log entry and the shape, plan_report()
+# summarizes the sequential scans and row-estimate misses per view of Solution.create_tables.
+# Capturing with ANALYZE runs the statement a second time, inside a savepoint that is rolled
+# back. Writes (INSERT, UPDATE, DELETE) only ever get the estimates: run again, an INSERT would
+# hit the row it just added, and an UPDATE or DELETE would lock its rows again and act on none.
+
+# upper bounds (ms) of the histogram buckets, the last bucket takes everything slower
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# how many slow statements are kept in memory
+SLOW_LOG_SIZE = 1000
+
+# how many query shapes are tracked; when a new one would exceed it, the least called 5% go
+MAX_SHAPES = 5000
+
+# the views of Solution.create_tables, plan_report() groups the plans by the view they read
+VIEWS = ["totalPricePerOrder", "sortRatingsDesc", "comparedPrices", "similarCustomers", "monthlyOrders",
+         "monthlyProfit"]
+
+# statements EXPLAIN accepts (the rest, e.g. DDL, are never explained)
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES")
+
+# a statement holding one of these is explained without ANALYZE, see above
+_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+# a plan node whose estimated and actual row counts differ by this factor, and one of them is
+# at least MISS_MIN_ROWS, is a misestimate
+MISS_FACTOR = 10
+MISS_MIN_ROWS = 100
+
+
+class ShapeStats:
+    # running totals and latency histogram of one query shape
+    def __init__(self, shape: str) -> None:
+        self.shape = shape
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.callers: Dict[str, int] = {}
+        # the latest captured EXPLAIN output, when explain is on
+        self.plan: Optional[dict] = None
+
+    def add(self, seconds: float, rows: int, caller: str, error: Optional[str]) -> None:
+        self.calls += 1
+        self.errors += error is not None
+        self.rows += rows
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.callers[caller] = self.callers.get(caller, 0) + 1
+
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    # upper bound (ms) of the bucket holding the given fraction of the calls, inf past the last bound
+    def percentile_ms(self, fraction: float) -> float:
+        seen = 0
+        for bound, count in zip(BUCKETS_MS + [float("inf")], self.buckets):
+            seen += count
+            if seen >= fraction * self.calls:
+                return bound
+        return float("inf")
+
+    # (upper bound in ms, calls) per bucket
+    def histogram(self) -> List[Tuple[float, int]]:
+        return list(zip(BUCKETS_MS + [float("inf")], self.buckets))
+
+    def __str__(self) -> str:
+        return (f'calls={self.calls}, errors={self.errors}, rows={self.rows}, total={self.total:.6f}s, '
+                f'mean={self.mean():.6f}s, max={self.max:.6f}s, p99<={self.percentile_ms(0.99)}ms: {self.shape}')
+
+
+class SlowQuery:
+    # one entry of the slow-query log
+    def __init__(self, at: datetime, seconds: float, rows: int, caller: str, shape: str, parameters: list,
+                 error: Optional[str], plan: Optional[dict] = None) -> None:
+        self.at = at
+        self.seconds = seconds
+        self.rows = rows
+        self.caller = caller
+        self.shape = shape
+        self.parameters = parameters
+        self.error = error
+        self.plan = plan
+
+    def to_dict(self) -> dict:
+        return {"at": self.at.isoformat(), "ms": self.seconds * 1000, "rows": self.rows, "caller": self.caller,
+                "shape": self.shape, "parameters": self.parameters, "error": self.error, "plan": self.plan}
+
+    def __str__(self) -> str:
+        return f'{self.seconds * 1000:.3f}ms {self.caller} rows={self.rows} {self.shape} {self.parameters!r}'
+
+
+_lock = threading.Lock()
+# held while appending to the slow-log file, so writers do not hold _lock during the I/O
+_file_lock = threading.Lock()
+_shapes: Dict[str, ShapeStats] = {}
+_slow = deque(maxlen=SLOW_LOG_SIZE)
+# statements logged as slow since the last reset, including those dropped from _slow
+_slow_total = 0
+# called with (shape, seconds, rows, error, pool_wait) after every statement, see add_listener
+_listeners: List[Callable[[str, float, int, Optional[str], float], None]] = []
+# read from database.ini on first use
+_settings: Optional[dict] = None
+
+
+def _flag(value: str) -> bool:
+    return value.strip().lower() in ("true", "yes", "on", "1")
+
+
+def _load_settings() -> dict:
+    global _settings
+    if _settings is None:
+        # imported here, DBConnector imports this module
+        from Utility.DBConnector import read_config_section
+        section = read_config_section("query_log")
+        _settings = {
+            "enabled": _flag(section.get("enabled", "true")),
+            "slow": float(os.environ.get("DB_SLOW_QUERY_MS") or section.get("slow_ms") or 100) / 1000,
+            "file": os.environ.get("DB_SLOW_QUERY_LOG") or section.get("file") or None,
+            "explain": _flag(os.environ.get("DB_EXPLAIN_SLOW") or section.get("explain", "false")),
+            "analyze": _flag(section.get("explain_analyze", "true")),
+        }
+    return _settings
+
+
+# change the settings of database.ini at runtime; arguments left as None keep their value
+def configure(slow_ms: float = None, log_path: str = None, enabled: bool = None, explain: bool = None,
+              explain_analyze: bool = None) -> None:
+    settings = _load_settings()
+    if enabled is not None:
+        settings["enabled"] = enabled
+    if slow_ms is not None:
+        settings["slow"] = slow_ms / 1000
+    if log_path is not None:
+        settings["file"] = log_path or None
+    if explain is not None:
+        settings["explain"] = explain
+    if explain_analyze is not None:
+        settings["analyze"] = explain_analyze
+
+
+def enabled() -> bool:
+    return _load_settings()["enabled"]
+
+
+def slow_threshold() -> float:
+    return _load_settings()["slow"]
+
+
+def explain_enabled() -> bool:
+    return _load_settings()["explain"]
+
+
+def _render(query: sql.Composable, parameters: list) -> str:
+    if isinstance(query, sql.Composed):
+        return "".join(_render(part, parameters) for part in query.seq)
+    if isinstance(query, sql.SQL):
+        return query.string
+    if isinstance(query, sql.Literal):
+        parameters.append(query.wrapped)
+        return "$" + str(len(parameters))
+    if isinstance(query, sql.Identifier):
+        return ".".join('"' + s + '"' for s in query.strings)
+    return str(query)
+
+
+_PLACEHOLDER = re.compile(r"\$\d+")
+# a parenthesized group (holding at most one level of parentheses) repeated right after itself
+_REPEATED_GROUP = re.compile(r"(\((?:[^()]|\([^()]*\))*\))(?:, \1)+")
+
+
+# statement -> (shape, parameters): the literals of a psycopg2.sql statement become $1, $2, ...,
+# runs of whitespace a single space and a group repeated after itself, like the rows of a VALUES
+# list, "(first row), ..."; parameters keeps every literal
+def query_shape(query: Union[str, sql.Composable]) -> Tuple[str, list]:
+    parameters = []
+    text = query if isinstance(query, str) else _render(query, parameters)
+    shape = " ".join(text.split())
+    if len(parameters) > 1:
+        shape = _REPEATED_GROUP.sub(r"\1, ...", _PLACEHOLDER.sub("$", shape))
+        numbers = count(1)
+        shape = re.sub(r"\$(?!\d)", lambda _: "$" + str(next(numbers)), shape)
+    return shape, parameters
+
+
+# drops the least called twentieth of the shapes, _lock held
+def _evict_shapes() -> None:
+    for stats in sorted(_shapes.values(), key=lambda stats: stats.calls)[:max(1, MAX_SHAPES // 20)]:
+        del _shapes[stats.shape]
+
+
+def _private(name: str) -> bool:
+    return name.startswith("_") and not name.startswith("__")
+
+
+# "Solution.get_customer": the innermost function outside the Utility package on the stack,
+# private helpers (Solution._iterate) counted in the function that called them
+def caller() -> str:
+    frame = sys._getframe(1)
+    while frame is not None and (frame.f_globals.get("__name__", "").startswith("Utility.")
+                                 or _private(frame.f_code.co_name)):
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    return frame.f_globals.get("__name__", "?") + "." + frame.f_code.co_name
+
+
+# also report every statement to listener (e.g. Utility/Tracing.py), whether or not recording is on
+def add_listener(listener: Callable[[str, float, int, Optional[str], float], None]) -> None:
+    global _listeners
+    with _lock:
+        if listener not in _listeners:
+            _listeners = _listeners + [listener]
+
+
+def remove_listener(listener: Callable[[str, float, int, Optional[str], float], None]) -> None:
+    global _listeners
+    with _lock:
+        _listeners = [registered for registered in _listeners if registered != listener]
+
+
+# called by the connectors after every statement (error: the exception's class name if it failed,
+# pool_wait: how long the connector waited for its pooled connection);
+# explain(query, analyze), when the connector can provide it, returns the EXPLAIN output of a statement
+def record(query: Union[str, sql.Composable], seconds: float, rows: int, error: str = None,
+           explain: Callable[[Union[str, sql.Composable], bool], dict] = None, pool_wait: float = 0.0) -> None:
+    global _slow_total
+    settings = _load_settings()
+    listeners = _listeners
+    if not settings["enabled"] and not listeners:
+        return
+    shape, parameters = query_shape(query)
+    for listener in listeners:
+        listener(shape, seconds, rows, error, pool_wait)
+    if not settings["enabled"]:
+        return
+    function = caller()
+    slow = seconds >= settings["slow"]
+    plan = None
+    if slow and settings["explain"] and explain is not None and error is None \
+            and shape.split(" ", 1)[0].upper() in EXPLAINABLE:
+        try:
+            plan = explain(query, settings["analyze"] and not _WRITE.search(shape))
+        except Exception:
+            plan = None
+    with _lock:
+        stats = _shapes.get(shape)
+        if stats is None:
+            if len(_shapes) >= MAX_SHAPES:
+                _evict_shapes()
+            stats = _shapes[shape] = ShapeStats(shape)
+        stats.add(seconds, rows, function, error)
+        if plan is not None:
+            stats.plan = plan
+    if slow:
+        entry = SlowQuery(datetime.now(), seconds, rows, function, shape, parameters, error, plan)
+        with _lock:
+            _slow.append(entry)
+            _slow_total += 1
+        if settings["file"]:
+            line = json.dumps(entry.to_dict(), default=str) + "\n"
+            with _file_lock, open(settings["file"], "a") as file:
+                file.write(line)
+
+
+# per-shape statistics, the largest total time first
+def shapes() -> List[ShapeStats]:
+    with _lock:
+        return sorted(_shapes.values(), key=lambda stats: stats.total, reverse=True)
+
+
+# the slow-query log kept in memory, oldest first
+def slow_queries() -> List[SlowQuery]:
+    with _lock:
+        return list(_slow)
+
+
+# how many statements were logged as slow since the last reset
+def slow_count() -> int:
+    return _slow_total
+
+
+def reset() -> None:
+    global _slow_total
+    with _lock:
+        _shapes.clear()
+        _slow.clear()
+        _slow_total = 0
+
+
+# the query shapes taking the most time, then the slowest logged statements
+def report(limit: int = 10) -> str:
+    lines = [f"top {limit} query shapes by total time:"]
+    lines += ["  " + str(stats) for stats in shapes()[:limit]]
+    slow = sorted(slow_queries(), key=lambda entry: entry.seconds, reverse=True)[:limit]
+    lines.append(f"slowest statements over {slow_threshold() * 1000:g}ms:")
+    lines += ["  " + str(entry) for entry in slow]
+    return "\n".join(lines)
+
+
+# every node of an EXPLAIN plan tree (the "Plan" object), depth first
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+# per view (and "other" for the statements reading none): how many captured plans read it, the
+# relations they scan sequentially (relation -> count) and the nodes whose row estimate missed
+# the actual count by miss_factor or more, as (shape, node type, relation, estimated, actual)
+def plan_summary(views: List[str] = None, miss_factor: float = MISS_FACTOR) -> Dict[str, dict]:
+    views = VIEWS if views is None else views
+    summary = {}
+    for stats in shapes():
+        if stats.plan is None:
+            continue
+        lowered = stats.shape.lower()
+        groups = [view for view in views if view.lower() in lowered] or ["other"]
+        seq_scans, misses = {}, []
+        for node in plan_nodes(stats.plan["Plan"]):
+            relation = node.get("Relation Name")
+            if node["Node Type"] == "Seq Scan":
+                seq_scans[relation] = seq_scans.get(relation, 0) + 1
+            estimated, actual = node.get("Plan Rows", 0), node.get("Actual Rows", 0)
+            if max(estimated, actual) >= max(MISS_MIN_ROWS, miss_factor * max(1, min(estimated, actual))):
+                misses.append((stats.shape, node["Node Type"], relation, estimated, actual))
+        for group in groups:
+            entry = summary.setdefault(group, {"plans": 0, "seq_scans": {}, "misses": []})
+            entry["plans"] += 1
+            for relation, count in seq_scans.items():
+                entry["seq_scans"][relation] = entry["seq_scans"].get(relation, 0) + count
+            entry["misses"] += misses
+    return summary
+
+
+# plan_summary as text
+def plan_report(views: List[str] = None, miss_factor: float = MISS_FACTOR) -> str:
+    lines = []
+    for group, entry in plan_summary(views, miss_factor).items():
+        scans = ", ".join(f"{relation} x{count}" for relation, count in sorted(entry["seq_scans"].items()))
+        lines.append(f'{group}: {entry["plans"]} plans, seq scans: {scans or "none"}')
+        for shape, node_type, relation, estimated, actual in entry["misses"]:
+            lines.append(f'  row estimate miss: {node_type}{" on " + relation if relation else ""} '
+                         f'estimated {estimated}, actual {actual}: {shape[:80]}')
+    return "\n".join(lines) or "no plans captured (turn explain on and lower slow_ms)"
@@ -0,0 +1,163 @@
+import atexit
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+from Utility.ReturnValue import ReturnValue
+
+# Write-behind queue for bursts of ratings: submit() returns at once, and a background thread
+# writes what was submitted with Solution.upsert_ratings, one statement and one commit per batch,
+# once max_batch distinct ratings are waiting or the oldest has waited max_delay seconds.
+#     with RatingBuffer(max_batch=500, max_delay=0.05) as ratings:
+#         future = ratings.submit(cust_id, dish_id, 4, callback=lambda result: ...)
+#     future.result()                                  ReturnValue.OK, BAD_PARAMS, NOT_EXISTS, ERROR
+# A rating submitted again for the same (cust_id, dish_id) before its batch was written replaces
+# the waiting one (the last rating wins, as with upsert_rating), and both events get the outcome
+# of that one write. When a batch fails as a whole its ratings are written one by one with
+# upsert_rating, so each event gets its own outcome and a bad rating does not drop the others.
+# Callbacks run on the writing thread. close() (or leaving the with block) writes everything
+# still waiting; buffers left open are closed when the process exits.
+
+
+class _Waiting:
+    # the latest rating for one (cust_id, dish_id), the events it stands for and when the first
+    # of them was submitted
+    __slots__ = ("rating", "futures", "since")
+
+    def __init__(self, rating: int) -> None:
+        self.rating = rating
+        self.futures: List[Future] = []
+        self.since = time.perf_counter()
+
+
+_open: "weakref.WeakSet[RatingBuffer]" = weakref.WeakSet()
+
+
+def _close_open_buffers() -> None:
+    for buffer in list(_open):
+        buffer.close()
+
+
+atexit.register(_close_open_buffers)
+
+
+class RatingBuffer:
+    def __init__(self, max_batch: int = 500, max_delay: float = 0.05) -> None:
+        if max_batch < 1 or max_delay < 0:
+            raise ValueError("max_batch must be at least 1 and max_delay not negative")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # in order of first submission, so the first one is the oldest
+        self.__waiting: Dict[Tuple[int, int], _Waiting] = {}
+        self.__closed = False
+        self.__condition = threading.Condition()
+        # held while a batch is taken and written, so batches reach the database in order
+        self.__writing = threading.Lock()
+        self.__counts = {"submitted": 0, "coalesced": 0, "written": 0, "batches": 0, "fallbacks": 0}
+        self.__thread = threading.Thread(target=self.__run, name="rating-buffer", daemon=True)
+        self.__thread.start()
+        _open.add(self)
+
+    # queue a rating; the returned future's result is the ReturnValue of its write, which is also
+    # passed to callback
+    def submit(self, cust_id: int, dish_id: int, rating: int,
+               callback: Callable[[ReturnValue], None] = None) -> Future:
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(done.result()))
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("cannot submit ratings to a closed RatingBuffer")
+            self.__counts["submitted"] += 1
+            waiting = self.__waiting.get((cust_id, dish_id))
+            if waiting is None:
+                waiting = self.__waiting[cust_id, dish_id] = _Waiting(rating)
+            else:
+                waiting.rating = rating
+                self.__counts["coalesced"] += 1
+            waiting.futures.append(future)
+            if len(self.__waiting) >= self.max_batch or len(self.__waiting) == 1:
+                self.__condition.notify()
+        return future
+
+    # write everything submitted so far, on the calling thread
+    def flush(self) -> None:
+        while self.__drain():
+            pass
+
+    # stop accepting ratings and write the waiting ones; returns once they are written
+    def close(self) -> None:
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join()
+        self.flush()
+        _open.discard(self)
+
+    def pending(self) -> int:
+        with self.__condition:
+            return len(self.__waiting)
+
+    # events submitted, coalesced into a waiting rating, written (ratings, not events), batches
+    # written and batches that were retried rating by rating
+    def stats(self) -> Dict[str, int]:
+        with self.__condition:
+            return dict(self.__counts)
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                while not self.__closed:
+                    if self.__waiting:
+                        if len(self.__waiting) >= self.max_batch:
+                            break
+                        oldest = next(iter(self.__waiting.values()))
+                        remaining = oldest.since + self.max_delay - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        self.__condition.wait(remaining)
+                    else:
+                        self.__condition.wait()
+                closed = self.__closed
+            self.__drain()
+            if closed:
+                return
+
+    # take up to max_batch waiting ratings and write them; False if nothing was waiting
+    def __drain(self) -> bool:
+        with self.__writing:
+            with self.__condition:
+                if not self.__waiting:
+                    return False
+                keys = list(self.__waiting)[:self.max_batch]
+                batch = [(key, self.__waiting.pop(key)) for key in keys]
+            try:
+                outcomes, fell_back = self.__write(batch)
+            except Exception:
+                outcomes, fell_back = [ReturnValue.ERROR] * len(batch), False
+            with self.__condition:
+                self.__counts["written"] += len(batch)
+                self.__counts["batches"] += 1
+                self.__counts["fallbacks"] += fell_back
+        for (_, waiting), outcome in zip(batch, outcomes):
+            for future in waiting.futures:
+                future.set_result(outcome)
+        return True
+
+    @staticmethod
+    def __write(batch: List[Tuple[Tuple[int, int], _Waiting]]) -> Tuple[List[ReturnValue], bool]:
+        import Solution
+        result = Solution.upsert_ratings([(cust_id, dish_id, waiting.rating) for (cust_id, dish_id), waiting in batch])
+        if result is ReturnValue.OK or len(batch) == 1:
+            return [result] * len(batch), False
+        return [Solution.upsert_rating(cust_id, dish_id, waiting.rating)
+                for (cust_id, dish_id), waiting in batch], True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,381 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+from psycopg2 import sql
+from Utility.DBConnector import ResultSet, read_config_section
+# re-exported so Solution.py can keep calling Connector.get_backend() after switching to this module
+from Utility.DBConnector import get_backend
+from Utility.Exceptions import DatabaseException
+import Utility.QueryStats as QueryStats
+
+# SQLite implementation of DBConnector, selected with "engine = sqlite" under [backend] in
+# database.ini (or DB_BACKEND=sqlite). Solution.py keeps building its PostgreSQL statements with
+# psycopg2.sql, this connector renders them itself and rewrites the few constructs SQLite spells
+# differently. All connectors share one WAL-mode connection to the file named by [sqlite] database.
+# So while a connector is inside begin(), its transaction is the connection's: other threads wait
+# for it to end, and another connector on the same thread cannot run statements (they would join
+# that transaction, and their commit would end it) and raises instead; its commit() and rollback()
+# leave the transaction alone. PostgreSQL keeps such connectors apart on separate connections.
+# Needs SQLite 3.39 or newer (RIGHT OUTER JOIN).
+
+# sqlite3 extended error names -> the PostgreSQL error codes DBConnector maps to exceptions
+_ERROR_CODES = {
+    "SQLITE_CONSTRAINT_NOTNULL": "23502",
+    "SQLITE_CONSTRAINT_FOREIGNKEY": "23503",
+    "SQLITE_CONSTRAINT_PRIMARYKEY": "23505",
+    "SQLITE_CONSTRAINT_UNIQUE": "23505",
+    "SQLITE_CONSTRAINT_CHECK": "23514",
+}
+
+# fallback for builds that do not report extended error names
+_ERROR_MESSAGES = {
+    "NOT NULL constraint failed": "23502",
+    "FOREIGN KEY constraint failed": "23503",
+    "UNIQUE constraint failed": "23505",
+    "CHECK constraint failed": "23514",
+}
+
+_EXCEPTIONS = {
+    "23502": DatabaseException.NOT_NULL_VIOLATION,
+    "23503": DatabaseException.FOREIGN_KEY_VIOLATION,
+    "23505": DatabaseException.UNIQUE_VIOLATION,
+    "23514": DatabaseException.CHECK_VIOLATION,
+}
+
+_EXTRACT_FORMATS = {"YEAR": "%Y", "MONTH": "%m", "DAY": "%d", "HOUR": "%H"}
+
+# ResultSet reads column names from description entries' .name, like psycopg2's Column
+_Column = namedtuple("_Column", ["name"])
+
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("BOOLEAN", lambda value: bool(int(value)))
+sqlite3.register_converter("DECIMAL", lambda value: float(value))
+
+_connection = None
+_lock = threading.RLock()
+# the connector inside begin(), whose transaction the shared connection holds; set and read with _lock held
+_owner: List[Optional["DBConnector"]] = [None]
+
+
+# SQLite has no schemas, DB_SCHEMA selects a database file of its own instead
+def _database_path(schema: str = None) -> str:
+    path = read_config_section("sqlite").get("database", "cs236363.sqlite")
+    schema = schema or os.environ.get("DB_SCHEMA")
+    if schema:
+        root, extension = os.path.splitext(path)
+        path = root + "_" + schema + extension
+    return path
+
+
+def _shared_connection() -> sqlite3.Connection:
+    global _connection
+    with _lock:
+        if _connection is None:
+            path = _database_path()
+            connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            _connection = connection
+        return _connection
+
+
+# close the shared connection (the next DBConnector reopens it)
+def close_shared() -> None:
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+# counterparts of DBConnector.create_schema / drop_schema: the file is created on first connect
+def create_schema(name: str) -> None:
+    pass
+
+
+def drop_schema(name: str) -> None:
+    path = _database_path(name)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def _literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, Decimal)):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, datetime):
+        return "'" + value.isoformat(sep=" ") + "'"
+    if isinstance(value, date):
+        return "'" + value.isoformat() + " 00:00:00'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+# bound parameters are stored the way _literal spells the values
+def _parameter(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat() + " 00:00:00"
+    return value
+
+
+# psycopg2.sql objects -> SQLite text, without needing a PostgreSQL connection; literal renders
+# the sql.Literal parts (as SQLite literals by default)
+def render(query: Union[str, sql.Composable], literal: Callable[[sql.Literal], str] = None) -> str:
+    if isinstance(query, str):
+        return query
+    if isinstance(query, sql.Composed):
+        return "".join(render(part, literal) for part in query.seq)
+    if isinstance(query, sql.SQL):
+        return query.string
+    if isinstance(query, sql.Literal):
+        return _literal(query.wrapped) if literal is None else literal(query)
+    if isinstance(query, sql.Identifier):
+        return ".".join('"' + s.replace('"', '""') + '"' for s in query.strings)
+    raise TypeError("cannot render " + repr(query))
+
+
+def _require_not_null(statement: str) -> str:
+    # SQLite lets NULL into non-INTEGER primary key columns, PostgreSQL does not
+    for columns in re.findall(r"PRIMARY KEY\s*\(([^)]*)\)", statement):
+        for column in columns.split(","):
+            statement = re.sub(r"^(\s*" + re.escape(column.strip()) + r"\s+INTEGER)\b(?! NOT NULL)",
+                               r"\1 NOT NULL", statement, flags=re.MULTILINE | re.IGNORECASE)
+    return statement
+
+
+# the PostgreSQL constructs used by Solution.py that SQLite spells differently
+def translate(statement: str) -> str:
+    if re.match(r"\s*CREATE\s+TABLE", statement, re.IGNORECASE):
+        # "INTEGER PRIMARY KEY" would make the column a rowid alias, which fills in NULLs
+        statement = re.sub(r"\bINTEGER PRIMARY KEY\b", "INT NOT NULL PRIMARY KEY", statement, flags=re.IGNORECASE)
+        statement = _require_not_null(statement)
+    return re.sub(r"EXTRACT\(\s*(\w+)\s+FROM\s+([\w.]+)\s*\)",
+                  lambda m: f"CAST(strftime('{_EXTRACT_FORMATS[m.group(1).upper()]}', {m.group(2)}) AS INTEGER)",
+                  statement, flags=re.IGNORECASE)
+
+
+# render(query) in SQLite's dialect; translate sees the statement with its literals held out, so
+# a value that happens to read like one of the PostgreSQL constructs is stored as it was given
+def to_sqlite(query: Union[str, sql.Composable]) -> str:
+    literals = []
+
+    def hold(literal: sql.Literal) -> str:
+        literals.append(_literal(literal.wrapped))
+        return f"\0{len(literals) - 1}\0"
+
+    statement = translate(render(query, hold))
+    if not literals:
+        return statement
+    return re.sub(r"\0(\d+)\0", lambda m: literals[int(m.group(1))], statement)
+
+
+def _error_code(error: sqlite3.IntegrityError):
+    code = _ERROR_CODES.get(getattr(error, "sqlite_errorname", None))
+    if code is None:
+        for message, candidate in _ERROR_MESSAGES.items():
+            if str(error).startswith(message):
+                return candidate
+    return code
+
+
+class DBConnector:
+    # constructor
+    def __init__(self):
+        # inside begin() ... commit() / rollback(), which hold the shared connection meanwhile
+        self.transaction = False
+        try:
+            self.connection = _shared_connection()
+            self.cursor = self.connection.cursor()
+        except Exception:
+            self.connection = None
+            self.cursor = None
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+
+    # the connection is shared, closing only releases this connector's cursor (and rolls back a
+    # transaction still open)
+    def close(self):
+        if self.transaction:
+            self.rollback()
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+
+    # same contract as DBConnector.begin; the other connectors wait until the transaction ends,
+    # they share its connection
+    def begin(self):
+        if self.connection is None or self.cursor is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        _lock.acquire()
+        try:
+            self.__check_owner()
+            self.cursor.execute("BEGIN")
+        except Exception:
+            _lock.release()
+            raise
+        self.transaction = True
+        _owner[0] = self
+
+    # commit connection's changes (none while another connector's transaction is open)
+    def commit(self):
+        if self.connection is not None:
+            try:
+                with _lock:
+                    if _owner[0] in (None, self):
+                        self.connection.commit()
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not commit changes")
+            finally:
+                self.__end()
+
+    # rollback connection's changes (none while another connector's transaction is open)
+    def rollback(self):
+        if self.connection is not None:
+            try:
+                with _lock:
+                    if _owner[0] in (None, self):
+                        self.connection.rollback()
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not rollback changes")
+            finally:
+                self.__end()
+
+    def __end(self):
+        if self.transaction:
+            self.transaction = False
+            _owner[0] = None
+            _lock.release()
+
+    # _lock held: with another connector's transaction open (on this very thread, the others wait
+    # for _lock) a statement would run inside it
+    def __check_owner(self):
+        if _owner[0] is not None and _owner[0] is not self:
+            raise DatabaseException.UNKNOWN_ERROR("another connector's transaction is open on this thread")
+
+    # same contract as DBConnector.savepoint, rollback_to_savepoint and release_savepoint
+    def savepoint(self, name: str):
+        self.__savepoint("SAVEPOINT {}", name)
+
+    def rollback_to_savepoint(self, name: str):
+        self.__savepoint("ROLLBACK TO SAVEPOINT {}", name)
+
+    def release_savepoint(self, name: str):
+        self.__savepoint("RELEASE SAVEPOINT {}", name)
+
+    def __savepoint(self, statement: str, name: str):
+        if self.connection is None or self.cursor is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        with _lock:
+            self.__check_owner()
+            self.cursor.execute(render(sql.SQL(statement).format(sql.Identifier(name))))
+
+    # runs the query and commits (unless inside begin()), returns (rows effected, fetched rows or None)
+    def __run(self, query: Union[str, sql.Composed]) -> tuple:
+        with _lock:
+            self.__check_owner()
+            try:
+                self.cursor.execute(to_sqlite(query))
+                if self.cursor.description is not None:
+                    rows = self.cursor.fetchall()
+                    # psycopg2 reports the number of rows a SELECT returned
+                    row_effected = len(rows)
+                else:
+                    rows = None
+                    row_effected = max(self.cursor.rowcount, 0)
+                if not self.transaction:
+                    self.connection.commit()
+            except sqlite3.IntegrityError as e:
+                code = _error_code(e)
+                if code is None:
+                    raise DatabaseException.UNKNOWN_ERROR(str(e))
+                raise _EXCEPTIONS[code](_EXCEPTIONS[code].__name__)
+        return row_effected, rows
+
+    # same contract as DBConnector.iterate; the rows are read on a connection of their own (WAL
+    # lets it read beside the shared one), so the shared connection is not held between batches
+    def iterate(self, query: Union[str, sql.Composed], batch_size: int = 1000) -> Iterator[ResultSet]:
+        if self.connection is None or self.cursor is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        connection = sqlite3.connect(_database_path(), detect_types=sqlite3.PARSE_DECLTYPES)
+        seconds, rows, error = 0.0, 0, None
+        try:
+            start = time.perf_counter()
+            cursor = connection.execute(to_sqlite(query))
+            description = [_Column(d[0].lower()) for d in cursor.description or ()]
+            results = cursor.fetchmany(batch_size)
+            seconds += time.perf_counter() - start
+            while results:
+                rows += len(results)
+                yield ResultSet(description, results)
+                start = time.perf_counter()
+                results = cursor.fetchmany(batch_size)
+                seconds += time.perf_counter() - start
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            QueryStats.record(query, seconds, rows, error=error)
+            connection.close()
+
+    # same contract as DBConnector.copy_from, SQLite has no COPY so the rows go through executemany
+    def copy_from(self, table: str, columns: List[str], rows: Iterable[tuple]) -> int:
+        if self.connection is None or self.cursor is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        query = "INSERT INTO {} ({}) VALUES ({})".format(table, ", ".join(columns), ", ".join("?" * len(columns)))
+        with _lock:
+            try:
+                self.cursor.executemany(query, (tuple(map(_parameter, row)) for row in rows))
+                row_effected = max(self.cursor.rowcount, 0)
+                if not self.transaction:
+                    self.connection.commit()
+            except sqlite3.IntegrityError as e:
+                if not self.transaction:
+                    self.connection.rollback()
+                code = _error_code(e)
+                if code is None:
+                    raise DatabaseException.UNKNOWN_ERROR(str(e))
+                raise _EXCEPTIONS[code](_EXCEPTIONS[code].__name__)
+        return row_effected
+
+    # same contract as DBConnector.execute: returns the number of rows effected and a ResultSet
+    def execute(self, query: Union[str, sql.Composed], printSchema=False) -> tuple[int, ResultSet]:
+        if self.connection is None or self.cursor is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        start = time.perf_counter()
+        try:
+            row_effected, rows = self.__run(query)
+        except Exception as e:
+            QueryStats.record(query, time.perf_counter() - start, 0, error=type(e).__name__)
+            raise
+        QueryStats.record(query, time.perf_counter() - start, row_effected)
+
+        if rows is not None:
+            description = [_Column(d[0].lower()) for d in self.cursor.description]
+            entries = ResultSet(description, rows)
+        else:
+            entries = ResultSet()
+
+        if printSchema:
+            print(entries)
+
+        return row_effected, entries
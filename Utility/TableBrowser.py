@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional, Tuple
+from psycopg2 import sql
+import Utility.DBConnector as Connector
+from Utility.DBConnector import ResultSet
+
+# Page-at-a-time reads of the tables for streamlit_app.py's "Visualize Tables": keyset pagination
+# on the primary key (WHERE key > last key seen ORDER BY key LIMIT n) costs an index range scan
+# however deep the page, unlike OFFSET, and row counts come from the planner's statistics instead
+# of a COUNT(*) over the whole table.
+
+if Connector.get_backend() == "sqlite":
+    import Utility.SQLiteConnector as Connector
+
+# table -> primary key columns, in key order
+TABLES: Dict[str, List[str]] = {
+    "Customers": ["cust_id"],
+    "Orders": ["order_id"],
+    "Dishes": ["dish_id"],
+    "CustomerOrders": ["order_id"],
+    "DishOrders": ["order_id", "dish_id"],
+    "Ratings": ["cust_id", "dish_id"],
+}
+
+
+def _key(table: str) -> List[str]:
+    if table not in TABLES:
+        raise ValueError(f"unknown table {table!r}, expected one of {', '.join(TABLES)}")
+    return TABLES[table]
+
+
+def _row_key(result: ResultSet, key: List[str], index: int) -> tuple:
+    return tuple(result.rows[index][result.cols[column]] for column in key)
+
+
+# the rows of table that follow the key after (a tuple of the key columns, None for the first
+# page) in key order, at most size of them, and the key to pass for the next page (None on the
+# last page); conn, if given, is used and left open
+def page(table: str, after: Optional[tuple] = None, size: int = 50,
+         conn: Connector.DBConnector = None) -> Tuple[ResultSet, Optional[tuple]]:
+    key = _key(table)
+    columns = sql.SQL(", ").join(map(sql.Identifier, key))
+    query = sql.SQL("SELECT * FROM {table}").format(table=sql.Identifier(table.lower()))
+    if after is not None:
+        query += sql.SQL(" WHERE ({columns}) > ({values})").format(
+            columns=columns, values=sql.SQL(", ").join(map(sql.Literal, after)))
+    # one row past the page tells whether there is a next one
+    query += sql.SQL(" ORDER BY {columns} LIMIT {limit}").format(columns=columns, limit=sql.Literal(size + 1))
+    owned = conn is None
+    try:
+        if owned:
+            conn = Connector.DBConnector()
+        _, result = conn.execute(query)
+    finally:
+        if owned and conn is not None:
+            conn.close()
+    if result.size() <= size:
+        return result, None
+    result.rows = result.rows[:size]
+    return result, _row_key(result, key, size - 1)
+
+
+# the planner's estimate of the rows in table, None if it has none yet (PostgreSQL before the
+# first ANALYZE or autovacuum of the table); on SQLite the largest rowid, exact until rows are
+# deleted
+def approximate_count(table: str, conn: Connector.DBConnector = None) -> Optional[int]:
+    _key(table)
+    if Connector.get_backend() == "sqlite":
+        query = sql.SQL("SELECT MAX(rowid) AS estimate FROM {table}").format(table=sql.Identifier(table.lower()))
+    else:
+        query = sql.SQL("SELECT reltuples::BIGINT AS estimate FROM pg_class WHERE oid = to_regclass({table})").format(
+            table=sql.Literal(table.lower()))
+    owned = conn is None
+    try:
+        if owned:
+            conn = Connector.DBConnector()
+        _, result = conn.execute(query)
+    finally:
+        if owned and conn is not None:
+            conn.close()
+    estimate = None if result.isEmpty() else result[0]["estimate"]
+    if estimate is None:
+        # MAX(rowid) of an empty table
+        return 0 if Connector.get_backend() == "sqlite" and not result.isEmpty() else None
+    return int(estimate) if estimate >= 0 else None
@@ -0,0 +1,246 @@
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional
+import Utility.Instrumentation as Instrumentation
+import Utility.QueryStats as QueryStats
+from Utility.ReturnValue import ReturnValue
+
+# Spans of the Solution.py calls of a process, for telling where the time of a request that calls
+# several functions went: one span per public Solution.py function, with a child span per
+# statement its connector executed (the statement's shape, row count and the wait for a pooled
+# connection). Spans nest through a context variable, so calls made inside span(...) or from an
+# executor task (Utility/Executor.py copies the context) join the caller's trace.
+#     Tracing.enable("trace.json")     or DB_TRACE_FILE=trace.json, written again at exit
+#     with Tracing.span("checkout", customer=7):
+#         Solution.add_order(...)
+#         Solution.order_contains_dish(...)
+#     Tracing.export("trace.json")
+# The file is OTLP/JSON (the body of an OpenTelemetry collector's /v1/traces request), which
+# Jaeger, Tempo and the collector's otlpjsonfile receiver read. Disabled, nothing is registered
+# and a Solution.py call costs the instrumentation's one list check.
+
+# finished spans kept for export, the oldest are dropped first
+MAX_SPANS = 100_000
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int = SPAN_KIND_INTERNAL,
+                 start: int = None, attributes: Dict[str, object] = None) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        # nanoseconds since the epoch
+        self.start = time.time_ns() if start is None else start
+        self.end: Optional[int] = None
+        self.attributes: Dict[str, object] = dict(attributes or {})
+        self.status = STATUS_OK
+        self.message = ""
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.message = message
+
+    def duration_ms(self) -> float:
+        return ((self.end or time.time_ns()) - self.start) / 1e6
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end if self.end is not None else time.time_ns()),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status, "message": self.message} if self.message else {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: object) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("cs236363_span", default=None)
+_finished: Deque[Span] = deque(maxlen=MAX_SPANS)
+_lock = threading.Lock()
+_export_path: List[Optional[str]] = [None]
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def _start(name: str, kind: int = SPAN_KIND_INTERNAL, start: int = None,
+           attributes: Dict[str, object] = None) -> Span:
+    parent = _current.get()
+    return Span(name, parent.trace_id if parent else secrets.token_hex(16), parent.span_id if parent else None,
+                kind, start, attributes)
+
+
+def _finish(span: Span) -> None:
+    if span.end is None:
+        span.end = time.time_ns()
+    with _lock:
+        _finished.append(span)
+
+
+# a span of its own around a block, e.g. a user request made of several Solution.py calls;
+# recorded whether or not tracing is enabled
+@contextlib.contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    opened = _start(name, attributes=attributes)
+    token = _current.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current.reset(token)
+        _finish(opened)
+
+
+class FunctionTracer(Instrumentation.FunctionListener):
+    # a span per Solution.py call, current while the call runs so its statements nest under it
+    def function_started(self, name: str) -> object:
+        opened = _start(name)
+        return opened, _current.set(opened)
+
+    # a generator's span is current only while its body runs, not between the caller's next()
+    # calls, so the caller's own calls in between do not become its children
+    def generator_started(self, name: str) -> object:
+        return _start(name), None
+
+    def generator_resumed(self, name: str, token: object) -> object:
+        return _current.set(token[0])
+
+    def generator_suspended(self, name: str, token: object, resumed: object) -> None:
+        _current.reset(resumed)
+
+    def function_finished(self, name: str, token: object, seconds: float, result: object,
+                          error: Optional[BaseException]) -> None:
+        opened, context_token = token
+        if context_token is not None:
+            try:
+                _current.reset(context_token)
+            except ValueError:
+                # finished in another context than it started in, only the span is lost
+                pass
+        if error is not None:
+            opened.set_error(f"{type(error).__name__}: {error}")
+        elif result is ReturnValue.ERROR:
+            opened.set_error("ReturnValue.ERROR")
+        elif isinstance(result, ReturnValue):
+            opened.set_attribute("cs236363.result", result.name)
+        _finish(opened)
+
+
+# a child span per statement, reported by QueryStats once the statement ended
+def _statement_finished(shape: str, seconds: float, rows: int, error: Optional[str], pool_wait: float) -> None:
+    import Utility.DBConnector as Connector
+    end = time.time_ns()
+    statement = _start(shape.split(None, 1)[0].upper() if shape.strip() else "statement", SPAN_KIND_CLIENT,
+                       end - int(seconds * 1e9), {
+                           "db.system": Connector.get_backend(),
+                           "db.statement": shape,
+                           "db.rows": rows,
+                           "db.pool_wait_ms": pool_wait * 1000,
+                       })
+    statement.end = end
+    if error is not None:
+        statement.set_attribute("error.type", error)
+        statement.set_error(error)
+    _finish(statement)
+
+
+_tracer = FunctionTracer()
+
+
+def enabled() -> bool:
+    return _tracer in Instrumentation.listeners()
+
+
+# starts tracing; with export_path the spans are also written there when the process exits
+def enable(export_path: str = None) -> None:
+    Instrumentation.add_listener(_tracer)
+    QueryStats.add_listener(_statement_finished)
+    if export_path:
+        if _export_path[0] is None:
+            atexit.register(_export_at_exit)
+        _export_path[0] = export_path
+
+
+def disable() -> None:
+    Instrumentation.remove_listener(_tracer)
+    QueryStats.remove_listener(_statement_finished)
+    _export_path[0] = None
+
+
+def _export_at_exit() -> None:
+    if _export_path[0]:
+        export(_export_path[0])
+
+
+def spans() -> List[Span]:
+    with _lock:
+        return list(_finished)
+
+
+def reset() -> None:
+    with _lock:
+        _finished.clear()
+
+
+# the finished spans as an OTLP/JSON ExportTraceServiceRequest
+def to_otlp() -> dict:
+    import Utility.DBConnector as Connector
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": "cs236363"}},
+                {"key": "db.system", "value": {"stringValue": Connector.get_backend()}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "Utility.Tracing"},
+                "spans": [finished.to_otlp() for finished in spans()],
+            }],
+        }],
+    }
+
+
+# write to_otlp() to path, replacing the file in one step
+def export(path: str) -> int:
+    exported = to_otlp()
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(exported, file)
+    os.replace(temporary, path)
+    return len(exported["resourceSpans"][0]["scopeSpans"][0]["spans"])
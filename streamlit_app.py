@@ -7,7 +7,12 @@ from Business.Dish import Dish
 from Business.Order import Order
 from Business.OrderDish import OrderDish
 from Utility.ReturnValue import ReturnValue
+import Utility.TableBrowser as TableBrowser
+import Utility.Metrics as Metrics
+import Utility.QueryStats as QueryStats
+from Utility.DBConnector import enable_pool, get_backend, get_pool
 import psycopg2
+import threading
 from datetime import datetime
 
 DB_PARAMS = { #----------------TODO----------------
@@ -18,9 +23,249 @@ DB_PARAMS = { #----------------TODO----------------
     "port": 5432
 }
 
+# ---------------------------------- CACHING: ----------------------------------
+
+# Reruns are served from st.cache_data until the data changes: every cached function takes the
+# current data version as its first argument, and the write forms bump the version after a
+# successful write, so the next lookup misses and reads the database again. The version, the
+# hit counts and the connection pool are process-wide (st.cache_resource), shared by sessions.
+
+class DataVersion:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.value = 0
+
+    def bump(self) -> None:
+        with self.lock:
+            self.value += 1
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.misses = 0
+
+    def looked_up(self) -> None:
+        with self.lock:
+            self.lookups += 1
+
+    def missed(self) -> None:
+        with self.lock:
+            self.misses += 1
+
+    # (hits, misses), for Metrics.register_cache
+    def counts(self) -> tuple:
+        with self.lock:
+            return self.lookups - self.misses, self.misses
+
+
+@st.cache_resource
+def data_version() -> DataVersion:
+    return DataVersion()
+
+
+@st.cache_resource
+def cache_stats() -> CacheStats:
+    stats = CacheStats()
+    Metrics.register_cache("streamlit", stats.counts)
+    return stats
+
+
+# every Solution.py call of every session borrows its connection from this pool
+@st.cache_resource
+def connection_pool():
+    if get_backend() != "postgresql":
+        return None
+    return enable_pool(1, 8)
+
+
+# function latencies for the Operations page, collected from the first run on
+@st.cache_resource
+def metrics_enabled() -> bool:
+    Metrics.enable()
+    return True
+
+
+# function(current data version, *args), from the cache unless the data changed since
+def cached(function, *args):
+    cache_stats().looked_up()
+    return function(data_version().value, *args)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def table_page(version: int, table: str, after: tuple, size: int) -> tuple:
+    cache_stats().missed()
+    rows, next_key = TableBrowser.page(table, after, size)
+    return pd.DataFrame(rows.rows, columns=rows.cols_header), next_key
+
+
+@st.cache_data(show_spinner=False)
+def table_estimate(version: int, table: str):
+    cache_stats().missed()
+    return TableBrowser.approximate_count(table)
+
+
+@st.cache_data(show_spinner=False)
+def order_totals(version: int) -> pd.DataFrame:
+    cache_stats().missed()
+    conn = Connector.DBConnector()
+    try:
+        res = conn.execute("SELECT order_id FROM orders ORDER BY order_id")[1]
+    finally:
+        conn.close()
+    order_data = []
+    for row in res.rows:
+        order_id = row[0]
+        total_price = get_order_total_price(order_id)
+        order_data.append({"Order ID": order_id, "Total Price": f"${total_price:.2f}"})
+    return pd.DataFrame(order_data)
+
+
+@st.cache_data(show_spinner=False)
+def max_avg_spending(version: int) -> pd.DataFrame:
+    cache_stats().missed()
+    customer_details = []
+    for cust_id in get_customers_spent_max_avg_amount_money():
+        customer = get_customer(cust_id)
+        customer_details.append({
+            "Customer ID": customer.get_cust_id(),
+            "Name": customer.get_full_name(),
+            "Age": customer.get_age(),
+            "Phone": customer.get_phone()
+        })
+    return pd.DataFrame(customer_details)
+
+
+# (dishes of the order, its total price, the customer who placed it)
+@st.cache_data(show_spinner=False, max_entries=256)
+def order_details(version: int, order_id: int) -> tuple:
+    cache_stats().missed()
+    dishes_data = []
+    for order_dish in get_all_order_items(order_id):
+        dish = get_dish(order_dish.get_dish_id())
+        dishes_data.append({
+            "Dish ID": order_dish.get_dish_id(),
+            "Dish Name": dish.get_name(),
+            "Amount": order_dish.get_amount(),
+            "Unit Price": order_dish.get_price() / order_dish.get_amount(),
+            "Total Price": order_dish.get_price()
+        })
+    return pd.DataFrame(dishes_data), get_order_total_price(order_id), get_customer_that_placed_order(order_id)
+
+
+# ---------------------------------- PAGES: ----------------------------------
+
+# one table at a time, a page at a time: the keys each visited page started after are kept in
+# the session, so Previous goes back without OFFSET
+def browse_table(table: str) -> None:
+    state = st.session_state.setdefault(f"browse_{table}", {"starts": [None], "size": 50})
+    estimate = cached(table_estimate, table)
+    st.caption(f"about {estimate:,} rows" if estimate is not None else "row count not estimated yet")
+
+    size = st.selectbox("Rows per page", [25, 50, 100, 500], index=[25, 50, 100, 500].index(state["size"]),
+                        key=f"size_{table}")
+    if size != state["size"]:
+        state["size"], state["starts"] = size, [None]
+
+    rows, next_key = cached(table_page, table, state["starts"][-1], size)
+    st.dataframe(rows)
+
+    previous, position, following = st.columns([1, 2, 1])
+    if previous.button("Previous", key=f"previous_{table}", disabled=len(state["starts"]) == 1):
+        state["starts"].pop()
+        st.rerun()
+    position.write(f"page {len(state['starts'])}")
+    if following.button("Next", key=f"next_{table}", disabled=next_key is None):
+        state["starts"].append(next_key)
+        st.rerun()
+
+
+def visualize_tables() -> None:
+    table = st.radio("Table", list(TableBrowser.TABLES), horizontal=True)
+    st.subheader(table)
+    browse_table(table)
+
+
+# latency histogram of one function or statement shape: counts per bucket, labelled by upper bound
+def latency_histogram(buckets: list) -> pd.DataFrame:
+    labels = [f"<= {bound:g} ms" for bound in QueryStats.BUCKETS_MS] + [f"> {QueryStats.BUCKETS_MS[-1]:g} ms"]
+    return pd.DataFrame({"calls": buckets}, index=pd.Index(labels, name="latency"))
+
+
+def operations_panels() -> None:
+    st.caption(f"updated {datetime.now():%H:%M:%S}")
+
+    st.subheader("Connection pool")
+    pool = get_pool()
+    if pool is None:
+        st.info("No DBConnector pool is enabled.")
+    else:
+        stats = pool.stats()
+        in_use, size, waits, wait = st.columns(4)
+        in_use.metric("In use", f"{stats.in_use} / {stats.max_size}", f"{stats.utilization():.0%}", delta_color="off")
+        size.metric("Open", stats.size)
+        waits.metric("Waited", f"{stats.waited} / {stats.acquired}")
+        wait.metric("Avg / max wait", f"{stats.avg_wait() * 1000:.1f} / {stats.max_wait * 1000:.1f} ms")
+
+    st.subheader("Function latency")
+    functions = Metrics.functions()
+    if functions:
+        st.dataframe(pd.DataFrame([
+            {"Function": name, "Calls": calls, "Errors": errors, "Mean ms": total / calls * 1000 if calls else 0.0}
+            for name, (calls, errors, total, _) in functions.items()]), hide_index=True)
+        function = st.selectbox("Histogram of", list(functions), key="ops_function")
+        st.bar_chart(latency_histogram(functions[function][3]))
+    else:
+        st.info("No Solution.py calls yet.")
+
+    st.subheader("Statements")
+    shapes = sorted(QueryStats.shapes(), key=lambda stats: stats.total, reverse=True)
+    if shapes:
+        st.dataframe(pd.DataFrame([
+            {"Statement": stats.shape, "Calls": stats.calls, "Errors": stats.errors, "Rows": stats.rows,
+             "Total ms": stats.total * 1000, "Mean ms": stats.mean() * 1000, "p50 ms": stats.percentile_ms(0.5),
+             "p99 ms": stats.percentile_ms(0.99), "Max ms": stats.max * 1000}
+            for stats in shapes]), hide_index=True)
+        shape = st.selectbox("Histogram of", range(len(shapes)), format_func=lambda i: shapes[i].shape[:120],
+                             key="ops_shape")
+        st.bar_chart(latency_histogram(shapes[shape].buckets))
+    else:
+        st.info("No statements recorded yet.")
+
+    st.subheader(f"Slowest statements (over {QueryStats.slow_threshold() * 1000:g} ms)")
+    slow = sorted(QueryStats.slow_queries(), key=lambda query: query.seconds, reverse=True)[:20]
+    if slow:
+        st.dataframe(pd.DataFrame([
+            {"At": query.at, "ms": query.seconds * 1000, "Rows": query.rows, "Caller": query.caller,
+             "Error": query.error, "Statement": query.shape, "Parameters": str(query.parameters)}
+            for query in slow]), hide_index=True)
+    else:
+        st.info("No slow statements.")
+
+    st.subheader("Cache hit ratios")
+    caches = Metrics.caches()
+    st.dataframe(pd.DataFrame([
+        {"Cache": name, "Hits": hits, "Misses": misses, "Hit ratio": hits / (hits + misses) if hits + misses else 0.0}
+        for name, (hits, misses) in caches.items()]), hide_index=True)
+
+    if get_backend() == "postgresql":
+        st.subheader("Tables and indexes")
+        st.dataframe(pd.DataFrame(Metrics.postgresql_table_sizes()), hide_index=True)
+
+
+# instrumentation of this process (Utility/Metrics.py, Utility/QueryStats.py) and pg_stat views,
+# refreshed on a timer without rerunning the rest of the page
+def operations_dashboard() -> None:
+    interval = st.selectbox("Refresh every", [5, 15, 60], format_func=lambda seconds: f"{seconds} s",
+                            key="ops_interval")
+    st.fragment(run_every=interval)(operations_panels)()
+
 
 def main():
     st.title("Yummify")
+    connection_pool()
+    metrics_enabled()
 
     if "db_initialized" not in st.session_state:
         st.session_state.db_initialized = False
@@ -28,6 +273,7 @@ def main():
     if st.button("Initialize Database (Drop/Create)"):
         drop_tables()
         create_tables()
+        data_version().bump()
         st.session_state.db_initialized = True
         st.success("Database initialized!")
 
@@ -44,7 +290,8 @@ def main():
         "Visualize Tables",
         "Total Price of Every Order",
         "Max Avg Spending",
-        "Dishes ordered"
+        "Dishes ordered",
+        "Operations"
     ])
 
     if action == "Add Customer": 
@@ -57,6 +304,7 @@ def main():
             if submitted:
                 result = add_customer(Customer(cust_id, name, age, phone))
                 if result == ReturnValue.OK:
+                    data_version().bump()
                     st.success("Customer added successfully.")
                 elif result == ReturnValue.ALREADY_EXISTS:
                     st.warning("Customer already exists.")
@@ -76,6 +324,7 @@ def main():
                 from Business.Dish import Dish
                 result = add_dish(Dish(dish_id, name, price, is_active))
                 if result == ReturnValue.OK:
+                    data_version().bump()
                     st.success("Dish added successfully.")
                 elif result == ReturnValue.ALREADY_EXISTS:
                     st.warning("Dish already exists.")
@@ -98,6 +347,7 @@ def main():
                 date_time = datetime.combine(date, time)
                 result = add_order(Order(order_id, date_time, delivery_fee, delivery_address))
                 if result == ReturnValue.OK:
+                    data_version().bump()
                     st.success("Order added successfully.")
                 elif result == ReturnValue.ALREADY_EXISTS:
                     st.warning("Order already exists.")
@@ -114,6 +364,7 @@ def main():
             if submitted:
                 result = customer_placed_order(customer_id, order_id)
                 if result == ReturnValue.OK:
+                    data_version().bump()
                     st.success("Order placed successfully.")
                 elif result == ReturnValue.ALREADY_EXISTS:
                     st.warning("A customer has already placed this order.")
@@ -131,6 +382,7 @@ def main():
             if submitted:
                 result = order_contains_dish(order_id, dish_id, amount)
                 if result == ReturnValue.OK:
+                    data_version().bump()
                     st.success("Dish added to order successfully.")
                 elif result == ReturnValue.ALREADY_EXISTS:
                     st.warning("This dish is already in the order.")
@@ -142,86 +394,34 @@ def main():
                     st.error("An unexpected error occurred.")
 
     elif action == "Visualize Tables":
-        st.subheader("Customers")
-        res = Connector.DBConnector().execute("SELECT * FROM customers")[1]
-        st.dataframe(pd.DataFrame(res.rows, columns=res.cols))
-
-        st.subheader("Orders")
-        res = Connector.DBConnector().execute("SELECT * FROM orders")[1]
-        st.dataframe(pd.DataFrame(res.rows, columns=res.cols))
-
-        st.subheader("Dishes")
-        res = Connector.DBConnector().execute("SELECT * FROM dishes")[1]
-        st.dataframe(pd.DataFrame(res.rows, columns=res.cols)) 
-        
-        st.subheader("Dishes Orders")
-        res = Connector.DBConnector().execute("SELECT * FROM DishOrders")[1]
-        st.dataframe(pd.DataFrame(res.rows, columns=res.cols))
-        
-        st.subheader("Customers Orders")
-        res = Connector.DBConnector().execute("SELECT * FROM CustomerOrders")[1]
-        st.dataframe(pd.DataFrame(res.rows, columns=res.cols))
-        
-
-
-    elif action == "Total Price of Every Order": 
+        visualize_tables()
+
+    elif action == "Total Price of Every Order":
         st.subheader("Total Price of Every Order")
-        
-        res = Connector.DBConnector().execute("SELECT order_id FROM orders ORDER BY order_id")[1]
-        
-        if not res.isEmpty():
-            order_data = []
-            
-            for row in res.rows:
-                order_id = row[0]
-                total_price = get_order_total_price(order_id)
-                order_data.append({"Order ID": order_id, "Total Price": f"${total_price:.2f}"})
-            
-            st.dataframe(pd.DataFrame(order_data))
+        order_data = cached(order_totals)
+        if not order_data.empty:
+            st.dataframe(order_data)
         else:
             st.info("No orders found.")
 
     elif action == "Max Avg Spending":
         st.subheader("Customers with Maximum Average Spending")
-        max_spending_customers = get_customers_spent_max_avg_amount_money()
-        if max_spending_customers:
+        customer_details = cached(max_avg_spending)
+        if not customer_details.empty:
             st.subheader("Customer Details")
-            customer_details = []
-            for cust_id in max_spending_customers:
-                customer = get_customer(cust_id)
-                customer_details.append({
-                    "Customer ID": customer.get_cust_id(),
-                    "Name": customer.get_full_name(),
-                    "Age": customer.get_age(),
-                    "Phone": customer.get_phone()
-                })
-            if customer_details:
-                st.dataframe(pd.DataFrame(customer_details))
+            st.dataframe(customer_details)
         else:
             st.info("No customers found with orders.")
 
     elif action == "Dishes ordered":
         order_id = st.number_input("Enter Order ID", min_value=1, step=1, format="%d")
         if st.button("Show Dishes"):
-            order_dishes = get_all_order_items(order_id)
-            if order_dishes:
-                dishes_data = []
-                for order_dish in order_dishes:
-                    dish = get_dish(order_dish.get_dish_id())
-                    dishes_data.append({
-                        "Dish ID": order_dish.get_dish_id(),
-                        "Dish Name": dish.get_name(),
-                        "Amount": order_dish.get_amount(),
-                        "Unit Price": order_dish.get_price() / order_dish.get_amount(),
-                        "Total Price": order_dish.get_price()
-                    })
-                
-                st.dataframe(pd.DataFrame(dishes_data))
-                
-                total_price = get_order_total_price(order_id)
+            dishes_data, total_price, customer = cached(order_details, order_id)
+            if not dishes_data.empty:
+                st.dataframe(dishes_data)
+
                 st.subheader(f"Order Total: ${total_price:.2f}")
-                
-                customer = get_customer_that_placed_order(order_id)
+
                 if customer.get_cust_id() is not None:
                     st.subheader("Customer Information")
                     st.write(f"Customer ID: {customer.get_cust_id()}")
@@ -231,6 +431,9 @@ def main():
             else:
                 st.info(f"No dishes found for Order #{order_id} or order does not exist.")
 
+    elif action == "Operations":
+        operations_dashboard()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file